@@ -0,0 +1,86 @@
+import json
+
+from django.contrib import admin
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.html import format_html
+
+from .models import ArchivedEvent, ArchivedEventSection, ArchivedTicket, ArchivedTicketPDF, ArchivedTicketReservation
+
+
+class ReadOnlyAdminMixin:
+    """The archive is written only by archive.tasks; the admin just browses it"""
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def data_display(self, obj):
+        return format_html('<pre>{}</pre>', json.dumps(obj.data, indent=2, sort_keys=True, cls=DjangoJSONEncoder))
+    data_display.short_description = 'Archived row'
+
+
+class ArchivedEventSectionInline(ReadOnlyAdminMixin, admin.TabularInline):
+    model = ArchivedEventSection
+    fields = ('id', 'name')
+    readonly_fields = fields
+    extra = 0
+
+
+class ArchivedTicketInline(ReadOnlyAdminMixin, admin.TabularInline):
+    model = ArchivedTicket
+    fields = ('ticket_id', 'ticket_number', 'section', 'seller', 'number_of_tickets', 'sell_price', 'sold')
+    readonly_fields = fields
+    extra = 0
+    show_change_link = True
+
+
+@admin.register(ArchivedEvent)
+class ArchivedEventAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    list_display = ('event_id', 'name', 'stadium_name', 'starts_at', 'sold_tickets', 'total_sold_price', 'archived_at')
+    list_filter = ('category_legacy', 'archived_at')
+    search_fields = ('event_id', 'name', 'stadium_name', 'superadmin__email')
+    date_hierarchy = 'starts_at'
+    list_select_related = ('superadmin',)
+    fields = (
+        'event_id', 'name', 'superadmin', 'category_legacy', 'stadium_name', 'starts_at',
+        'total_tickets', 'sold_tickets', 'total_sold_price', 'archived_at', 'data_display',
+    )
+    readonly_fields = fields
+    inlines = [ArchivedEventSectionInline, ArchivedTicketInline]
+
+
+@admin.register(ArchivedTicket)
+class ArchivedTicketAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    list_display = ('ticket_id', 'ticket_number', 'event', 'seller', 'number_of_tickets', 'sell_price', 'sold')
+    list_filter = ('sold', 'upload_choice')
+    search_fields = ('ticket_id', 'ticket_number', 'event__name', 'event__event_id', 'seller__email', 'buyer')
+    list_select_related = ('event', 'seller')
+    fields = (
+        'ticket_id', 'ticket_number', 'event', 'section', 'seller', 'buyer', 'upload_choice', 'upload_file',
+        'number_of_tickets', 'sell_price', 'sold', 'created_at', 'data_display',
+    )
+    readonly_fields = fields
+
+
+@admin.register(ArchivedTicketPDF)
+class ArchivedTicketPDFAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    list_display = ('id', 'ticket', 'file', 'is_sold')
+    list_filter = ('is_sold',)
+    search_fields = ('ticket__ticket_id', 'file')
+    list_select_related = ('ticket__event',)
+    fields = ('ticket', 'file', 'is_sold', 'data_display')
+    readonly_fields = fields
+
+
+@admin.register(ArchivedTicketReservation)
+class ArchivedTicketReservationAdmin(ReadOnlyAdminMixin, admin.ModelAdmin):
+    list_display = ('id', 'ticket', 'buyer', 'order_id', 'quantity_reserved')
+    search_fields = ('ticket__ticket_id', 'order_id', 'buyer__email')
+    list_select_related = ('ticket__event', 'buyer')
+    fields = ('ticket', 'buyer', 'order_id', 'quantity_reserved', 'data_display')
+    readonly_fields = fields
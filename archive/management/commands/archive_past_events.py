@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from archive.tasks import archivable_events, archive_past_events_task
+
+
+class Command(BaseCommand):
+    help = 'Move past events with their sections, tickets and reservations into the archive tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days', type=int, default=settings.ARCHIVE_EVENTS_AFTER_DAYS,
+            help='Archive events that started more than this many days ago'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=settings.ARCHIVE_CHUNK_SIZE,
+            help='Events moved per transaction'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Only count the events that would be archived')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            count = archivable_events(options['older_than_days']).count()
+            self.stdout.write(f'{count} events would be archived')
+            return
+        archived = archive_past_events_task(options['older_than_days'], options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} events'))
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.3 on 2026-10-17 22:49
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedEvent',
+            fields=[
+                ('id', models.UUIDField(primary_key=True, serialize=False)),
+                ('event_id', models.CharField(max_length=6, unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('category_legacy', models.CharField(blank=True, max_length=100, null=True)),
+                ('stadium_name', models.CharField(max_length=255)),
+                ('starts_at', models.DateTimeField(db_index=True)),
+                ('total_tickets', models.PositiveIntegerField(default=0)),
+                ('sold_tickets', models.PositiveIntegerField(default=0)),
+                ('total_sold_price', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('archived_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('superadmin', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-starts_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedEventSection',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=100)),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sections', to='archive.archivedevent')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedTicket',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('ticket_id', models.UUIDField(unique=True)),
+                ('ticket_number', models.CharField(blank=True, db_index=True, max_length=20, null=True)),
+                ('buyer', models.EmailField(blank=True, max_length=254, null=True)),
+                ('upload_choice', models.CharField(max_length=20)),
+                ('upload_file', models.CharField(blank=True, max_length=255)),
+                ('number_of_tickets', models.PositiveIntegerField()),
+                ('sell_price', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('sold', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tickets', to='archive.archivedevent')),
+                ('section', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tickets', to='archive.archivedeventsection')),
+                ('seller', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_tickets', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedTicketPDF',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('file', models.CharField(max_length=255)),
+                ('is_sold', models.BooleanField(default=False)),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('ticket', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='individual_pdfs', to='archive.archivedticket')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedTicketReservation',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('order_id', models.UUIDField(blank=True, db_index=True, null=True)),
+                ('quantity_reserved', models.PositiveIntegerField()),
+                ('data', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('buyer', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_reservations', to=settings.AUTH_USER_MODEL)),
+                ('ticket', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservations', to='archive.archivedticket')),
+            ],
+        ),
+    ]
@@ -0,0 +1,103 @@
+"""
+Cold storage for past events.
+
+archive.tasks moves events that ended long ago, with their sections, tickets,
+ticket PDFs and reservations, out of the live tables into these. Each archived
+row keeps its original primary key, the columns the archive is searched and
+joined on, and a ``data`` snapshot of every column of the original row.
+Orders and Sales stay where they are: they only point at tickets through
+Order.ticket_reference, which archive.utils.find_ticket resolves in either place.
+"""
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+from accounts.models import User
+
+
+def snapshot(instance):
+    """Every concrete column of ``instance`` as JSON-ready values"""
+    data = {}
+    for field in instance._meta.concrete_fields:
+        value = field.value_from_object(instance)
+        if isinstance(field, models.FileField):
+            value = value.name if value else ''
+        data[field.attname] = value
+    return data
+
+
+class ArchivedEvent(models.Model):
+    id = models.UUIDField(primary_key=True)
+    event_id = models.CharField(max_length=6, unique=True)
+    superadmin = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='archived_events')
+    name = models.CharField(max_length=255)
+    category_legacy = models.CharField(max_length=100, null=True, blank=True)
+    stadium_name = models.CharField(max_length=255)
+    starts_at = models.DateTimeField(db_index=True)
+    total_tickets = models.PositiveIntegerField(default=0)
+    sold_tickets = models.PositiveIntegerField(default=0)
+    total_sold_price = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    archived_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['-starts_at']
+
+    def __str__(self):
+        return f"{self.name} ({self.event_id})"
+
+
+class ArchivedEventSection(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    event = models.ForeignKey(ArchivedEvent, on_delete=models.CASCADE, related_name='sections')
+    name = models.CharField(max_length=100)
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+
+    def __str__(self):
+        return f"{self.name} ({self.event.name})"
+
+
+class ArchivedTicket(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    ticket_id = models.UUIDField(unique=True)
+    ticket_number = models.CharField(max_length=20, null=True, blank=True, db_index=True)
+    event = models.ForeignKey(ArchivedEvent, on_delete=models.CASCADE, related_name='tickets')
+    section = models.ForeignKey(ArchivedEventSection, on_delete=models.SET_NULL, null=True, related_name='tickets')
+    seller = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='archived_tickets')
+    buyer = models.EmailField(null=True, blank=True)
+    upload_choice = models.CharField(max_length=20)
+    upload_file = models.CharField(max_length=255, blank=True)
+    number_of_tickets = models.PositiveIntegerField()
+    sell_price = models.DecimalField(max_digits=8, decimal_places=2)
+    sold = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.ticket_id} for {self.event.name}"
+
+
+class ArchivedTicketPDF(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    ticket = models.ForeignKey(ArchivedTicket, on_delete=models.CASCADE, related_name='individual_pdfs')
+    file = models.CharField(max_length=255)
+    is_sold = models.BooleanField(default=False)
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+
+    def __str__(self):
+        return f"PDF for Ticket ID {self.ticket.ticket_id}"
+
+
+class ArchivedTicketReservation(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    ticket = models.ForeignKey(ArchivedTicket, on_delete=models.CASCADE, related_name='reservations')
+    # Orders are never archived; keep the id rather than a second foreign key to them
+    order_id = models.UUIDField(null=True, blank=True, db_index=True)
+    buyer = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='archived_reservations')
+    quantity_reserved = models.PositiveIntegerField()
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+
+    def __str__(self):
+        return f"Reservation for {self.ticket.ticket_id}"
@@ -0,0 +1,119 @@
+import logging
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from datetime import timedelta
+from events.cache_utils import bump_version
+from events.home_data import HOME_NAMESPACE
+from events.autocomplete import AUTOCOMPLETE_REBUILD_NAMESPACE
+from events.models import Event, EventSection
+from tickets.models import Ticket, TicketPDF, TicketReservation
+from archive.models import (
+    ArchivedEvent, ArchivedEventSection, ArchivedTicket, ArchivedTicketPDF, ArchivedTicketReservation, snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def archivable_events(older_than_days=None):
+    """Live events that started more than ``older_than_days`` ago"""
+    if older_than_days is None:
+        older_than_days = settings.ARCHIVE_EVENTS_AFTER_DAYS
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    return Event.objects.filter(starts_at__lt=cutoff)
+
+
+def archive_events(event_pks):
+    """
+    Copy the given events and everything hanging off them into the archive
+    tables and delete the live rows. Must run inside a transaction.
+    """
+    events = list(Event.objects.select_for_update().filter(pk__in=event_pks))
+    sections = list(EventSection.objects.filter(event__in=events))
+    tickets = list(Ticket.objects.filter(event__in=events))
+    pdfs = list(TicketPDF.objects.filter(ticket__in=tickets))
+    reservations = list(TicketReservation.objects.filter(ticket__in=tickets))
+
+    ArchivedEvent.objects.bulk_create([
+        ArchivedEvent(
+            id=event.pk, event_id=event.event_id, superadmin_id=event.superadmin_id, name=event.name,
+            category_legacy=event.category_legacy, stadium_name=event.stadium_name, starts_at=event.starts_at,
+            total_tickets=event.total_tickets, sold_tickets=event.sold_tickets,
+            total_sold_price=event.total_sold_price, data=snapshot(event),
+        )
+        for event in events
+    ])
+    ArchivedEventSection.objects.bulk_create([
+        ArchivedEventSection(id=section.pk, event_id=section.event_id, name=section.name, data=snapshot(section))
+        for section in sections
+    ], batch_size=1000)
+    ArchivedTicket.objects.bulk_create([
+        ArchivedTicket(
+            id=ticket.pk, ticket_id=ticket.ticket_id, ticket_number=ticket.ticket_number,
+            event_id=ticket.event_id, section_id=ticket.section_id, seller_id=ticket.seller_id,
+            buyer=ticket.buyer, upload_choice=ticket.upload_choice,
+            upload_file=ticket.upload_file.name if ticket.upload_file else '',
+            number_of_tickets=ticket.number_of_tickets, sell_price=ticket.sell_price, sold=ticket.sold,
+            created_at=ticket.created_at, data=snapshot(ticket),
+        )
+        for ticket in tickets
+    ], batch_size=1000)
+    ArchivedTicketPDF.objects.bulk_create([
+        ArchivedTicketPDF(
+            id=pdf.pk, ticket_id=pdf.ticket_id, file=pdf.file.name if pdf.file else '',
+            is_sold=pdf.is_sold, data=snapshot(pdf),
+        )
+        for pdf in pdfs
+    ], batch_size=1000)
+    ArchivedTicketReservation.objects.bulk_create([
+        ArchivedTicketReservation(
+            id=reservation.pk, ticket_id=reservation.ticket_id, order_id=reservation.order_id,
+            buyer_id=reservation.buyer_id, quantity_reserved=reservation.quantity_reserved,
+            data=snapshot(reservation),
+        )
+        for reservation in reservations
+    ], batch_size=1000)
+
+    # Children first so the event delete has nothing left to cascade into.
+    # Uploaded files stay in storage; the archived rows still point at them.
+    TicketReservation.objects.filter(pk__in=[r.pk for r in reservations]).delete()
+    TicketPDF.objects.filter(pk__in=[p.pk for p in pdfs]).delete()
+    Ticket.objects.filter(pk__in=[t.pk for t in tickets]).delete()
+    EventSection.objects.filter(pk__in=[s.pk for s in sections]).delete()
+    Event.objects.filter(pk__in=[e.pk for e in events]).delete()
+    return len(events), len(tickets)
+
+
+def archive_past_events_task(older_than_days=None, chunk_size=None):
+    """
+    Move events that started more than ARCHIVE_EVENTS_AFTER_DAYS ago into the
+    archive tables, ``chunk_size`` events per transaction so that a large
+    backlog never holds locks on the live tables for long.
+    """
+    if chunk_size is None:
+        chunk_size = settings.ARCHIVE_CHUNK_SIZE
+
+    archived_events = archived_tickets = 0
+    try:
+        while True:
+            pks = list(
+                archivable_events(older_than_days).order_by('starts_at').values_list('pk', flat=True)[:chunk_size]
+            )
+            if not pks:
+                break
+            with transaction.atomic():
+                events, tickets = archive_events(pks)
+            archived_events += events
+            archived_tickets += tickets
+            logger.info(f'Archived {events} events and {tickets} tickets')
+
+        if archived_events:
+            bump_version(HOME_NAMESPACE)
+            bump_version(AUTOCOMPLETE_REBUILD_NAMESPACE)
+        logger.info(
+            f'Event archiving completed - {archived_events} events, {archived_tickets} tickets archived'
+        )
+        return archived_events
+    except Exception as e:
+        logger.error(f'Error in archive_past_events_task: {str(e)}')
+        return archived_events
@@ -0,0 +1,73 @@
+from datetime import date
+
+from django.test import TestCase
+
+from events.models import Event, EventSection
+from go2events.testing import make_event, make_order, make_section, make_ticket, make_user
+from tickets.models import Order, Sale, Ticket, TicketPDF
+from .models import ArchivedEvent, ArchivedEventSection, ArchivedTicket, ArchivedTicketPDF
+from .tasks import archive_past_events_task
+from .utils import find_ticket
+
+
+class ArchivePastEventsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = make_user('seller@example.com', '+447700900010')
+        cls.buyer = make_user('buyer@example.com', '+447700900011', user_type='Buyer')
+        cls.past = make_event(cls.seller, date=date(2020, 1, 1))
+        cls.upcoming = make_event(cls.seller, name='Spurs vs Fulham')
+        past_section, upcoming_section = make_section(cls.past), make_section(cls.upcoming)
+
+        cls.sold = make_ticket(past_section, cls.seller, sold=True, buyer=cls.buyer.email)
+        cls.unsold = make_ticket(past_section, cls.seller)
+        cls.live = make_ticket(upcoming_section, cls.seller)
+        for name in ('seat-1.pdf', 'seat-2.pdf'):
+            TicketPDF.objects.create(ticket=cls.sold, file=f'tickets/pdfs/{name}', is_sold=True)
+
+        cls.order = make_order(cls.sold, cls.buyer)
+        cls.sale = Sale.objects.create(order=cls.order, seller=cls.seller, amount=240)
+
+    def test_past_event_moves_to_the_archive(self):
+        section_ids = set(self.past.sections.values_list('pk', flat=True))
+        self.assertEqual(archive_past_events_task(older_than_days=30), 1)
+
+        self.assertFalse(Event.objects.filter(pk=self.past.pk).exists())
+        self.assertFalse(EventSection.objects.filter(pk__in=section_ids).exists())
+        self.assertFalse(Ticket.objects.filter(event_id=self.past.pk).exists())
+        self.assertFalse(TicketPDF.objects.filter(ticket_id=self.sold.pk).exists())
+
+        archived = ArchivedEvent.objects.get(pk=self.past.pk)
+        self.assertEqual(archived.event_id, self.past.event_id)
+        self.assertEqual(set(ArchivedEventSection.objects.filter(event=archived).values_list('pk', flat=True)), section_ids)
+        self.assertEqual(
+            set(ArchivedTicket.objects.filter(event=archived).values_list('ticket_id', flat=True)),
+            {self.sold.ticket_id, self.unsold.ticket_id},
+        )
+        self.assertEqual(
+            sorted(ArchivedTicketPDF.objects.filter(ticket__ticket_id=self.sold.ticket_id).values_list('file', flat=True)),
+            ['tickets/pdfs/seat-1.pdf', 'tickets/pdfs/seat-2.pdf'],
+        )
+
+    def test_upcoming_events_orders_and_sales_stay(self):
+        archive_past_events_task(older_than_days=30)
+        self.assertTrue(Event.objects.filter(pk=self.upcoming.pk).exists())
+        self.assertTrue(Ticket.objects.filter(pk=self.live.pk).exists())
+        self.assertTrue(Order.objects.filter(pk=self.order.pk).exists())
+        self.assertTrue(Sale.objects.filter(pk=self.sale.pk).exists())
+
+    def test_events_are_archived_in_chunks(self):
+        make_section(make_event(self.seller, name='Leeds vs Everton', date=date(2020, 2, 1)))
+        self.assertEqual(archive_past_events_task(older_than_days=30, chunk_size=1), 2)
+        self.assertEqual(ArchivedEvent.objects.count(), 2)
+
+    def test_find_ticket_falls_back_to_the_archive(self):
+        self.assertIsInstance(find_ticket(self.order.ticket_reference), Ticket)
+        archive_past_events_task(older_than_days=30)
+
+        archived = find_ticket(self.order.ticket_reference)
+        self.assertIsInstance(archived, ArchivedTicket)
+        self.assertEqual(archived.seller, self.seller)
+        self.assertIsInstance(find_ticket(self.live.ticket_id), Ticket)
+        with self.assertRaises(Ticket.DoesNotExist):
+            find_ticket(self.upcoming.pk)
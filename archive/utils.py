@@ -0,0 +1,18 @@
+from tickets.models import Ticket
+from .models import ArchivedTicket
+
+
+def find_ticket(ticket_id):
+    """
+    The live Ticket with ``ticket_id``, or its ArchivedTicket once the event
+    has been archived. The archived row has the fields order and sale pages
+    use (ticket_id, seller, sell_price, upload_choice, ...). Raises
+    Ticket.DoesNotExist when neither exists, like Ticket.objects.get.
+    """
+    try:
+        return Ticket.objects.get(ticket_id=ticket_id)
+    except Ticket.DoesNotExist:
+        try:
+            return ArchivedTicket.objects.select_related('seller').get(ticket_id=ticket_id)
+        except ArchivedTicket.DoesNotExist:
+            raise Ticket.DoesNotExist(f'No live or archived ticket {ticket_id}')
@@ -0,0 +1,195 @@
+"""
+In-process prefix index for search autocomplete.
+
+Every worker keeps the upcoming events in memory as a sorted array of
+``(token, starts_at, event pk)`` postings built from name, team, stadium and
+sport. A lookup is a few binary searches plus a walk in kick-off order that
+stops once it has enough hits, with no database round trip.
+
+Changes are picked up through the ``autocomplete`` cache version, which
+events.signals bumps whenever an Event is saved. Section and listing changes
+only reach the index through the price range they save on their event. When
+a lookup sees a new version it reloads only the events modified since the
+last sync, dropping those that are no longer upcoming. Deletions bump
+``autocomplete-rebuild``, which forces a full rebuild, as does the first lookup
+of a new day (events that have started drop out) and the first lookup after
+MAX_INDEX_AGE, in case a version bump was missed.
+
+Rebuilds and refreshes build new arrays and swap them in as one tuple, so a
+lookup running in another thread always reads a consistent index without
+taking the lock.
+"""
+import heapq
+import threading
+import time
+from bisect import bisect_left
+from operator import itemgetter
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+
+from .cache_utils import get_version
+from .models import Event
+from .search import search_terms
+
+AUTOCOMPLETE_NAMESPACE = 'autocomplete'
+AUTOCOMPLETE_REBUILD_NAMESPACE = 'autocomplete-rebuild'
+AUTOCOMPLETE_LIMIT = 10
+
+# How often a worker asks the cache whether the index is stale, in seconds
+VERSION_CHECK_INTERVAL = 2
+# Longest a worker serves the index without a full rebuild, in seconds
+MAX_INDEX_AGE = 600
+# Overlap when loading changed rows, covers clock skew between app servers
+SYNC_OVERLAP = timedelta(seconds=5)
+
+INDEXED_FIELDS = ('name', 'team', 'stadium_name', 'sports_type', 'category_legacy')
+TOKEN_END = '\uffff'
+
+
+def _event_url_template():
+    # reverse() once per load instead of once per event
+    return reverse('events:event_tickets', args=['__event_id__']).replace('__event_id__', '{event_id}')
+
+
+def _build_entry(row, url_template):
+    tokens = set()
+    for field in INDEXED_FIELDS:
+        tokens.update(search_terms(row[field]))
+    return {
+        'starts_at': row['starts_at'],
+        'tokens': tokens,
+        'data': {
+            'name': row['name'],
+            'category': row['category_legacy'] or row['sports_type'] or 'Sports',
+            'date': row['date'].strftime('%b %d, %Y'),
+            'stadium': row['stadium_name'],
+            'min_price': str(row['min_price'] or 0),
+            'max_price': str(row['max_price'] or 0),
+            'url': url_template.format(event_id=row['event_id']),
+        },
+    }
+
+
+class AutocompleteIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (entries by event pk, sorted (token, starts_at, pk) postings)
+        self._index = ({}, [])
+        self._built_on = None
+        self._synced_at = None
+        self._versions = None
+        self._checked_at = 0
+        self._rebuilt_at = 0
+
+    def lookup(self, query, limit=AUTOCOMPLETE_LIMIT):
+        """Return autocomplete rows for the soonest upcoming events matching every word of ``query``"""
+        self.ensure_fresh()
+        terms = search_terms(query)
+        if not terms:
+            return []
+
+        # Walk the most selective term's postings in date order and check the
+        # other terms per event, so a lookup stops after ``limit`` hits.
+        entries, tokens = self._index
+        terms.sort(key=lambda term: self._count(tokens, term))
+        first, others = terms[0], terms[1:]
+        now = timezone.now()
+
+        results, seen = [], set()
+        for _, starts_at, pk in heapq.merge(*self._postings(tokens, first), key=itemgetter(1)):
+            if starts_at < now or pk in seen:
+                continue
+            seen.add(pk)
+            entry = entries.get(pk)
+            if entry is None:
+                continue
+            if all(any(token.startswith(term) for token in entry['tokens']) for term in others):
+                results.append(entry['data'])
+                if len(results) == limit:
+                    break
+        return results
+
+    @staticmethod
+    def _count(tokens, term):
+        return bisect_left(tokens, (term + TOKEN_END,)) - bisect_left(tokens, (term,))
+
+    @staticmethod
+    def _postings(tokens, prefix):
+        """Yield one date-ordered slice of the token array per token starting with ``prefix``"""
+        position = bisect_left(tokens, (prefix,))
+        end = bisect_left(tokens, (prefix + TOKEN_END,))
+        while position < end:
+            token = tokens[position][0]
+            boundary = bisect_left(tokens, (token + '\0',), position, end)
+            yield (tokens[i] for i in range(position, boundary))
+            position = boundary
+
+    def ensure_fresh(self):
+        now = time.monotonic()
+        if self._versions is not None and now - self._checked_at < VERSION_CHECK_INTERVAL:
+            return
+        self._checked_at = now
+
+        versions = (get_version(AUTOCOMPLETE_NAMESPACE), get_version(AUTOCOMPLETE_REBUILD_NAMESPACE))
+        expired = now - self._rebuilt_at >= MAX_INDEX_AGE
+        if versions == self._versions and self._built_on == timezone.now().date() and not expired:
+            return
+
+        with self._lock:
+            if (
+                self._versions is None or versions[1] != self._versions[1]
+                or self._built_on != timezone.now().date() or now - self._rebuilt_at >= MAX_INDEX_AGE
+            ):
+                self.rebuild()
+                self._rebuilt_at = now
+            elif versions != self._versions:
+                self.refresh()
+            self._versions = versions
+
+    def rebuild(self):
+        """Load every upcoming event from the database"""
+        synced_at = timezone.now()
+        today = synced_at.date()
+        url_template = _event_url_template()
+        entries = {row['pk']: _build_entry(row, url_template) for row in self._upcoming(synced_at)}
+        tokens = sorted(
+            (token, entry['starts_at'], pk) for pk, entry in entries.items() for token in entry['tokens']
+        )
+        self._index = (entries, tokens)
+        self._built_on, self._synced_at = today, synced_at
+
+    def refresh(self):
+        """Reload only the events modified since the last sync"""
+        synced_at = timezone.now()
+        changed = {
+            row['pk']: row
+            for row in self._rows().filter(modified__gte=self._synced_at - SYNC_OVERLAP)
+        }
+        if changed:
+            entries, tokens = self._index
+            entries = {pk: entry for pk, entry in entries.items() if pk not in changed}
+            tokens = [posting for posting in tokens if posting[2] not in changed]
+            url_template = _event_url_template()
+            for pk, row in changed.items():
+                # Events moved into the past are left out
+                if row['starts_at'] >= synced_at:
+                    entry = entries[pk] = _build_entry(row, url_template)
+                    tokens.extend((token, entry['starts_at'], pk) for token in entry['tokens'])
+            tokens.sort()
+            self._index = (entries, tokens)
+        self._synced_at = synced_at
+
+    @staticmethod
+    def _rows():
+        return Event.objects.order_by().values(
+            'pk', 'event_id', 'date', 'starts_at', 'min_price', 'max_price', *INDEXED_FIELDS
+        )
+
+    @classmethod
+    def _upcoming(cls, now):
+        return cls._rows().filter(starts_at__gte=now)
+
+
+autocomplete_index = AutocompleteIndex()
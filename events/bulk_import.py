@@ -0,0 +1,295 @@
+"""
+Bulk import of events with their sections, for loading whole fixture lists.
+
+Rows come from JSON (a list of event objects, or ``{"events": [...]}``) or
+CSV. Every row is validated before anything is written. The events and
+sections are then inserted with two bulk_create calls in one transaction, and
+the event_ids come from a single counter call. If any row is invalid nothing
+is imported, and the per-row errors are returned instead:
+
+    result = import_events(parse_json(body), superadmin)
+    result.errors      # [{'row': 3, 'errors': {'date': '...'}}]
+    result.events      # created Event instances
+
+CSV files have one event per line and these columns:
+
+    name, category, sports_type, country, team, stadium_name, stadium_image,
+    event_logo, date, time, normal_service_charge, reseller_service_charge,
+    sections
+
+``sections`` is a ``;`` separated list of ``name|color|lower|upper`` with the
+prices optional, e.g. ``Block A|#3CB44B|50|120; VIP|#911EB4``. Events without
+sections get Event.DEFAULT_SECTIONS.
+"""
+import csv
+import io
+import json
+from datetime import datetime, date, time
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from .autocomplete import AUTOCOMPLETE_NAMESPACE
+from .cache_utils import bump_version
+from .etags import CATALOGUE_NAMESPACE
+from .event_ids import allocate_event_ids
+from .home_data import HOME_NAMESPACE
+from .models import Event, EventSection, EventCategory
+from .stadium_config import normalize_section_name
+
+MAX_IMPORT_ROWS = 5000
+
+REQUIRED_FIELDS = ['name', 'stadium_name', 'stadium_image', 'event_logo', 'date', 'time']
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+class ImportResult:
+    def __init__(self, events, errors, dry_run=False):
+        self.events = events
+        self.errors = errors
+        self.dry_run = dry_run
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+def parse_json(content):
+    try:
+        data = json.loads(content)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise ImportFormatError('Invalid JSON data')
+    if isinstance(data, dict):
+        data = data.get('events')
+    if not isinstance(data, list):
+        raise ImportFormatError('Expected a list of events or {"events": [...]}')
+    return data
+
+
+def parse_csv(content):
+    if isinstance(content, bytes):
+        try:
+            content = content.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raise ImportFormatError('CSV files must be UTF-8 encoded')
+    reader = csv.DictReader(io.StringIO(content))
+    missing = [column for column in REQUIRED_FIELDS if column not in (reader.fieldnames or [])]
+    if missing:
+        raise ImportFormatError(f'Missing CSV columns: {", ".join(missing)}')
+    rows = []
+    for record in reader:
+        row = {key: (value or '').strip() for key, value in record.items() if key}
+        row['sections'] = _parse_csv_sections(row.get('sections', ''))
+        rows.append(row)
+    return rows
+
+
+def _parse_csv_sections(value):
+    sections = []
+    for chunk in value.split(';'):
+        if not chunk.strip():
+            continue
+        parts = [part.strip() for part in chunk.split('|')]
+        section = {'name': parts[0], 'color': parts[1] if len(parts) > 1 else ''}
+        if len(parts) > 2 and parts[2]:
+            section['lower_price'] = parts[2]
+        if len(parts) > 3 and parts[3]:
+            section['upper_price'] = parts[3]
+        sections.append(section)
+    return sections
+
+
+def _parse_date(value):
+    if isinstance(value, date):
+        return value
+    if not isinstance(value, str):
+        raise ValueError('Date must be a string in YYYY-MM-DD format')
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).date()
+        except ValueError:
+            raise ValueError(f'Invalid date format: {value}. Expected YYYY-MM-DD')
+
+
+def _parse_time(value):
+    if isinstance(value, time):
+        return value
+    if not isinstance(value, str):
+        raise ValueError('Time must be a string in HH:MM or HH:MM:SS format')
+    for fmt in ('%H:%M:%S', '%H:%M'):
+        try:
+            return datetime.strptime(value, fmt).time()
+        except ValueError:
+            pass
+    raise ValueError(f'Invalid time format: {value}. Expected HH:MM or HH:MM:SS')
+
+
+def _validation_messages(error):
+    return {field: ' '.join(messages) for field, messages in error.message_dict.items()}
+
+
+def _build_event(data, superadmin, categories, now):
+    """Return (event, sections, errors) for one input row"""
+    if not isinstance(data, dict):
+        return None, [], {'row': 'Each event must be an object'}
+
+    errors = {}
+    for field in REQUIRED_FIELDS:
+        if not data.get(field):
+            errors[field] = 'This field is required.'
+
+    try:
+        event_date = _parse_date(data.get('date')) if data.get('date') else None
+    except ValueError as e:
+        errors['date'] = str(e)
+        event_date = None
+    try:
+        event_time = _parse_time(data.get('time')) if data.get('time') else None
+    except ValueError as e:
+        errors['time'] = str(e)
+        event_time = None
+    if event_date and event_date < now.date():
+        errors['date'] = 'Event date cannot be in the past'
+    elif event_date == now.date() and event_time and event_time < now.time():
+        errors['time'] = 'Event time cannot be in the past for today'
+
+    category_name = None
+    category = (data.get('category') or '').strip()
+    if category:
+        category_name = categories.get(category.lower())
+        if category_name is None:
+            errors['category'] = f'Unknown category: {category}'
+
+    event = Event(
+        superadmin=superadmin,
+        name=data.get('name') or '',
+        category_legacy=category_name,
+        sports_type=data.get('sports_type') or '',
+        country=data.get('country') or '',
+        team=data.get('team') or '',
+        stadium_name=data.get('stadium_name') or '',
+        stadium_image=data.get('stadium_image') or '',
+        event_logo=data.get('event_logo') or '',
+        date=event_date,
+        time=event_time,
+        starts_at=Event.start_datetime(event_date, event_time) if event_date and event_time else None,
+        normal_service_charge=data.get('normal_service_charge') or 0,
+        reseller_service_charge=data.get('reseller_service_charge') or 0,
+    )
+    try:
+        event.full_clean(exclude=['event_id', 'superadmin', 'starts_at'], validate_unique=False, validate_constraints=False)
+    except ValidationError as e:
+        for field, message in _validation_messages(e).items():
+            errors.setdefault(field, message)
+
+    sections_data = data.get('sections') or [dict(section) for section in Event.DEFAULT_SECTIONS]
+    if not isinstance(sections_data, list):
+        errors['sections'] = 'Sections must be a list'
+        sections_data = []
+
+    sections, names = [], set()
+    for index, section_data in enumerate(sections_data, start=1):
+        if not isinstance(section_data, dict):
+            errors[f'sections[{index}]'] = 'Each section must be an object with name and color'
+            continue
+        section = EventSection(
+            name=section_data.get('name') or '',
+            color=section_data.get('color') or '',
+            lower_price=section_data.get('lower_price') or 0,
+            upper_price=section_data.get('upper_price') or 0,
+        )
+        # bulk_create skips EventSection.save
+        section.svg_section_key = normalize_section_name(section.name) or ''
+        try:
+            section.full_clean(exclude=['event'], validate_unique=False, validate_constraints=False)
+        except ValidationError as e:
+            errors[f'sections[{index}]'] = '; '.join(
+                f'{field}: {message}' for field, message in _validation_messages(e).items()
+            )
+            continue
+        if section.name in names:
+            errors[f'sections[{index}]'] = f'Duplicate section name: {section.name}'
+            continue
+        names.add(section.name)
+        sections.append(section)
+
+    # What update_price_range() would compute once the sections exist
+    lower = [section.lower_price for section in sections if section.lower_price > 0]
+    upper = [section.upper_price for section in sections if section.upper_price > 0]
+    event.min_price = min(lower) if lower else 0
+    event.max_price = max(upper) if upper else 0
+    return event, sections, errors
+
+
+def validate_rows(rows, superadmin):
+    """Build unsaved events and sections for ``rows`` and collect per-row errors"""
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise ImportFormatError(f'At most {MAX_IMPORT_ROWS} events can be imported at once')
+
+    categories = {}
+    for name, slug in EventCategory.objects.filter(is_active=True).values_list('name', 'slug'):
+        categories[name.lower()] = name
+        categories[slug.lower()] = name
+
+    now = timezone.localtime()
+    built, errors = [], []
+    for number, data in enumerate(rows, start=1):
+        event, sections, row_errors = _build_event(data, superadmin, categories, now)
+        if row_errors:
+            errors.append({'row': number, 'errors': row_errors})
+        else:
+            built.append((event, sections))
+    return built, errors
+
+
+def _assign_event_ids(events):
+    ids = allocate_event_ids(len(events))
+    # Events created before the allocator kept random ids, skip any we hit
+    taken = set(Event.objects.filter(event_id__in=ids).values_list('event_id', flat=True))
+    while taken:
+        ids = [event_id for event_id in ids if event_id not in taken]
+        extra = allocate_event_ids(len(events) - len(ids))
+        taken = set(Event.objects.filter(event_id__in=extra).values_list('event_id', flat=True))
+        ids += extra
+    for event, event_id in zip(events, ids):
+        event.event_id = event_id
+
+
+def import_events(rows, superadmin, dry_run=False):
+    """
+    Validate ``rows`` and, if all of them are valid, create the events and
+    their sections. Nothing is written when any row fails or ``dry_run`` is set.
+    """
+    built, errors = validate_rows(rows, superadmin)
+    if errors:
+        return ImportResult([], errors, dry_run)
+    events = [event for event, _ in built]
+    if dry_run or not events:
+        return ImportResult(events, [], dry_run)
+
+    with transaction.atomic():
+        _assign_event_ids(events)
+        Event.objects.bulk_create(events, batch_size=500)
+        sections = []
+        for event, event_sections in built:
+            for section in event_sections:
+                section.event = event
+                sections.append(section)
+        EventSection.objects.bulk_create(sections, batch_size=1000)
+
+        # bulk_create sends no post_save, so invalidate what events.signals would
+        transaction.on_commit(_invalidate_caches)
+
+    return ImportResult(events, [], dry_run)
+
+
+def _invalidate_caches():
+    bump_version(HOME_NAMESPACE)
+    bump_version(CATALOGUE_NAMESPACE)
+    bump_version(AUTOCOMPLETE_NAMESPACE)
@@ -0,0 +1,44 @@
+"""
+Versioned cache keys shared by the events and tickets apps.
+
+Every namespace keeps an integer version in the cache. Readers build their
+keys from the current version and writers bump it, so stale entries are
+never read again and simply age out of the cache.
+"""
+import time
+from django.core.cache import cache
+
+VERSION_KEY = 'version:{namespace}'
+
+
+def _fresh_version():
+    # Seeding from the clock means an evicted version key can never come back
+    # lower than a value that readers have already used to build keys.
+    return int(time.time() * 1000)
+
+
+def get_version(namespace):
+    """Return the current version number of a cache namespace"""
+    key = VERSION_KEY.format(namespace=namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _fresh_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(namespace):
+    """Invalidate every entry cached under a namespace"""
+    key = VERSION_KEY.format(namespace=namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = _fresh_version()
+        cache.set(key, version, None)
+        return version
+
+
+def versioned_key(namespace, *parts):
+    """Build a cache key that is tied to the current namespace version"""
+    suffix = ':'.join(str(part) for part in parts)
+    return f'{namespace}:{get_version(namespace)}:{suffix}'
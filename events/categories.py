@@ -0,0 +1,89 @@
+"""
+In-process registry of event categories for the API and the navigation menus.
+
+Every worker loads the active EventCategory rows and the team/tournament
+Category tree once and keeps them in memory. Changes are picked up through
+the ``categories`` cache version, which events.signals bumps whenever a
+Category or EventCategory is saved or deleted. Between changes, serving the
+category list or rendering the header costs no database query at all.
+Should a bump be missed (a cache that isn't shared, an evicted version key),
+a worker still reloads once its copy is MAX_AGE seconds old.
+
+Templates get the navigation categories from
+events.context_processors.categories as ``nav_categories``.
+"""
+import threading
+import time
+
+from .cache_utils import get_version
+from .models import Category, EventCategory
+
+CATEGORIES_NAMESPACE = 'categories'
+
+# How often a worker asks the cache whether the registry is stale, in seconds
+VERSION_CHECK_INTERVAL = 2
+# Longest a worker serves the registry without reloading it, in seconds
+MAX_AGE = 300
+
+
+class CategoryRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._event_categories = []
+        self._by_slug = {}
+        self._tree = {'teams': {}, 'tournaments': {}}
+        self._version = None
+        self._checked_at = 0
+        self._loaded_at = 0
+
+    def event_categories(self):
+        """Active EventCategory rows as dicts, in menu order"""
+        self.ensure_fresh()
+        return self._event_categories
+
+    def event_category(self, slug):
+        """Return the EventCategory dict for ``slug``, active or not, or None"""
+        self.ensure_fresh()
+        return self._by_slug.get(slug)
+
+    def tree(self):
+        """Teams and tournaments grouped by country, as served by CategoryListAPIView"""
+        self.ensure_fresh()
+        return self._tree
+
+    def ensure_fresh(self):
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < VERSION_CHECK_INTERVAL:
+            return
+        self._checked_at = now
+
+        version = get_version(CATEGORIES_NAMESPACE)
+        if version == self._version and now - self._loaded_at < MAX_AGE:
+            return
+        with self._lock:
+            if version != self._version or now - self._loaded_at >= MAX_AGE:
+                self.load()
+                self._version = version
+                self._loaded_at = now
+
+    def load(self):
+        by_slug, event_categories = {}, []
+        for category in EventCategory.objects.order_by('order', 'name'):
+            by_slug[category.slug] = {
+                'id': category.id, 'name': category.name, 'slug': category.slug, 'icon': category.icon,
+            }
+            if category.is_active:
+                event_categories.append(by_slug[category.slug])
+
+        tree = {'teams': {}, 'tournaments': {}}
+        keys = {'team': 'teams', 'tournament': 'tournaments'}
+        categories = Category.objects.filter(type__in=keys).order_by('country', 'name')
+        for pk, name, category_type, country in categories.values_list('id', 'name', 'type', 'country'):
+            tree[keys[category_type]].setdefault(country, []).append({'id': pk, 'name': name})
+
+        self._event_categories = event_categories
+        self._by_slug = by_slug
+        self._tree = tree
+
+
+category_registry = CategoryRegistry()
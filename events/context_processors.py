@@ -0,0 +1,6 @@
+from .categories import category_registry
+
+
+def categories(request):
+    """Navigation categories for partials/header.html, served from the in-process registry"""
+    return {'nav_categories': category_registry.event_categories}
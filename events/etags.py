@@ -0,0 +1,48 @@
+"""
+ETag functions for django.views.decorators.http.condition on the event APIs.
+
+A client that sends back the ETag it was given in If-None-Match gets a 304
+after the lookup below, without the view building its payload.
+"""
+import hashlib
+
+from django.utils import timezone
+
+from .cache_utils import get_version
+from .models import Event
+
+# Bumped by events.signals and the bulk writers whenever an event, section
+# or listing changes, see event_list_etag
+CATALOGUE_NAMESPACE = 'event-catalogue'
+
+
+def event_inventory_etag(request, event_id, *args, **kwargs):
+    """ETag of one event's sections and listings: one lookup on the event_id index"""
+    row = Event.objects.filter(event_id=event_id).values_list('inventory_version', 'modified').first()
+    if row is None:
+        return None
+    return _inventory_etag(event_id, *row)
+
+
+def inventory_etag(event):
+    """The event_inventory_etag of an Event instance that is already loaded"""
+    return _inventory_etag(event.event_id, event.inventory_version, event.modified)
+
+
+def _inventory_etag(event_id, inventory_version, modified):
+    return f'{event_id}-{inventory_version}-{int(modified.timestamp() * 1000)}'
+
+
+def event_list_etag(request, *args, **kwargs):
+    """
+    ETag of the event catalogue: the catalogue version, the kick-off of the
+    last event to have started, which moves as soon as an event drops out of
+    the upcoming filter, and the hour, which covers time_left. The kick-off
+    is one probe of the starts_at index.
+    """
+    now = timezone.now()
+    last_started = (
+        Event.objects.filter(starts_at__lt=now).order_by('-starts_at').values_list('starts_at', flat=True).first()
+    )
+    key = f"{get_version(CATALOGUE_NAMESPACE)}:{last_started.isoformat() if last_started else ''}:{now:%Y%m%d%H}"
+    return hashlib.md5(key.encode()).hexdigest()
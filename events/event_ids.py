@@ -0,0 +1,117 @@
+"""
+Allocation of the public 6-digit ``Event.event_id``.
+
+IDs come from a counter that only ever moves forward (a PostgreSQL sequence,
+or the EventIdCounter row elsewhere). The counter value is scrambled by a
+keyed permutation of the ID space, so IDs look random and can't be guessed
+from one another. Distinct counter values always map to distinct IDs, so
+allocating one costs a single counter query and two concurrent creations can
+never be handed the same ID.
+
+The permutation is a 4-round Feistel network over 20 bits, cycle-walked down
+to the 900,000 six-digit numbers. Its key is settings.EVENT_ID_KEY. Changing
+the key doesn't break anything, but new IDs may then land on old ones, and
+each such collision costs a retry in Event.save.
+
+Events created before the counter kept random IDs, and the archive app keeps
+them after their events are archived. An archived event is no longer in the
+events table, so its unique constraint can't catch a collision. Allocation
+skips those IDs itself, with one lookup on archive_archivedevent.event_id.
+"""
+import hashlib
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+
+FIRST_EVENT_ID = 100000
+ID_SPACE = 900000
+SEQUENCE_NAME = 'events_event_id_seq'
+
+HALF_BITS = 10
+HALF_MASK = (1 << HALF_BITS) - 1
+ROUNDS = 4
+
+
+class EventIdsExhausted(RuntimeError):
+    pass
+
+
+@lru_cache(maxsize=4)
+def _round_key(secret):
+    return hashlib.sha256(f'event-id:{secret}'.encode()).digest()
+
+
+def _feistel(value, key):
+    left, right = value >> HALF_BITS, value & HALF_MASK
+    for round_number in range(ROUNDS):
+        digest = hashlib.blake2b(bytes((round_number,)) + right.to_bytes(2, 'big'), key=key, digest_size=4)
+        left, right = right, left ^ (int.from_bytes(digest.digest(), 'big') & HALF_MASK)
+    return (left << HALF_BITS) | right
+
+
+def permute(position, secret=None):
+    """Map a counter position in [0, ID_SPACE) to a unique position in the same range"""
+    if not 0 <= position < ID_SPACE:
+        raise EventIdsExhausted(f'Event id counter {position} is outside the id space')
+    key = _round_key(settings.EVENT_ID_KEY if secret is None else secret)
+    # The network permutes [0, 2**20); walking the cycle until we land back
+    # inside the id space keeps it a permutation of [0, ID_SPACE).
+    value = _feistel(position, key)
+    while value >= ID_SPACE:
+        value = _feistel(value, key)
+    return value
+
+
+def next_counter_value():
+    """Take the next position from the event id counter"""
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT nextval(%s)', [SEQUENCE_NAME])
+            return cursor.fetchone()[0]
+
+    from .models import EventIdCounter
+    with transaction.atomic():
+        EventIdCounter.objects.filter(pk=EventIdCounter.SINGLETON_ID).update(value=F('value') + 1)
+        return EventIdCounter.objects.get(pk=EventIdCounter.SINGLETON_ID).value - 1
+
+
+def next_counter_values(count):
+    """Take ``count`` positions from the counter at once"""
+    if count <= 0:
+        return []
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT nextval(%s) FROM generate_series(1, %s)', [SEQUENCE_NAME, count])
+            return [row[0] for row in cursor.fetchall()]
+
+    from .models import EventIdCounter
+    with transaction.atomic():
+        EventIdCounter.objects.filter(pk=EventIdCounter.SINGLETON_ID).update(value=F('value') + count)
+        end = EventIdCounter.objects.get(pk=EventIdCounter.SINGLETON_ID).value
+    return list(range(end - count, end))
+
+
+def archived_event_ids(event_ids):
+    """The ones among ``event_ids`` that archived events still hold"""
+    from archive.models import ArchivedEvent
+    return set(ArchivedEvent.objects.filter(event_id__in=event_ids).values_list('event_id', flat=True))
+
+
+def allocate_event_id():
+    """Return a fresh 6-digit event_id without checking the events table"""
+    while True:
+        event_id = str(FIRST_EVENT_ID + permute(next_counter_value()))
+        if not archived_event_ids([event_id]):
+            return event_id
+
+
+def allocate_event_ids(count):
+    """Return ``count`` fresh event_ids, for bulk inserts that bypass Event.save"""
+    ids = []
+    while len(ids) < count:
+        fresh = [str(FIRST_EVENT_ID + permute(position)) for position in next_counter_values(count - len(ids))]
+        archived = archived_event_ids(fresh)
+        ids += [event_id for event_id in fresh if event_id not in archived]
+    return ids
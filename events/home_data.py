@@ -0,0 +1,67 @@
+"""
+Data layer for the home page.
+
+The category, upcoming and popular blocks are built once and cached as plain
+dictionaries behind the ``home`` cache version. The version is bumped whenever
+an Event, EventSection, Ticket or EventCategory changes (see events.signals),
+so a cached home page is served without touching the database.
+
+Popular events are read from the PopularEvent ranking, which the scheduler
+rebuilds from recent sales (events.tasks.refresh_popular_events_task).
+"""
+from django.core.cache import cache
+from django.utils import timezone
+
+from .cache_utils import versioned_key
+from .categories import category_registry
+from .models import Event, PopularEvent
+
+HOME_NAMESPACE = 'home'
+HOME_CACHE_TIMEOUT = 300
+HOME_EVENTS_LIMIT = 8
+
+
+def get_home_page_data():
+    """Return the cached home page blocks, building them on a cache miss"""
+    now = timezone.now()
+    key = versioned_key(HOME_NAMESPACE, 'data', now.date().isoformat())
+    data = cache.get(key)
+    if data is None:
+        data = build_home_page_data(now)
+        cache.set(key, data, HOME_CACHE_TIMEOUT)
+    return data
+
+
+def build_home_page_data(now):
+    categories = category_registry.event_categories()
+    upcoming_events = list(
+        Event.objects.filter(starts_at__gte=now).order_by('starts_at')[:HOME_EVENTS_LIMIT]
+    )
+    popular_events = [
+        popular.event for popular in
+        PopularEvent.objects.filter(event__starts_at__gte=now).select_related('event')[:HOME_EVENTS_LIMIT]
+    ]
+    if not popular_events:
+        # The ranking has not been built yet, e.g. right after a deploy
+        popular_events = list(
+            Event.objects.filter(starts_at__gte=now).order_by('-total_sold_price')[:HOME_EVENTS_LIMIT]
+        )
+
+    return {
+        'categories': categories,
+        'upcoming_events': [_serialize_event(e) for e in upcoming_events],
+        'popular_events': [_serialize_event(e) for e in popular_events],
+    }
+
+
+def _serialize_event(event):
+    return {
+        'event_id': event.event_id,
+        'name': event.name,
+        'event_logo': event.event_logo,
+        'stadium_name': event.stadium_name,
+        'date': event.date,
+        'time': event.time,
+        'category_display': event.get_category_display(),
+        'lowest_price': event.min_price,
+    }
@@ -0,0 +1,113 @@
+"""
+Management command to compare search autocomplete lookups against the
+in-process index in events.autocomplete.
+
+Synthetic events are created inside a transaction that is rolled back at the
+end, so the command is safe to run against a development database.
+
+Usage:
+    python manage.py benchmark_autocomplete
+    python manage.py benchmark_autocomplete --sizes 10000 100000 --repeat 50
+"""
+import random
+import statistics
+import time
+from datetime import date, timedelta, time as dt_time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from accounts.models import User
+from events.autocomplete import AutocompleteIndex
+from events.models import Event
+from events.search import search_events
+
+TEAMS = [
+    'Arsenal', 'Chelsea', 'Liverpool', 'Manchester United', 'Manchester City', 'Tottenham',
+    'Aston Villa', 'Everton', 'Newcastle', 'Leeds', 'Real Madrid', 'Barcelona', 'Inter', 'Milan',
+]
+STADIUMS = [
+    'Emirates Stadium', 'Stamford Bridge', 'Anfield', 'Old Trafford', 'Etihad Stadium',
+    'Villa Park', 'San Siro', 'Santiago Bernabeu', 'Wembley', 'Silverstone',
+]
+SPORTS = ['Football', 'Formula 1', 'MotoGP', 'Tennis', 'Boxing']
+QUERIES = ['ar', 'man', 'manchester ci', 'old traf', 'chelsea emir', 'formula', 'zzz']
+
+
+class Command(BaseCommand):
+    help = 'Benchmark search autocomplete: database queries vs the in-process index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000],
+                            help='Number of synthetic events to benchmark with')
+        parser.add_argument('--repeat', type=int, default=20, help='Lookups per query and path')
+
+    def handle(self, *args, **options):
+        for size in options['sizes']:
+            with transaction.atomic():
+                self._seed(size)
+                self._run(size, options['repeat'])
+                transaction.set_rollback(True)
+
+    def _seed(self, size):
+        superadmin = User.objects.create(
+            email='autocomplete-benchmark@example.com', phone='+447700900999', user_type='Reseller'
+        )
+        today = date.today()
+        rng = random.Random(size)
+        events = []
+        for i in range(size):
+            home, away = rng.sample(TEAMS, 2)
+            sport = rng.choice(SPORTS)
+            event_date = today + timedelta(days=rng.randint(0, 365))
+            events.append(Event(
+                event_id=str(100000 + i), superadmin=superadmin,
+                name=f'{home} vs {away}', team=home, stadium_name=rng.choice(STADIUMS),
+                sports_type=sport, category_legacy=sport,
+                stadium_image='https://example.com/s.png', event_logo='https://example.com/l.png',
+                date=event_date, time=dt_time(15, 0), starts_at=Event.start_datetime(event_date, dt_time(15, 0)),
+                normal_service_charge=10, reseller_service_charge=5,
+                min_price=rng.randint(20, 200), max_price=rng.randint(200, 900),
+            ))
+        Event.objects.bulk_create(events, batch_size=2000)
+
+    def _run(self, size, repeat):
+        index = AutocompleteIndex()
+        started = time.perf_counter()
+        index.rebuild()
+        build_ms = (time.perf_counter() - started) * 1000
+        # Pretend the index was just version-checked so lookups stay in memory
+        index._versions, index._checked_at = ('benchmark', 'benchmark'), float('inf')
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'{size} events (index built in {build_ms:.0f} ms)'))
+        self.stdout.write(f'{"query":<16}{"icontains ms":>14}{"search ms":>12}{"index ms":>12}')
+        for query in QUERIES:
+            legacy = self._time(lambda: self._icontains(query), repeat)
+            backend = self._time(lambda: self._search(query), repeat)
+            in_memory = self._time(lambda: index.lookup(query), repeat)
+            self.stdout.write(f'{query:<16}{legacy:>14.3f}{backend:>12.3f}{in_memory:>12.3f}')
+
+    @staticmethod
+    def _time(func, repeat):
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - started) * 1000)
+        return statistics.median(samples)
+
+    @staticmethod
+    def _icontains(query):
+        # The query SearchAutocompleteView ran before the index existed
+        return list(Event.objects.filter(
+            Q(name__icontains=query) |
+            Q(stadium_name__icontains=query) |
+            Q(category_legacy__icontains=query) |
+            Q(sports_type__icontains=query) |
+            Q(team__icontains=query)
+        )[:10])
+
+    @staticmethod
+    def _search(query):
+        return list(search_events(Event.objects.all(), query).order_by('-search_rank', 'date')[:10])
@@ -0,0 +1,97 @@
+"""
+Management command to compare creating events one request at a time (what
+EventCreateAPIView does per event) with events.bulk_import.
+
+Both runs happen inside transactions that are rolled back, so the command is
+safe to run against a development database.
+
+Usage:
+    python manage.py benchmark_event_import
+    python manage.py benchmark_event_import --count 1000 --sections 4
+"""
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from accounts.models import User
+from events.bulk_import import import_events, validate_rows
+from events.models import EventSection
+
+TEAMS = ['Arsenal', 'Chelsea', 'Liverpool', 'Everton', 'Leeds', 'Fulham', 'Brentford', 'Burnley']
+STADIUMS = ['Emirates Stadium', 'Stamford Bridge', 'Anfield', 'Elland Road', 'Craven Cottage']
+COLORS = ['#E6194B', '#3CB44B', '#4363D8', '#911EB4', '#F58231', '#46F0F0']
+
+
+class Command(BaseCommand):
+    help = 'Benchmark bulk event import against creating events one by one'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=1000, help='Number of events to import')
+        parser.add_argument('--sections', type=int, default=4, help='Sections per event')
+
+    def handle(self, *args, **options):
+        rows = self._rows(options['count'], options['sections'])
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'{len(rows)} events with {options["sections"]} sections each'
+        ))
+        self.stdout.write(f'{"path":<14}{"seconds":>10}{"queries":>10}')
+        for label, func in (('one by one', self._one_by_one), ('bulk import', self._bulk)):
+            with transaction.atomic():
+                superadmin = User.objects.create(
+                    email='import-benchmark@example.com', phone='+447700900998',
+                    user_type='Reseller', is_superadmin=True,
+                )
+                queries = []
+                # queries_log is capped, so count statements with a wrapper
+                with connection.execute_wrapper(lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)):
+                    started = time.perf_counter()
+                    func(rows, superadmin)
+                    elapsed = time.perf_counter() - started
+                transaction.set_rollback(True)
+            self.stdout.write(f'{label:<14}{elapsed:>10.2f}{len(queries):>10}')
+
+    @staticmethod
+    def _rows(count, section_count):
+        rng = random.Random(count)
+        start = date.today() + timedelta(days=30)
+        rows = []
+        for i in range(count):
+            home, away = rng.sample(TEAMS, 2)
+            rows.append({
+                'name': f'{home} vs {away} {i}',
+                'team': home,
+                'sports_type': 'Football',
+                'stadium_name': rng.choice(STADIUMS),
+                'stadium_image': 'https://example.com/stadium.png',
+                'event_logo': 'https://example.com/logo.png',
+                'date': (start + timedelta(days=i % 280)).isoformat(),
+                'time': '15:00',
+                'normal_service_charge': '10',
+                'reseller_service_charge': '5',
+                'sections': [
+                    {'name': f'Block {s}', 'color': COLORS[s % len(COLORS)],
+                     'lower_price': str(40 + s * 10), 'upper_price': str(90 + s * 20)}
+                    for s in range(section_count)
+                ],
+            })
+        return rows
+
+    @staticmethod
+    def _one_by_one(rows, superadmin):
+        # Validation is shared; what differs is how the rows reach the database
+        built, _ = validate_rows(rows, superadmin)
+        for event, sections in built:
+            event.save()
+            for section in sections:
+                EventSection.objects.create(
+                    event=event, name=section.name, color=section.color,
+                    lower_price=section.lower_price, upper_price=section.upper_price,
+                )
+
+    @staticmethod
+    def _bulk(rows, superadmin):
+        result = import_events(rows, superadmin)
+        assert result.ok, result.errors
@@ -0,0 +1,103 @@
+"""
+Management command to compare section name matching in events.stadium_config:
+the nested substring loop normalize_section_name used to run, the compiled
+SectionMatcher, and normalize_section_name with its memo cache warm.
+
+The section names are built from SECTION_NAME_MAPPINGS the way sellers and
+feeds write them (block and row suffixes, odd casing, names no stadium SVG
+knows), so nothing touches the database.
+
+Usage:
+    python manage.py benchmark_section_matcher
+    python manage.py benchmark_section_matcher --names 5000 --repeat 20
+"""
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from events.stadium_config import (
+    SECTION_NAME_MAPPINGS, SVG_TO_SECTION_NAMES, SectionMatcher, normalize_section_name,
+)
+
+SUFFIXES = ['', ' Block {n}', ' - Block {n}', ' Row {row}', ' Block {n} Row {row}', ' (Restricted View)']
+UNMAPPED = ['Block {n}', 'Section {n}', 'General Admission', 'Family Stand', 'Paddock', 'Upper {n}']
+
+
+def legacy_normalize(section_name):
+    """normalize_section_name before the matcher was compiled"""
+    if not section_name:
+        return None
+    name_clean = section_name.strip().lower()
+    if name_clean in SVG_TO_SECTION_NAMES:
+        return SVG_TO_SECTION_NAMES[name_clean]
+    for svg_key, variations in SECTION_NAME_MAPPINGS.items():
+        for variation in variations:
+            if variation.lower() in name_clean or name_clean in variation.lower():
+                return svg_key
+    return name_clean.replace(' ', '-').replace('_', '-')
+
+
+def compiled_normalize(section_name):
+    """normalize_section_name without its memo cache"""
+    return normalize_section_name.__wrapped__(section_name)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark stadium section name matching: substring loop vs compiled matcher vs memo cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--names', type=int, default=2000, help='Number of synthetic section names')
+        parser.add_argument('--repeat', type=int, default=10, help='Passes over the names per path')
+
+    def handle(self, *args, **options):
+        names = self._names(options['names'])
+        started = time.perf_counter()
+        SectionMatcher(SECTION_NAME_MAPPINGS)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        mismatches = sum(legacy_normalize(name) != compiled_normalize(name) for name in names)
+        normalize_section_name.cache_clear()
+        for name in names:
+            normalize_section_name(name)
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f'{len(names)} section names, {len(SVG_TO_SECTION_NAMES)} variations '
+            f'(matcher built in {build_ms:.1f} ms)'
+        ))
+        self.stdout.write(f'{"path":<12}{"ms per pass":>14}{"us per name":>14}')
+        for label, func in (
+            ('loop', legacy_normalize),
+            ('matcher', compiled_normalize),
+            ('memoized', normalize_section_name),
+        ):
+            per_pass = self._time(lambda: [func(name) for name in names], options['repeat'])
+            self.stdout.write(f'{label:<12}{per_pass:>14.3f}{per_pass * 1000 / len(names):>14.2f}')
+        self.stdout.write(
+            f'{mismatches} names resolve differently: the matcher prefers the longest variation, '
+            f'the loop the first one in SECTION_NAME_MAPPINGS'
+        )
+
+    @staticmethod
+    def _names(count):
+        rng = random.Random(count)
+        variations = [variation for values in SECTION_NAME_MAPPINGS.values() for variation in values]
+        names = []
+        for _ in range(count):
+            n, row = rng.randint(1, 540), rng.choice('ABCDEFGHJKLMNPQRSTUVWXYZ')
+            if rng.random() < 0.2:
+                name = rng.choice(UNMAPPED).format(n=n)
+            else:
+                name = rng.choice(variations) + rng.choice(SUFFIXES).format(n=n, row=row)
+            names.append(name.upper() if rng.random() < 0.1 else name)
+        return names
+
+    @staticmethod
+    def _time(func, repeat):
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - started) * 1000)
+        return statistics.median(samples)
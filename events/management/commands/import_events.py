@@ -0,0 +1,59 @@
+"""
+Management command to import a fixture list of events with their sections.
+
+The file is JSON or CSV (picked from the extension unless --format is given),
+in the formats described in events/bulk_import.py. Every row is validated
+first and nothing is imported if any row is invalid.
+
+Usage:
+    python manage.py import_events fixtures.csv --superadmin admin@example.com
+    python manage.py import_events fixtures.json --dry-run
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from events.bulk_import import ImportFormatError, import_events, parse_csv, parse_json
+
+
+class Command(BaseCommand):
+    help = 'Bulk import events and sections from a JSON or CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='JSON or CSV file to import')
+        parser.add_argument('--format', choices=['json', 'csv'], help='File format (default: from the extension)')
+        parser.add_argument('--superadmin', help='Email of the superadmin who owns the events (default: the first one)')
+        parser.add_argument('--dry-run', action='store_true', help='Validate the file without importing anything')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('csv' if path.lower().endswith('.csv') else 'json')
+
+        superadmins = User.objects.filter(is_superadmin=True).order_by('date_joined')
+        if options['superadmin']:
+            superadmins = superadmins.filter(email=options['superadmin'])
+        superadmin = superadmins.first()
+        if superadmin is None:
+            raise CommandError('No matching superadmin found')
+
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+        except OSError as e:
+            raise CommandError(f'Could not read {path}: {e}')
+
+        try:
+            rows = parse_csv(content) if file_format == 'csv' else parse_json(content)
+            result = import_events(rows, superadmin, dry_run=options['dry_run'])
+        except ImportFormatError as e:
+            raise CommandError(str(e))
+
+        if not result.ok:
+            for error in result.errors:
+                details = '; '.join(f'{field}: {message}' for field, message in error['errors'].items())
+                self.stdout.write(self.style.ERROR(f'Row {error["row"]}: {details}'))
+            raise CommandError(f'{len(result.errors)} of {len(rows)} events are invalid, nothing was imported')
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(f'All {len(rows)} events are valid (dry run, nothing imported)'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Imported {len(result.events)} events'))
@@ -0,0 +1,38 @@
+"""
+Management command to rebuild the denormalized Event.min_price/max_price columns
+from the events' sections. The columns are maintained incrementally on every
+section and ticket change; run this after bulk imports or to repair drift.
+
+Usage:
+    python manage.py rebuild_event_prices
+    python manage.py rebuild_event_prices --event-id 123456
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import DecimalField, Min, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from events.models import Event, EventSection
+
+
+class Command(BaseCommand):
+    help = 'Rebuild Event.min_price and Event.max_price from section prices'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event-id', help='Only rebuild this event (6-digit event_id)')
+
+    def handle(self, *args, **options):
+        events = Event.objects.all()
+        if options['event_id']:
+            events = events.filter(event_id=options['event_id'])
+
+        price_field = DecimalField(max_digits=8, decimal_places=2)
+        sections = EventSection.objects.filter(event=OuterRef('pk')).order_by().values('event')
+        updated = events.update(
+            min_price=Coalesce(Subquery(
+                sections.filter(lower_price__gt=0).annotate(low=Min('lower_price')).values('low')
+            ), Value(0), output_field=price_field),
+            max_price=Coalesce(Subquery(
+                sections.filter(upper_price__gt=0).annotate(high=Max('upper_price')).values('high')
+            ), Value(0), output_field=price_field),
+        )
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt price range for {updated} events'))
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from events.tasks import refresh_popular_events_task
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the popular events ranking from recent completed orders'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window-days', type=int, default=settings.POPULAR_EVENTS_WINDOW_DAYS,
+            help='Rank by sales from this many days back'
+        )
+
+    def handle(self, *args, **options):
+        ranked = refresh_popular_events_task(options['window_days'])
+        self.stdout.write(self.style.SUCCESS(f'Ranked {ranked} popular events'))
@@ -0,0 +1,41 @@
+"""
+Management command to re-resolve EventSection.svg_section_key from section
+names. Keys are resolved when a section is saved; run this after editing
+SECTION_NAME_MAPPINGS in events.stadium_config.
+
+Usage:
+    python manage.py refresh_section_svg_keys
+    python manage.py refresh_section_svg_keys --event-id 123456
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from events.models import Event, EventSection
+from events.stadium_config import normalize_section_name
+
+
+class Command(BaseCommand):
+    help = 'Re-resolve the stadium SVG key of every event section'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event-id', help='Only refresh this event (6-digit event_id)')
+
+    def handle(self, *args, **options):
+        sections = EventSection.objects.only('pk', 'event_id', 'name', 'svg_section_key')
+        if options['event_id']:
+            sections = sections.filter(event__event_id=options['event_id'])
+
+        changed = []
+        for section in sections.iterator(chunk_size=2000):
+            svg_section_key = normalize_section_name(section.name) or ''
+            if section.svg_section_key != svg_section_key:
+                section.svg_section_key = svg_section_key
+                changed.append(section)
+
+        with transaction.atomic():
+            EventSection.objects.bulk_update(changed, ['svg_section_key'], batch_size=1000)
+            # The listings API payload carries the keys
+            for event_pk in {section.event_id for section in changed}:
+                Event.bump_inventory_version(event_pk)
+
+        self.stdout.write(self.style.SUCCESS(f'Updated the SVG key of {len(changed)} sections'))
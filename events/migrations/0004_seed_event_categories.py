@@ -0,0 +1,37 @@
+from django.db import migrations
+from django.utils.text import slugify
+
+# Categories from the xs2events portal. These used to be upserted by HomeView
+# on every request; they only need to exist once.
+CATEGORIES = [
+    {'name': 'Football', 'icon': 'bi-shield', 'order': 1},
+    {'name': 'Formula 1', 'icon': 'bi-speedometer2', 'order': 2},
+    {'name': 'MotoGP', 'icon': 'bi-speedometer2', 'order': 3},
+    {'name': 'Tennis', 'icon': 'bi-circle-fill', 'order': 4},
+    {'name': 'Other events', 'icon': 'bi-calendar-event', 'order': 5},
+]
+
+
+def seed_categories(apps, schema_editor):
+    EventCategory = apps.get_model('events', 'EventCategory')
+    for cat_data in CATEGORIES:
+        EventCategory.objects.update_or_create(
+            slug=slugify(cat_data['name']),
+            defaults={
+                'name': cat_data['name'],
+                'icon': cat_data['icon'],
+                'order': cat_data['order'],
+                'is_active': True,
+            }
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_category_eventcategory_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_categories, migrations.RunPython.noop),
+    ]
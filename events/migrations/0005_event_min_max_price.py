@@ -0,0 +1,40 @@
+# Generated by Django 5.2.3 on 2026-10-17 22:20
+
+from django.db import migrations, models
+from django.db.models import Min, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_price_range(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    EventSection = apps.get_model('events', 'EventSection')
+    sections = EventSection.objects.filter(event=OuterRef('pk')).order_by().values('event')
+    Event.objects.update(
+        min_price=Coalesce(Subquery(
+            sections.filter(lower_price__gt=0).annotate(low=Min('lower_price')).values('low')
+        ), Value(0), output_field=models.DecimalField(max_digits=8, decimal_places=2)),
+        max_price=Coalesce(Subquery(
+            sections.filter(upper_price__gt=0).annotate(high=Max('upper_price')).values('high')
+        ), Value(0), output_field=models.DecimalField(max_digits=8, decimal_places=2)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0004_seed_event_categories'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='max_price',
+            field=models.DecimalField(db_index=True, decimal_places=2, default=0, max_digits=8),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='min_price',
+            field=models.DecimalField(db_index=True, decimal_places=2, default=0, max_digits=8),
+        ),
+        migrations.RunPython(backfill_price_range, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,95 @@
+"""
+Full-text search index for events, see events/search.py.
+
+PostgreSQL gets a generated, weighted ``search_vector`` column with a GIN index
+and trigram indexes for fuzzy matching. SQLite gets an FTS5 table that is kept
+in sync with events_event by triggers.
+"""
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    ALTER TABLE events_event ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(team, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(stadium_name, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(sports_type, '')), 'C') ||
+        setweight(to_tsvector('simple', coalesce(category_legacy, '')), 'C') ||
+        setweight(to_tsvector('simple', coalesce(country, '')), 'D')
+    ) STORED
+    """,
+    "CREATE INDEX events_event_search_vector_gin ON events_event USING GIN (search_vector)",
+    "CREATE INDEX events_event_name_trgm ON events_event USING GIN (name gin_trgm_ops)",
+    "CREATE INDEX events_event_stadium_name_trgm ON events_event USING GIN (stadium_name gin_trgm_ops)",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS events_event_stadium_name_trgm",
+    "DROP INDEX IF EXISTS events_event_name_trgm",
+    "DROP INDEX IF EXISTS events_event_search_vector_gin",
+    "ALTER TABLE events_event DROP COLUMN IF EXISTS search_vector",
+]
+
+FTS_COLUMNS = 'name, team, stadium_name, sports_type, category_legacy, country'
+
+SQLITE_FORWARD = [
+    f"""
+    CREATE VIRTUAL TABLE events_event_fts USING fts5(
+        event_id UNINDEXED, {FTS_COLUMNS}, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    INSERT INTO events_event_fts (event_id, {FTS_COLUMNS})
+    SELECT id, {FTS_COLUMNS} FROM events_event
+    """,
+    f"""
+    CREATE TRIGGER events_event_fts_insert AFTER INSERT ON events_event BEGIN
+        INSERT INTO events_event_fts (event_id, {FTS_COLUMNS})
+        VALUES (new.id, new.name, new.team, new.stadium_name, new.sports_type, new.category_legacy, new.country);
+    END
+    """,
+    f"""
+    CREATE TRIGGER events_event_fts_update AFTER UPDATE OF {FTS_COLUMNS} ON events_event BEGIN
+        DELETE FROM events_event_fts WHERE event_id = old.id;
+        INSERT INTO events_event_fts (event_id, {FTS_COLUMNS})
+        VALUES (new.id, new.name, new.team, new.stadium_name, new.sports_type, new.category_legacy, new.country);
+    END
+    """,
+    """
+    CREATE TRIGGER events_event_fts_delete AFTER DELETE ON events_event BEGIN
+        DELETE FROM events_event_fts WHERE event_id = old.id;
+    END
+    """,
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS events_event_fts_delete",
+    "DROP TRIGGER IF EXISTS events_event_fts_update",
+    "DROP TRIGGER IF EXISTS events_event_fts_insert",
+    "DROP TABLE IF EXISTS events_event_fts",
+]
+
+
+def _run(schema_editor, statements_by_vendor):
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    _run(schema_editor, {'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD})
+
+
+def drop_search_index(apps, schema_editor):
+    _run(schema_editor, {'postgresql': POSTGRES_BACKWARD, 'sqlite': SQLITE_BACKWARD})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_event_min_max_price'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-17 22:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_event_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='inventory_version',
+            field=models.PositiveBigIntegerField(default=1),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['modified'], name='events_even_modifie_58957c_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-17 22:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_event_inventory_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PopularEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveIntegerField(unique=True)),
+                ('recent_sales', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('recent_tickets', models.PositiveIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField()),
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='popularity', to='events.event')),
+            ],
+            options={
+                'ordering': ['rank'],
+            },
+        ),
+    ]
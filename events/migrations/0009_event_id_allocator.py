@@ -0,0 +1,35 @@
+# Generated by Django 5.2.3 on 2026-10-17 22:41
+
+from django.db import migrations, models
+
+SEQUENCE_NAME = 'events_event_id_seq'
+
+
+def create_counter(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'CREATE SEQUENCE IF NOT EXISTS {SEQUENCE_NAME} MINVALUE 0 START 0')
+    else:
+        apps.get_model('events', 'EventIdCounter').objects.get_or_create(pk=1)
+
+
+def drop_counter(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP SEQUENCE IF EXISTS {SEQUENCE_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_popular_event'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventIdCounter',
+            fields=[
+                ('id', models.PositiveSmallIntegerField(default=1, primary_key=True, serialize=False)),
+                ('value', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_counter, drop_counter),
+    ]
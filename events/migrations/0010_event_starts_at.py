@@ -0,0 +1,36 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:02
+
+from datetime import datetime
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_starts_at(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    tz = timezone.get_default_timezone()
+    batch = []
+    for event in Event.objects.only('pk', 'date', 'time').iterator(chunk_size=2000):
+        event.starts_at = timezone.make_aware(datetime.combine(event.date, event.time), tz)
+        batch.append(event)
+        if len(batch) == 2000:
+            Event.objects.bulk_update(batch, ['starts_at'])
+            batch = []
+    if batch:
+        Event.objects.bulk_update(batch, ['starts_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_event_id_allocator'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='starts_at',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_starts_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Separate from the backfill so PostgreSQL doesn't alter the table while
+    # the backfill's deferred trigger events are still pending
+
+    dependencies = [
+        ('events', '0010_event_starts_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='event',
+            name='starts_at',
+            field=models.DateTimeField(db_index=True, editable=False),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.3 on 2026-10-17 22:58
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_section_totals(apps, schema_editor):
+    EventSection = apps.get_model('events', 'EventSection')
+    Ticket = apps.get_model('tickets', 'Ticket')
+    available = Ticket.objects.filter(section_id=OuterRef('pk'), sold=False).order_by().values('section_id').annotate(
+        total=Sum('number_of_tickets')
+    ).values('total')
+    EventSection.objects.update(total_tickets=Coalesce(Subquery(available), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0011_event_starts_at_not_null'),
+        ('tickets', '0013_listing_change_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventsection',
+            name='total_tickets',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_section_totals, migrations.RunPython.noop),
+    ]
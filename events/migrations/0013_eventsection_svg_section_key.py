@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:40
+
+from django.db import migrations, models
+
+from events.stadium_config import normalize_section_name
+
+
+def backfill_svg_section_keys(apps, schema_editor):
+    EventSection = apps.get_model('events', 'EventSection')
+    sections = []
+    for section in EventSection.objects.only('pk', 'name').iterator(chunk_size=2000):
+        section.svg_section_key = normalize_section_name(section.name) or ''
+        sections.append(section)
+    EventSection.objects.bulk_update(sections, ['svg_section_key'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0012_eventsection_total_tickets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventsection',
+            name='svg_section_key',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.RunPython(backfill_svg_section_keys, migrations.RunPython.noop),
+    ]
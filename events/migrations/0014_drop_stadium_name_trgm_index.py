@@ -0,0 +1,32 @@
+"""
+Drop the trigram index on stadium_name from 0006_event_search_index.
+
+events/search.py only fuzzy-matches on name; stadium_name is searched through
+search_vector, so the index was never used and only slowed down writes.
+"""
+from django.db import migrations
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX CONCURRENTLY IF EXISTS events_event_stadium_name_trgm")
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS events_event_stadium_name_trgm "
+            "ON events_event USING GIN (stadium_name gin_trgm_ops)"
+        )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('events', '0013_eventsection_svg_section_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_index, create_index),
+    ]
@@ -1,9 +1,11 @@
 import uuid
-import random
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator, RegexValidator
-from django.db.models import Sum, Min, Max
+from django.db.models import Sum, Min, Max, Q
+
+from .event_ids import allocate_event_id
+from .stadium_config import normalize_section_name
 
 class BaseModel(models.Model):
     created = models.DateTimeField(auto_now_add=True)
@@ -31,6 +33,17 @@ class EventCategory(models.Model):
         return self.name
 
 
+class EventIdCounter(models.Model):
+    """Counter behind events.event_ids on databases without sequences"""
+    SINGLETON_ID = 1
+
+    id = models.PositiveSmallIntegerField(primary_key=True, default=SINGLETON_ID)
+    value = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"Event id counter at {self.value}"
+
+
 class Event(BaseModel):
     EVENT_CATEGORIES = [
         ('concert', 'Concert'),
@@ -87,6 +100,8 @@ class Event(BaseModel):
     
     date = models.DateField()
     time = models.TimeField()
+    # date + time as an aware datetime, kept in sync by save(); filter on this
+    starts_at = models.DateTimeField(db_index=True, editable=False)
     
     normal_service_charge = models.DecimalField(
         max_digits=10, decimal_places=2,
@@ -102,11 +117,31 @@ class Event(BaseModel):
     total_tickets = models.PositiveIntegerField(default=0)
     sold_tickets = models.PositiveIntegerField(default=0)
     total_sold_price = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    # Denormalized from the sections' non-zero prices, see update_price_range()
+    min_price = models.DecimalField(max_digits=8, decimal_places=2, default=0, db_index=True)
+    max_price = models.DecimalField(max_digits=8, decimal_places=2, default=0, db_index=True)
+
+    # Bumped with F() on every ticket and section change, see bump_inventory_version
+    inventory_version = models.PositiveBigIntegerField(default=1)
+
+    # Written only with F() (tickets.aggregates), never by a full save
+    COUNTER_FIELDS = ('inventory_version', 'total_tickets', 'sold_tickets')
+
+    # Inserts tried before giving up on landing on a legacy event_id
+    MAX_EVENT_ID_ATTEMPTS = 5
+
+    DEFAULT_SECTIONS = [
+        {'name': 'General Admission', 'color': '#3CB44B', 'lower_price': 0, 'upper_price': 0},
+        {'name': 'VIP', 'color': '#911EB4', 'lower_price': 0, 'upper_price': 0},
+        {'name': 'Premium', 'color': '#F58231', 'lower_price': 0, 'upper_price': 0},
+    ]
     
     class Meta:
         indexes = [
             models.Index(fields=['event_id']),
             models.Index(fields=['date', 'time']),
+            models.Index(fields=['modified']),
         ]
         ordering = ['-date', '-time']
 
@@ -115,18 +150,34 @@ class Event(BaseModel):
 
     def save(self, *args, **kwargs):
         is_new = not self.pk
-        if not self.event_id:
+        if self.date and self.time:
+            # to_python: callers such as get_or_create defaults may pass strings
+            self.starts_at = self.start_datetime(
+                self._meta.get_field('date').to_python(self.date),
+                self._meta.get_field('time').to_python(self.time),
+            )
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and {'date', 'time'} & set(update_fields):
+                kwargs['update_fields'] = {*update_fields, 'starts_at'}
+        allocated_event_id = not self.event_id
+        if allocated_event_id:
             self.event_id = self.generate_unique_event_id()
-        super().save(*args, **kwargs)
+        if not self._state.adding and not args and kwargs.get('update_fields') is None:
+            # A full save of an instance loaded before a ticket change must not
+            # roll the counters back; they are only ever written with F().
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS and field.attname not in deferred
+            ]
+        if allocated_event_id:
+            self._save_with_allocated_event_id(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
         
         # Create default sections for new events if they don't have any
         if is_new and not self.sections.exists():
-            default_sections = [
-                {'name': 'General Admission', 'color': '#3CB44B', 'lower_price': 0, 'upper_price': 0},
-                {'name': 'VIP', 'color': '#911EB4', 'lower_price': 0, 'upper_price': 0},
-                {'name': 'Premium', 'color': '#F58231', 'lower_price': 0, 'upper_price': 0},
-            ]
-            for section_data in default_sections:
+            for section_data in self.DEFAULT_SECTIONS:
                 EventSection.objects.create(
                     event=self,
                     name=section_data['name'],
@@ -135,19 +186,54 @@ class Event(BaseModel):
                     upper_price=section_data['upper_price']
                 )
 
+    @classmethod
+    def bump_inventory_version(cls, pk):
+        """Record that the event's tickets or sections changed (drives the API ETags)"""
+        cls.objects.filter(pk=pk).update(
+            inventory_version=models.F('inventory_version') + 1, modified=timezone.now()
+        )
+
     def generate_unique_event_id(self):
-        while True:
-            event_id = str(random.randint(100000, 999999))
-            if not Event.objects.filter(event_id=event_id).exists():
-                return event_id
+        return allocate_event_id()
+
+    def _save_with_allocated_event_id(self, *args, **kwargs):
+        # Allocated ids never repeat, but events created before the allocator
+        # kept their random ids and one of them can sit on a counter position.
+        # The unique constraint catches that, so the happy path has no lookups.
+        for _ in range(self.MAX_EVENT_ID_ATTEMPTS - 1):
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                if not Event.objects.filter(event_id=self.event_id).exists():
+                    raise
+                self.event_id = self.generate_unique_event_id()
+        return super().save(*args, **kwargs)
+
+    def update_price_range(self):
+        """Recompute min_price/max_price from the event's sections, ignoring unpriced (0) sections"""
+        prices = self.sections.aggregate(
+            low=Min('lower_price', filter=Q(lower_price__gt=0)),
+            high=Max('upper_price', filter=Q(upper_price__gt=0)),
+        )
+        min_price = prices['low'] or 0
+        max_price = prices['high'] or 0
+        if min_price != self.min_price or max_price != self.max_price:
+            self.min_price = min_price
+            self.max_price = max_price
+            # save() rather than update() so post_save listeners see the new range
+            self.save(update_fields=['min_price', 'max_price', 'modified'])
+
+    @staticmethod
+    def start_datetime(event_date, event_time):
+        """The aware datetime stored in starts_at for a date and time"""
+        return timezone.make_aware(
+            timezone.datetime.combine(event_date, event_time), timezone.get_default_timezone()
+        )
 
     @property
     def time_left(self):
-        now = timezone.now()
-        event_datetime = timezone.make_aware(
-            timezone.datetime.combine(self.date, self.time)
-        )
-        delta = event_datetime - now
+        delta = self.starts_at - timezone.now()
         
         months = delta.days // 30
         days = delta.days % 30
@@ -158,10 +244,7 @@ class Event(BaseModel):
     @property
     def event_timestamp(self):
         """Returns Unix timestamp of event datetime for JavaScript countdown timers"""
-        event_datetime = timezone.make_aware(
-            timezone.datetime.combine(self.date, self.time)
-        )
-        return int(event_datetime.timestamp())
+        return int(self.starts_at.timestamp())
 
     @property
     def left_tickets(self):
@@ -169,19 +252,16 @@ class Event(BaseModel):
 
     @property
     def lowest_price(self):
-        return self.sections.exclude(lower_price=0).exclude(lower_price__isnull=True).aggregate(Min('lower_price'))['lower_price__min'] or 0
+        return self.min_price
     
     @property
     def highest_price(self):
-        return self.sections.exclude(upper_price=0).exclude(upper_price__isnull=True).aggregate(Max('upper_price'))['upper_price__max'] or 0
+        return self.max_price
 
 
     @property
     def is_expired(self):
-        event_datetime = timezone.make_aware(
-            timezone.datetime.combine(self.date, self.time)
-        )
-        return event_datetime < timezone.now()
+        return self.starts_at < timezone.now()
 
     @property
     def has_interactive_map(self):
@@ -286,6 +366,10 @@ class EventSection(BaseModel):
     ])
     lower_price = models.DecimalField(max_digits=8, decimal_places=2, default=0)
     upper_price = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    # Unsold tickets in the section, kept by tickets.aggregates
+    total_tickets = models.PositiveIntegerField(default=0)
+    # data-section of the stadium SVG, resolved from the name on save
+    svg_section_key = models.CharField(max_length=100, blank=True, editable=False)
 
     class Meta:
         unique_together = ('event', 'name')
@@ -294,10 +378,45 @@ class EventSection(BaseModel):
     def __str__(self):
         return f"{self.name} ({self.event.name})"
 
+    def save(self, *args, **kwargs):
+        self.svg_section_key = normalize_section_name(self.name) or ''
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'svg_section_key'}
+        super().save(*args, **kwargs)
+
     def update_prices(self, lower, upper):
         self.lower_price = lower
         self.upper_price = upper
         self.save(update_fields=['lower_price', 'upper_price', 'modified'])
+        self.event.update_price_range()
+
+    def delete(self, *args, **kwargs):
+        event = self.event
+        had_prices = self.lower_price or self.upper_price
+        result = super().delete(*args, **kwargs)
+        if had_prices:
+            event.update_price_range()
+        return result
+
+
+class PopularEvent(models.Model):
+    """
+    Materialized ranking of upcoming events by recent sales, rebuilt on a
+    schedule by events.tasks.refresh_popular_events_task.
+    """
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, related_name='popularity')
+    rank = models.PositiveIntegerField(unique=True)
+    recent_sales = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    recent_tickets = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['rank']
+
+    def __str__(self):
+        return f"#{self.rank} {self.event.name}"
+
 
 class ContactMessage(models.Model):
     name = models.CharField(max_length=100)
@@ -0,0 +1,130 @@
+"""
+Keyset (cursor) pagination for the JSON APIs.
+
+Offset pagination makes the database walk and throw away every row before the
+requested page, and Paginator adds a COUNT(*) on top. A cursor instead stores
+the sort values of the last row served and the next page starts right after
+them, so every page costs the same however deep it is:
+
+    ordering = ('date', 'time', 'pk')
+    page = paginate_by_cursor(Event.objects.all(), ordering, request.GET)
+    page.items, page.next_cursor
+
+Cursors are opaque to clients: base64 encoded JSON holding the ordering they
+were issued for, so a cursor can't be replayed against a different sort.
+"""
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorPage:
+    def __init__(self, items, next_cursor, per_page, total=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.per_page = per_page
+        self.total = total
+
+    def metadata(self):
+        """Pagination fields to merge into a JSON response"""
+        data = {'next_cursor': self.next_cursor, 'per_page': self.per_page}
+        if self.total is not None:
+            data['total_events'] = self.total
+        return data
+
+
+def encode_cursor(ordering, values):
+    payload = json.dumps({'o': ','.join(ordering), 'v': values})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(ordering, cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor('Malformed cursor')
+    if not isinstance(payload, dict) or payload.get('o') != ','.join(ordering):
+        raise InvalidCursor('Cursor does not match the requested sort')
+    values = payload.get('v')
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise InvalidCursor('Malformed cursor')
+    return values
+
+
+def keyset_filter(ordering, values):
+    """
+    Q object selecting the rows that sort strictly after ``values``.
+
+    For ordering (a, -b, pk) this is
+    a > va OR (a = va AND b < vb) OR (a = va AND b = vb AND pk > vpk)
+    """
+    condition = Q()
+    equal = {}
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= Q(**equal, **{f'{name}__{lookup}': value})
+        equal[name] = value
+    return condition
+
+
+def page_size(params, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Read ``per_page`` from ``params``, clamped to [1, maximum]"""
+    try:
+        per_page = int(params.get('per_page', default))
+    except (TypeError, ValueError):
+        per_page = default
+    return max(1, min(per_page, maximum))
+
+
+def paginate_by_cursor(queryset, ordering, params, default_per_page=DEFAULT_PAGE_SIZE, max_per_page=MAX_PAGE_SIZE):
+    """
+    Return one CursorPage of ``queryset`` sorted by ``ordering``.
+
+    ``ordering`` must only use non-null fields and end with a unique one
+    (normally ``pk``) so that rows never tie. Reads ``cursor`` (empty for the
+    first page), ``per_page`` and ``count`` from ``params``; the COUNT(*) only
+    runs when ``count`` is set.
+    """
+    per_page = page_size(params, default_per_page, max_per_page)
+
+    total = None
+    if params.get('count') in ('1', 'true'):
+        total = queryset.order_by().count()
+
+    queryset = queryset.order_by(*ordering)
+    cursor = params.get('cursor')
+    if cursor:
+        values = decode_cursor(ordering, cursor)
+        try:
+            queryset = queryset.filter(keyset_filter(ordering, values))
+        except (ValidationError, TypeError, ValueError):
+            raise InvalidCursor('Malformed cursor')
+
+    # One extra row tells us whether there is a next page without counting
+    rows = list(queryset[:per_page + 1])
+    items = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page:
+        last = items[-1]
+        next_cursor = encode_cursor(ordering, [_sort_value(last, field) for field in ordering])
+    return CursorPage(items, next_cursor, per_page, total)
+
+
+def _sort_value(obj, field):
+    name = field.lstrip('-')
+    value = obj.pk if name == 'pk' else getattr(obj, name)
+    # Plain JSON values round-trip exactly; everything else (dates, times,
+    # decimals, UUIDs) is sent as a string and parsed back by the field.
+    return value if isinstance(value, (int, float, str)) or value is None else str(value)
@@ -0,0 +1,149 @@
+"""
+Full-text search over events.
+
+PostgreSQL uses the generated ``search_vector`` column (GIN indexed) for prefix
+matching and the trigram index on ``name`` to catch typos. SQLite uses the
+``events_event_fts`` FTS5 table, so development and tests follow the same code
+path. Both are created in migration 0006_event_search_index.
+
+SQLite drops a table's triggers when a migration rebuilds it, so
+ensure_sqlite_search_triggers() puts the FTS triggers back after every
+migrate and reindexes the events changed while they were missing.
+
+    qs = search_events(Event.objects.all(), 'old traff')
+    qs.order_by('-search_rank')
+"""
+import re
+
+from django.db import connection, connections
+from django.db.models import BooleanField, Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+MAX_SEARCH_TERMS = 8
+
+FALLBACK_FIELDS = ['name', 'team', 'stadium_name', 'sports_type', 'category_legacy', 'country']
+
+FTS_COLUMNS = 'name, team, stadium_name, sports_type, category_legacy, country'
+FTS_VALUES = 'new.id, new.name, new.team, new.stadium_name, new.sports_type, new.category_legacy, new.country'
+
+SQLITE_FTS_TRIGGERS = {
+    'events_event_fts_insert': f"""
+        CREATE TRIGGER IF NOT EXISTS events_event_fts_insert AFTER INSERT ON events_event BEGIN
+            INSERT INTO events_event_fts (event_id, {FTS_COLUMNS}) VALUES ({FTS_VALUES});
+        END
+    """,
+    'events_event_fts_update': f"""
+        CREATE TRIGGER IF NOT EXISTS events_event_fts_update AFTER UPDATE OF {FTS_COLUMNS} ON events_event BEGIN
+            DELETE FROM events_event_fts WHERE event_id = old.id;
+            INSERT INTO events_event_fts (event_id, {FTS_COLUMNS}) VALUES ({FTS_VALUES});
+        END
+    """,
+    'events_event_fts_delete': """
+        CREATE TRIGGER IF NOT EXISTS events_event_fts_delete AFTER DELETE ON events_event BEGIN
+            DELETE FROM events_event_fts WHERE event_id = old.id;
+        END
+    """,
+}
+
+
+def search_terms(query):
+    """Split a raw query into lowercase word tokens safe to put in a search query"""
+    return re.findall(r'\w+', (query or '').lower())[:MAX_SEARCH_TERMS]
+
+
+def search_events(queryset, query):
+    """
+    Filter an Event queryset down to the events matching ``query``.
+
+    The result is annotated with ``search_rank`` (higher is more relevant).
+    Every term has to match as a word prefix, so the same function serves
+    as-you-type autocomplete.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    vendor = connection.vendor
+    if vendor == 'postgresql':
+        return _search_postgres(queryset, terms, ' '.join(terms))
+    if vendor == 'sqlite':
+        return _search_sqlite(queryset, terms)
+    return _search_fallback(queryset, ' '.join(terms))
+
+
+def _search_postgres(queryset, terms, text):
+    tsquery = ' & '.join(f'{term}:*' for term in terms)
+    return queryset.annotate(
+        search_match=RawSQL(
+            "events_event.search_vector @@ to_tsquery('simple', %s) OR %s <%% events_event.name",
+            (tsquery, text),
+            output_field=BooleanField(),
+        ),
+        # ts_rank and word_similarity are float4; as float8 the rank survives
+        # the round trip through a page cursor and compares exactly
+        search_rank=RawSQL(
+            "(ts_rank(events_event.search_vector, to_tsquery('simple', %s))"
+            " + word_similarity(%s, events_event.name))::double precision",
+            (tsquery, text),
+            output_field=FloatField(),
+        ),
+    ).filter(search_match=True)
+
+
+def _search_sqlite(queryset, terms):
+    match = ' '.join(f'"{term}"*' for term in terms)
+    # bm25() only works in the statement that runs the MATCH, and a correlated
+    # MATCH per row is quadratic, so rank on where the terms hit instead.
+    return queryset.annotate(
+        search_match=RawSQL(
+            "events_event.id IN (SELECT event_id FROM events_event_fts WHERE events_event_fts MATCH %s)",
+            (match,),
+            output_field=BooleanField(),
+        ),
+    ).filter(search_match=True).annotate(search_rank=_field_rank(terms))
+
+
+def _field_rank(terms):
+    rank = Case(
+        When(name__istartswith=' '.join(terms), then=Value(4.0)),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+    for term in terms:
+        rank += Case(
+            When(name__icontains=term, then=Value(2.0)),
+            When(Q(team__icontains=term) | Q(stadium_name__icontains=term), then=Value(1.0)),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+    return rank
+
+
+def _search_fallback(queryset, text):
+    condition = Q()
+    for field in FALLBACK_FIELDS:
+        condition |= Q(**{f'{field}__icontains': text})
+    return queryset.filter(condition).annotate(search_rank=_field_rank(search_terms(text)))
+
+
+def ensure_sqlite_search_triggers(using='default', **kwargs):
+    """
+    post_migrate receiver: recreate the FTS triggers a table rebuild dropped
+    and rebuild events_event_fts, which missed every change made meanwhile.
+    """
+    conn = connections[using]
+    if conn.vendor != 'sqlite':
+        return
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE %s", ['events_event_fts%']
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if 'events_event_fts' not in existing or existing.issuperset(SQLITE_FTS_TRIGGERS):
+            return
+        for statement in SQLITE_FTS_TRIGGERS.values():
+            cursor.execute(statement)
+        cursor.execute('DELETE FROM events_event_fts')
+        cursor.execute(
+            f'INSERT INTO events_event_fts (event_id, {FTS_COLUMNS}) SELECT id, {FTS_COLUMNS} FROM events_event'
+        )
@@ -0,0 +1,69 @@
+"""
+Cache invalidation hooks for event and inventory changes.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from tickets.models import Order, Sale, Ticket
+from tickets.seller_listings import invalidate_seller_summary
+from .autocomplete import AUTOCOMPLETE_NAMESPACE, AUTOCOMPLETE_REBUILD_NAMESPACE
+from .cache_utils import bump_version
+from .categories import CATEGORIES_NAMESPACE
+from .etags import CATALOGUE_NAMESPACE
+from .home_data import HOME_NAMESPACE
+from .models import Event, EventSection, EventCategory, Category
+
+
+@receiver([post_save, post_delete], sender=Event)
+@receiver([post_save, post_delete], sender=EventSection)
+@receiver([post_save, post_delete], sender=Ticket)
+def invalidate_home_page(sender, **kwargs):
+    # After commit, so that no request rebuilds the page or the catalogue
+    # ETag from the old rows and caches them under the new version
+    def bump():
+        bump_version(HOME_NAMESPACE)
+        bump_version(CATALOGUE_NAMESPACE)
+    transaction.on_commit(bump)
+
+
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=EventCategory)
+def reload_category_registry(sender, **kwargs):
+    # After commit, so that no worker reloads the old rows under the new
+    # version. The home page embeds the categories, so it goes stale too.
+    def bump():
+        bump_version(CATEGORIES_NAMESPACE)
+        bump_version(HOME_NAMESPACE)
+    transaction.on_commit(bump)
+
+
+@receiver(post_save, sender=Event)
+def refresh_autocomplete_index(sender, **kwargs):
+    bump_version(AUTOCOMPLETE_NAMESPACE)
+
+
+@receiver(post_delete, sender=Event)
+def rebuild_autocomplete_index(sender, **kwargs):
+    bump_version(AUTOCOMPLETE_REBUILD_NAMESPACE)
+
+
+@receiver([post_save, post_delete], sender=EventSection)
+@receiver([post_save, post_delete], sender=Ticket)
+def bump_event_inventory_version(sender, instance, **kwargs):
+    Event.bump_inventory_version(instance.event_id)
+
+
+@receiver([post_save, post_delete], sender=Ticket)
+@receiver([post_save, post_delete], sender=Sale)
+def invalidate_seller_summary_of_owner(sender, instance, **kwargs):
+    invalidate_seller_summary(instance.seller_id)
+
+
+@receiver(post_save, sender=Order)
+def invalidate_seller_summary_on_payout(sender, instance, **kwargs):
+    # Orders only count towards a summary through their sale, and only
+    # leave the pending payouts when marked as paid
+    if instance.paid_to_reseller:
+        for seller_id in Sale.objects.filter(order=instance).values_list('seller_id', flat=True):
+            invalidate_seller_summary(seller_id)
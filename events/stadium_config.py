@@ -1,6 +1,8 @@
 """
 Stadium configuration for mapping section names to SVG data-section attributes
 """
+from collections import deque
+from functools import lru_cache
 
 # Mapping of SVG data-section values to common section name variations
 SECTION_NAME_MAPPINGS = {
@@ -310,11 +312,99 @@ for svg_key, variations in SECTION_NAME_MAPPINGS.items():
     for variation in variations:
         SVG_TO_SECTION_NAMES[variation.lower()] = svg_key
 
+# Distinct section names normalize_section_name remembers
+NORMALIZE_CACHE_SIZE = 4096
 
+
+class SectionMatcher:
+    """
+    Finds the SVG key of the longest variation contained in a section name.
+
+    The lowercased variations are compiled once into an Aho-Corasick
+    automaton, so a name is matched in one pass over its characters however
+    many variations there are. Among variations of the same length the one
+    listed first in SECTION_NAME_MAPPINGS wins.
+    """
+
+    def __init__(self, mappings):
+        # Node 0 is the root; each node has its transitions, its failure
+        # link and the best (length, -priority, svg_key) match ending there
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [None]
+        # Every substring of a variation, for names that are part of one
+        self._fragments = {}
+
+        priority = 0
+        for svg_key, variations in mappings.items():
+            for variation in variations:
+                pattern = variation.lower()
+                self._insert(pattern, (len(pattern), -priority, svg_key))
+                for start in range(len(pattern)):
+                    for stop in range(start + 1, len(pattern) + 1):
+                        self._fragments.setdefault(pattern[start:stop], svg_key)
+                priority += 1
+        self._link()
+
+    def _insert(self, pattern, match):
+        node = 0
+        for char in pattern:
+            following = self._goto[node].get(char)
+            if following is None:
+                following = len(self._goto)
+                self._goto[node][char] = following
+                self._goto.append({})
+                self._fail.append(0)
+                self._best.append(None)
+            node = following
+        if self._best[node] is None or match > self._best[node]:
+            self._best[node] = match
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            # Breadth first, so the failure node's best match is final; the
+            # node's own pattern is longer than anything reached through it
+            fallback = self._best[self._fail[node]]
+            if self._best[node] is None:
+                self._best[node] = fallback
+            for char, following in self._goto[node].items():
+                queue.append(following)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[following] = self._goto[fail].get(char, 0)
+
+    def contained(self, text):
+        """SVG key of the longest variation inside ``text``, or None"""
+        goto, fail, best = self._goto, self._fail, self._best
+        node, found = 0, None
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            match = best[node]
+            if match is not None and (found is None or match > found):
+                found = match
+        return found[2] if found else None
+
+    def containing(self, text):
+        """SVG key of the first variation that ``text`` is part of, or None"""
+        return self._fragments.get(text)
+
+
+section_matcher = SectionMatcher(SECTION_NAME_MAPPINGS)
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize_section_name(section_name):
     """
     Convert a section name to its SVG-compatible data-section attribute value
-    
+
+    EventSection stores the result in svg_section_key when it is saved, so
+    request handlers read it from there instead of calling this.
+
     Args:
         section_name (str): The section name from the database (e.g., "Longside Lower Tier")
     
@@ -331,11 +421,11 @@ def normalize_section_name(section_name):
     if name_clean in SVG_TO_SECTION_NAMES:
         return SVG_TO_SECTION_NAMES[name_clean]
     
-    # Try partial matching
-    for svg_key, variations in SECTION_NAME_MAPPINGS.items():
-        for variation in variations:
-            if variation.lower() in name_clean or name_clean in variation.lower():
-                return svg_key
+    # Try partial matching: a variation within the name, else the name
+    # within a variation
+    svg_key = section_matcher.contained(name_clean) or section_matcher.containing(name_clean)
+    if svg_key:
+        return svg_key
     
     # Fallback: convert to kebab-case
     # Replace spaces with hyphens and remove special characters
@@ -0,0 +1,70 @@
+import logging
+from django.conf import settings
+from django.db import transaction
+from django.db.models import OuterRef, Subquery, Sum, UUIDField
+from django.utils import timezone
+from datetime import timedelta
+from tickets.models import Order, Ticket
+from events.cache_utils import bump_version
+from events.home_data import HOME_NAMESPACE
+from events.models import Event, PopularEvent
+
+logger = logging.getLogger(__name__)
+
+# Number of upcoming events kept in the materialized ranking
+POPULAR_EVENTS_RANKING_SIZE = 100
+
+
+def refresh_popular_events_task(window_days=None):
+    """
+    Rebuild the PopularEvent ranking: upcoming events ordered by the value of
+    completed orders placed in the last ``window_days``. Events without recent
+    sales fill the remaining slots by all-time sales, so the home page block is
+    never empty on a quiet week.
+    """
+    if window_days is None:
+        window_days = settings.POPULAR_EVENTS_WINDOW_DAYS
+    now = timezone.now()
+
+    try:
+        # Orders only keep the ticket's UUID, so map them back to events through it
+        ticket_event = Ticket.objects.filter(ticket_id=OuterRef('ticket_reference')).values('event_id')[:1]
+        recent = (
+            Order.objects
+            .filter(status='completed', created_at__gte=now - timedelta(days=window_days))
+            .annotate(event_pk=Subquery(ticket_event, output_field=UUIDField()))
+            .filter(event_pk__isnull=False)
+            .values('event_pk')
+            .annotate(sales=Sum('amount'), tickets=Sum('number_of_tickets'))
+        )
+        totals = {row['event_pk']: (row['sales'], row['tickets']) for row in recent}
+
+        upcoming = set(
+            Event.objects.filter(pk__in=totals, starts_at__gte=now).values_list('pk', flat=True)
+        )
+        ranked = sorted(upcoming, key=lambda pk: totals[pk], reverse=True)[:POPULAR_EVENTS_RANKING_SIZE]
+
+        if len(ranked) < POPULAR_EVENTS_RANKING_SIZE:
+            ranked += list(
+                Event.objects.filter(starts_at__gte=now).exclude(pk__in=ranked)
+                .order_by('-total_sold_price', 'starts_at')
+                .values_list('pk', flat=True)[:POPULAR_EVENTS_RANKING_SIZE - len(ranked)]
+            )
+
+        rows = [
+            PopularEvent(
+                event_id=pk, rank=rank, refreshed_at=now,
+                recent_sales=totals.get(pk, (0, 0))[0], recent_tickets=totals.get(pk, (0, 0))[1],
+            )
+            for rank, pk in enumerate(ranked, start=1)
+        ]
+        with transaction.atomic():
+            PopularEvent.objects.all().delete()
+            PopularEvent.objects.bulk_create(rows)
+        bump_version(HOME_NAMESPACE)
+
+        logger.info(f'Popular events refresh completed - {len(rows)} events ranked')
+        return len(rows)
+    except Exception as e:
+        logger.error(f'Error in refresh_popular_events_task: {str(e)}')
+        return 0
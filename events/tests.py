@@ -1,3 +1,519 @@
-from django.test import TestCase
+import json
+import threading
+import uuid
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from unittest import mock, skipUnless
+
+from archive.models import ArchivedEvent
+from tickets.models import Order
+from go2events.testing import make_event, make_order, make_section, make_ticket, make_user
+from .autocomplete import AutocompleteIndex
+from .event_ids import ID_SPACE, SEQUENCE_NAME, EventIdsExhausted, allocate_event_ids, permute, FIRST_EVENT_ID
+from .management.commands.benchmark_section_matcher import (
+    Command as BenchmarkCommand, compiled_normalize, legacy_normalize,
+)
+from .models import Event, EventIdCounter, EventSection, PopularEvent
+from .search import search_events
+from .stadium_config import SECTION_NAME_MAPPINGS
+from .tasks import refresh_popular_events_task
+
+
+def set_event_id_counter(position):
+    """Make the next allocation use counter ``position``"""
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT setval(%s, %s, false)', [SEQUENCE_NAME, position])
+    else:
+        EventIdCounter.objects.update_or_create(pk=EventIdCounter.SINGLETON_ID, defaults={'value': position})
+
+
+@override_settings(EVENT_ID_KEY='test-key')
+class EventIdPermutationTests(SimpleTestCase):
+    def test_positions_map_to_distinct_ids_in_range(self):
+        for start in (0, ID_SPACE // 2, ID_SPACE - 20000):
+            ids = [permute(position) for position in range(start, start + 20000)]
+            self.assertEqual(len(set(ids)), len(ids))
+            self.assertTrue(all(0 <= value < ID_SPACE for value in ids))
+
+    def test_ids_depend_on_the_key(self):
+        self.assertNotEqual(
+            [permute(position) for position in range(10)],
+            [permute(position, secret='other-key') for position in range(10)],
+        )
+
+    def test_counter_past_the_id_space_is_rejected(self):
+        with self.assertRaises(EventIdsExhausted):
+            permute(ID_SPACE)
+
+
+@override_settings(EVENT_ID_KEY='test-key')
+class EventIdAllocationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.superadmin = make_user('admin@example.com', '+447700900001')
+
+    def tearDown(self):
+        # Sequences ignore the test transaction rollback
+        set_event_id_counter(0)
+
+    def test_create_does_not_look_up_event_ids(self):
+        with CaptureQueriesContext(connection) as queries:
+            event = make_event(self.superadmin)
+        self.assertEqual(len(event.event_id), 6)
+        lookups = [q['sql'] for q in queries if q['sql'].startswith('SELECT') and '"events_event"' in q['sql']]
+        self.assertEqual(lookups, [])
+
+    def test_legacy_id_on_a_counter_position_is_skipped(self):
+        set_event_id_counter(1000)
+        legacy = make_event(self.superadmin, event_id=str(FIRST_EVENT_ID + permute(1000)))
+        event = make_event(self.superadmin)
+        self.assertEqual(event.event_id, str(FIRST_EVENT_ID + permute(1001)))
+        self.assertNotEqual(event.event_id, legacy.event_id)
+
+    def test_ids_held_by_archived_events_are_skipped(self):
+        set_event_id_counter(2000)
+        ArchivedEvent.objects.create(
+            id=uuid.uuid4(), event_id=str(FIRST_EVENT_ID + permute(2000)), name='Old match',
+            stadium_name='Emirates Stadium', starts_at=timezone.now(), data={},
+        )
+        event = make_event(self.superadmin)
+        self.assertEqual(event.event_id, str(FIRST_EVENT_ID + permute(2001)))
+
+        set_event_id_counter(2000)
+        self.assertEqual(allocate_event_ids(2), [str(FIRST_EVENT_ID + permute(p)) for p in (2001, 2002)])
+
+    def test_exhausted_id_space_raises(self):
+        set_event_id_counter(ID_SPACE)
+        with self.assertRaises(EventIdsExhausted):
+            make_event(self.superadmin)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Concurrent inserts need PostgreSQL')
+@override_settings(EVENT_ID_KEY='test-key')
+class EventIdConcurrencyStressTests(TransactionTestCase):
+    THREADS = 8
+    EVENTS_PER_THREAD = 40
+
+    def tearDown(self):
+        set_event_id_counter(0)
+
+    def test_concurrent_creation_near_the_end_of_the_id_space(self):
+        superadmin = make_user('admin@example.com', '+447700900001')
+        created = self.THREADS * self.EVENTS_PER_THREAD
+        # Leave room for exactly the events below plus some legacy collisions,
+        # as if 99.9% of the id space were already taken.
+        start = ID_SPACE - created - 60
+        set_event_id_counter(start)
+        legacy_ids = [str(FIRST_EVENT_ID + permute(position)) for position in range(start, start + 120, 2)]
+        for event_id in legacy_ids:
+            make_event(superadmin, event_id=event_id)
+
+        barrier = threading.Barrier(self.THREADS)
+        errors = []
+
+        def create_events():
+            try:
+                barrier.wait()
+                for _ in range(self.EVENTS_PER_THREAD):
+                    make_event(superadmin)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=create_events) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        event_ids = list(Event.objects.values_list('event_id', flat=True))
+        self.assertEqual(len(event_ids), created + len(legacy_ids))
+        self.assertEqual(len(set(event_ids)), len(event_ids))
+        self.assertTrue(all(FIRST_EVENT_ID <= int(event_id) < FIRST_EVENT_ID + ID_SPACE for event_id in event_ids))
+
+        # Every counter position is now used up
+        with self.assertRaises(EventIdsExhausted):
+            make_event(superadmin)
+
+
+class EventSearchIndexTests(TestCase):
+    """Events written after migrating must be searchable, whichever backend runs the tests"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.superadmin = make_user('admin@example.com', '+447700900001')
+
+    def search(self, query):
+        return list(search_events(Event.objects.all(), query).values_list('name', flat=True))
+
+    def test_new_events_are_found(self):
+        make_event(self.superadmin, name='Tottenham vs Fulham')
+        self.assertEqual(self.search('totten'), ['Tottenham vs Fulham'])
+
+    def test_renamed_events_are_found_by_their_new_name(self):
+        event = make_event(self.superadmin, name='Tottenham vs Fulham')
+        event.name = 'Brentford vs Fulham'
+        event.save()
+        self.assertEqual(self.search('brentf'), ['Brentford vs Fulham'])
+        self.assertEqual(self.search('totten'), [])
+
+    def test_deleted_events_are_not_found(self):
+        make_event(self.superadmin, name='Tottenham vs Fulham').delete()
+        self.assertEqual(self.search('totten'), [])
+
+
+class HomePageCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.superadmin = make_user('admin@example.com', '+447700900001')
+        make_event(cls.superadmin, name='Tottenham vs Fulham')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_a_cached_home_page_needs_no_query(self):
+        response = self.client.get('/')
+        self.assertContains(response, 'Tottenham vs Fulham')
+        with self.assertNumQueries(0):
+            self.assertContains(self.client.get('/'), 'Tottenham vs Fulham')
+
+    def test_changes_show_once_committed(self):
+        self.client.get('/')
+        with self.captureOnCommitCallbacks(execute=True):
+            make_event(self.superadmin, name='Leeds vs Everton')
+        self.assertContains(self.client.get('/'), 'Leeds vs Everton')
+
+
+class EventCatalogueETagTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.superadmin = make_user('admin@example.com', '+447700900001')
+        cls.section = make_section(make_event(cls.superadmin))
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, **headers):
+        return self.client.get('/api/events/all/', headers=headers)
+
+    def test_a_committed_ticket_save_changes_the_etag(self):
+        etag = self.get()['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            make_ticket(self.section, self.superadmin)
+            # Until the commit, other requests still read the old rows
+            self.assertEqual(self.get()['ETag'], etag)
+        self.assertNotEqual(self.get()['ETag'], etag)
+
+    def test_a_matching_etag_is_answered_without_building_the_payload(self):
+        etag = self.get()['ETag']
+        # The probe of the last kick-off is the only query
+        with self.assertNumQueries(1):
+            response = self.get(if_none_match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+
+class AutocompleteIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.superadmin = make_user('admin@example.com', '+447700900001')
+        cls.arsenal = make_event(cls.superadmin, name='Arsenal vs Chelsea')
+        cls.villa = make_event(
+            cls.superadmin, name='Aston Villa vs Leeds', stadium_name='Villa Park', date=date(2030, 2, 1)
+        )
+        make_event(cls.superadmin, name='Arsenal vs Fulham', date=date(2020, 1, 1))
+
+    def setUp(self):
+        cache.clear()
+        self.index = AutocompleteIndex()
+
+    def names(self, query):
+        # Ask the cache for the versions on every lookup
+        self.index._checked_at = 0
+        return [row['name'] for row in self.index.lookup(query)]
+
+    def test_prefix_lookup(self):
+        self.assertEqual(self.names('ars'), ['Arsenal vs Chelsea'])
+        self.assertEqual(self.names('a'), ['Arsenal vs Chelsea', 'Aston Villa vs Leeds'])
+        self.assertEqual(self.names('villa park'), ['Aston Villa vs Leeds'])
+        self.assertEqual(self.names('ars lee'), [])
+
+    def test_a_saved_event_is_refreshed_without_a_rebuild(self):
+        self.names('ars')
+        self.arsenal.name = 'Tottenham vs Chelsea'
+        self.arsenal.save()
+        with mock.patch.object(self.index, 'rebuild', wraps=self.index.rebuild) as rebuild:
+            self.assertEqual(self.names('tott'), ['Tottenham vs Chelsea'])
+            self.assertEqual(self.names('ars'), [])
+        rebuild.assert_not_called()
+
+    def test_a_deleted_event_forces_a_rebuild(self):
+        self.names('a')
+        self.villa.delete()
+        with mock.patch.object(self.index, 'rebuild', wraps=self.index.rebuild) as rebuild:
+            self.assertEqual(self.names('a'), ['Arsenal vs Chelsea'])
+        rebuild.assert_called_once()
+
+
+class EventPriceFilterTests(TestCase):
+    """The price filter and sorts of AllEventsAPIView, on the denormalized min_price/max_price"""
+
+    @classmethod
+    def setUpTestData(cls):
+        superadmin = make_user('admin@example.com', '+447700900001')
+        # Buyer prices include the 10% service charge
+        for name, prices in (('Arsenal vs Chelsea', (100, 300)), ('Aston Villa vs Leeds', (50,)), ('Unpriced', ())):
+            section = make_section(make_event(superadmin, name=name))
+            for price in prices:
+                make_ticket(section, superadmin, sell_price=price)
+
+    def setUp(self):
+        cache.clear()
+
+    def names(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/events/all/', params)
+        self.assertFalse([q['sql'] for q in queries if 'tickets_ticket' in q['sql']])
+        return [event['name'] for event in response.json()['events']]
+
+    def test_max_price_keeps_events_with_tickets_within_budget(self):
+        self.assertEqual(self.names(max_price=100), ['Aston Villa vs Leeds'])
+
+    def test_min_price_keeps_events_with_tickets_at_or_above_it(self):
+        self.assertEqual(self.names(min_price=200), ['Arsenal vs Chelsea'])
+
+    def test_price_sorts(self):
+        self.assertEqual(self.names(max_price=1000, sort='price_low'), ['Aston Villa vs Leeds', 'Arsenal vs Chelsea'])
+        self.assertEqual(self.names(max_price=1000, sort='price_high'), ['Arsenal vs Chelsea', 'Aston Villa vs Leeds'])
+
+
+class EventCursorPaginationTests(TestCase):
+    """?cursor= pages of AllEventsAPIView (events.pagination)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.superadmin = make_user('admin@example.com', '+447700900001')
+        # Ties on sold_tickets are broken by the (uuid) pk
+        for number, sold in enumerate((5, 3, 3, 3, 1, 0, 0)):
+            make_event(cls.superadmin, name=f'Event {number}', sold_tickets=sold)
+
+    def setUp(self):
+        cache.clear()
+
+    def page(self, cursor='', **params):
+        response = self.client.get('/api/events/all/', {'sort': 'popular', 'per_page': 3, 'cursor': cursor, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def walk(self):
+        names, cursor = [], ''
+        while True:
+            data = self.page(cursor)
+            names += [event['name'] for event in data['events']]
+            cursor = data['next_cursor']
+            if not cursor:
+                return names
+
+    def expected(self):
+        return list(Event.objects.order_by('-sold_tickets', 'pk').values_list('name', flat=True))
+
+    def test_pages_cover_the_list_without_gaps_or_repeats(self):
+        self.assertEqual(self.walk(), self.expected())
+
+    def test_rows_added_before_the_cursor_do_not_shift_later_pages(self):
+        expected = self.expected()
+        first = self.page()
+        make_event(self.superadmin, name='Late bestseller', sold_tickets=10)
+        second = self.page(first['next_cursor'])
+        self.assertEqual([event['name'] for event in second['events']], expected[3:6])
+
+    def test_count_only_runs_when_asked_for(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.page()
+        self.assertNotIn('total_events', data)
+        self.assertFalse([q['sql'] for q in queries if 'COUNT(' in q['sql']])
+
+        self.assertEqual(self.page(count='1')['total_events'], 7)
+
+    def test_a_cursor_for_another_sort_is_rejected(self):
+        cursor = self.page()['next_cursor']
+        response = self.client.get('/api/events/all/', {'sort': 'price_low', 'cursor': cursor})
+        self.assertEqual(response.status_code, 400)
+
+
+class BatchEventSectionsTests(TestCase):
+    """BatchEventSectionsAPIView counts every section's unsold tickets in one grouped query"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.superadmin = make_user('admin@example.com', '+447700900001')
+        cls.events = []
+        for number in range(3):
+            event = make_event(cls.superadmin, name=f'Event {number}')
+            block_a, block_b = make_section(event), make_section(event, name='Block B', color='#4363D8')
+            make_ticket(block_a, cls.superadmin, number_of_tickets=2)
+            make_ticket(block_a, cls.superadmin, number_of_tickets=3, sold=True)
+            make_ticket(block_b, cls.superadmin, number_of_tickets=number + 1)
+            cls.events.append(event)
+
+    def get(self, events, *missing):
+        event_ids = ','.join([event.event_id for event in events] + list(missing))
+        return self.client.get(
+            '/api/events/sections/', {'event_ids': event_ids}, HTTP_AUTHORIZATION=f'Token {self.superadmin.pk}'
+        )
+
+    def test_sections_of_every_event_with_their_unsold_tickets(self):
+        data = self.get(self.events, '000000').json()
+        self.assertEqual(data['missing'], ['000000'])
+        self.assertEqual(
+            [[(s['name'], s['available_tickets']) for s in event['sections']] for event in data['events']],
+            [[('Block A', 2), ('Block B', number + 1)] for number in range(3)],
+        )
+
+    def test_queries_do_not_grow_with_the_number_of_events(self):
+        with CaptureQueriesContext(connection) as one:
+            self.get(self.events[:1])
+        with CaptureQueriesContext(connection) as three:
+            self.get(self.events)
+        self.assertEqual(len(three), len(one))
+        self.assertEqual(len([q for q in three if 'events_eventsection' in q['sql']]), 1)
+
+
+class PopularEventsTests(TestCase):
+    """refresh_popular_events_task ranks upcoming events by their recent completed orders"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.superadmin = make_user('admin@example.com', '+447700900001')
+        buyer = make_user('buyer@example.com', '+447700900002', user_type='Buyer')
+
+        def listing(name, **kwargs):
+            event = make_event(cls.superadmin, name=name, **kwargs)
+            return make_ticket(make_section(event), cls.superadmin)
+
+        arsenal, villa, past = listing('Arsenal'), listing('Villa'), listing('Past', date=date(2020, 1, 1))
+        cls.quiet = listing('Quiet', total_sold_price=5000).event
+        make_order(arsenal, buyer, amount=200, number_of_tickets=2)
+        make_order(villa, buyer, amount=300, number_of_tickets=1)
+        make_order(villa, buyer, amount=200, number_of_tickets=1)
+        make_order(past, buyer, amount=900)
+        # Left out: not completed, and outside the window
+        make_order(arsenal, buyer, amount=1000, status='pending')
+        old = make_order(arsenal, buyer, amount=1000)
+        Order.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=30))
+
+    def test_orders_are_mapped_to_events_through_their_ticket(self):
+        refresh_popular_events_task(window_days=14)
+        ranking = list(PopularEvent.objects.values_list('event__name', 'recent_sales', 'recent_tickets'))
+        self.assertEqual(ranking, [('Villa', 500, 2), ('Arsenal', 200, 2), ('Quiet', 0, 0)])
+
+    def test_the_ranking_replaces_the_previous_one(self):
+        refresh_popular_events_task(window_days=14)
+        refresh_popular_events_task(window_days=14)
+        self.assertEqual(list(PopularEvent.objects.values_list('rank', flat=True)), [1, 2, 3])
+
+
+class BulkEventImportTests(TestCase):
+    """Events and their sections are imported all-or-nothing"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.superadmin = make_user('admin@example.com', '+447700900001')
+        cls.superadmin.is_superadmin = True
+        cls.superadmin.save(update_fields=['is_superadmin'])
+
+    def row(self, name, **kwargs):
+        return {
+            'name': name, 'stadium_name': 'Emirates Stadium', 'stadium_image': 'https://example.com/s.png',
+            'event_logo': 'https://example.com/l.png', 'date': '2030-01-01', 'time': '15:00', **kwargs,
+        }
+
+    def post(self, body, content_type='application/json', query=''):
+        return self.client.post(
+            f'/api/events/import/{query}', body, content_type=content_type,
+            HTTP_AUTHORIZATION=f'Token {self.superadmin.pk}',
+        )
+
+    def test_events_are_created_with_their_sections(self):
+        sections = [
+            {'name': 'Block A', 'color': '#3CB44B', 'lower_price': 50, 'upper_price': 120},
+            {'name': 'VIP', 'color': '#911EB4', 'lower_price': 200, 'upper_price': 400},
+        ]
+        response = self.post(json.dumps({'events': [self.row('Arsenal', sections=sections), self.row('Villa')]}))
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()['created'], 2)
+
+        arsenal = Event.objects.get(name='Arsenal')
+        self.assertEqual(sorted(arsenal.sections.values_list('name', flat=True)), ['Block A', 'VIP'])
+        self.assertEqual((arsenal.min_price, arsenal.max_price), (50, 400))
+        villa = Event.objects.get(name='Villa')
+        self.assertEqual(villa.sections.count(), len(Event.DEFAULT_SECTIONS))
+        self.assertEqual(
+            sorted(response.json()['event_ids']), sorted(Event.objects.values_list('event_id', flat=True))
+        )
+
+    def test_one_invalid_row_imports_nothing(self):
+        block = {'name': 'Block A', 'color': '#3CB44B'}
+        rows = [
+            self.row('Arsenal', sections=[block]),
+            self.row('Villa', date='2030-02-30'),
+            self.row('Spurs', sections=[block, dict(block)]),
+        ]
+        response = self.post(json.dumps(rows))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['row'] for error in response.json()['errors']], [2, 3])
+        self.assertFalse(Event.objects.exists())
+        self.assertFalse(EventSection.objects.exists())
+
+    def test_csv_rows_and_dry_run(self):
+        body = (
+            'name,stadium_name,stadium_image,event_logo,date,time,sections\n'
+            'Arsenal,Emirates Stadium,https://example.com/s.png,https://example.com/l.png,2030-01-01,15:00,'
+            'Block A|#3CB44B|50|120; VIP|#911EB4\n'
+        )
+        response = self.post(body, content_type='text/csv', query='?dry_run=1')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertFalse(Event.objects.exists())
+
+        response = self.post(body, content_type='text/csv')
+        self.assertEqual(response.status_code, 201, response.content)
+        section = EventSection.objects.get(event__name='Arsenal', name='Block A')
+        self.assertEqual((section.lower_price, section.upper_price), (50, 120))
+
+
+class SectionMatcherTests(SimpleTestCase):
+    """The compiled matcher agrees with the old substring loop except where a longer variation now wins"""
+
+    @staticmethod
+    def longest_inside(name, svg_key):
+        return max((len(v) for v in SECTION_NAME_MAPPINGS[svg_key] if v.lower() in name), default=0)
+
+    def test_agrees_with_the_loop_except_for_longer_matches(self):
+        names = BenchmarkCommand._names(2000) + [v for values in SECTION_NAME_MAPPINGS.values() for v in values]
+        differing = 0
+        for name in names:
+            old, new = legacy_normalize(name), compiled_normalize(name)
+            if old == new:
+                continue
+            differing += 1
+            name_clean = name.strip().lower()
+            # The loop took the first key with any match, the matcher the longest variation inside the name
+            self.assertGreater(self.longest_inside(name_clean, new), self.longest_inside(name_clean, old), name)
+        self.assertTrue(0 < differing < len(names) // 10)
+
+    def test_documented_longest_match(self):
+        name = 'West Stand Lower Hospitality Box'
+        self.assertEqual(legacy_normalize(name), 'longside-lower-tier')
+        self.assertEqual(compiled_normalize(name), 'hospitality-west-stand-lower-tier')
+
+    def test_a_name_inside_a_variation_and_unmapped_names(self):
+        for name in ('lower tier', 'Block 12', 'General Admission'):
+            self.assertEqual(compiled_normalize(name), legacy_normalize(name), name)
@@ -14,6 +14,7 @@ app_name = 'events'
 urlpatterns = [
     path('superadmin/create-event/', views.EventCreateView.as_view(), name='event_create'),
     path('api/events/create/', views.EventCreateAPIView.as_view(), name='api_event_create'),
+    path('api/events/import/', views.BulkEventImportAPIView.as_view(), name='api_event_import'),
     path('api/events/update/<str:event_id>/', views.EventUpdateAPIView.as_view(), name='api_event_update'),
     path('api/events/all/', views.AllEventsAPIView.as_view(), name='api_events_all'),
     path('api/events/search/', views.EventSearchAPIView.as_view(), name='api_events_search'),
@@ -158,10 +159,22 @@ path(
 path('api/events/<str:event_id>/create-listing/',
          ticket_views.CreateListingAPIView.as_view(),
          name='api_create_listing'),
+    path('api/events/<str:event_id>/bulk-listings/',
+         ticket_views.BulkCreateListingAPIView.as_view(),
+         name='api_bulk_create_listings'),
 
     path('api/tickets/update/<uuid:ticket_id>/',
          ticket_views.TicketUpdateAPIView.as_view(),
          name='api_ticket_update'),
+    path('api/tickets/<uuid:ticket_id>/pdf-uploads/',
+         ticket_views.TicketPdfUploadSlotsAPIView.as_view(),
+         name='api_ticket_pdf_uploads'),
+    path('api/tickets/<uuid:ticket_id>/pdf-uploads/confirm/',
+         ticket_views.TicketPdfUploadConfirmAPIView.as_view(),
+         name='api_ticket_pdf_uploads_confirm'),
+    path('api/tickets/local-pdf-uploads/',
+         ticket_views.LocalPdfUploadView.as_view(),
+         name='api_local_pdf_upload'),
     path('api/tickets/detail/<uuid:ticket_id>/',
          ticket_views.TicketDetailAPIView.as_view(),
          name='api_ticket_detail'),
@@ -177,6 +190,15 @@ path('api/events/<str:event_id>/create-listing/',
 path('api/events/<str:event_id>/tickets/',
          ticket_views.EventTicketListAPIView.as_view(),
          name='api_event_tickets'),
+    path('api/events/<str:event_id>/tickets/facets/',
+         ticket_views.EventListingFacetsAPIView.as_view(),
+         name='api_event_ticket_facets'),
+    path('api/events/<str:event_id>/tickets/changes/',
+         ticket_views.ListingChangesAPIView.as_view(),
+         name='api_event_ticket_changes'),
+    path('api/events/sections/',
+         views.BatchEventSectionsAPIView.as_view(),
+         name='api_batch_event_sections'),
     path('api/events/<str:event_id>/sections/', 
          views.EventSectionsAPIView.as_view(), 
          name='api_event_sections'),
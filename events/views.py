@@ -14,12 +14,21 @@ from django.conf import settings
 from django.http import JsonResponse, HttpResponseBadRequest
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.contrib.auth.mixins import UserPassesTestMixin
-from django.db.models import Q, Count, Sum
+from django.db.models import Q, Count, Sum, Prefetch
+from django.db.models.functions import Coalesce
 from django.core.exceptions import ValidationError
-from .models import Event, EventSection, ContactMessage, Category, EventCategory
+from .models import Event, EventSection, ContactMessage, Category
 from .forms import EventCreationForm, SectionForm, EventSearchForm,ContactForm
+from .autocomplete import autocomplete_index
+from .categories import category_registry
+from .bulk_import import ImportFormatError, import_events, parse_csv, parse_json
+from .etags import event_inventory_etag, event_list_etag
+from .home_data import get_home_page_data
+from .pagination import InvalidCursor, paginate_by_cursor
+from .search import search_events
 from accounts.utils import api_login_required, require_user_type, authenticate_via_id_token
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
 from django.utils.decorators import method_decorator
 from tickets.models import Ticket
 from tickets.email_templates import ProfessionalEmailTemplates as EmailTemplates
@@ -32,6 +41,23 @@ class SuperAdminMixin(UserPassesTestMixin):
         messages.error(self.request, "Unauthorized access")
         return redirect(reverse('accounts:sign_in'))
 
+def filter_by_price_range(qs, params):
+    """
+    Filter events on the denormalized min_price/max_price columns.
+    ``max_price`` keeps events whose cheapest tickets fit the budget and
+    ``min_price`` keeps events with tickets at or above the given price.
+    """
+    min_price = params.get('min_price')
+    max_price = params.get('max_price')
+    try:
+        if min_price:
+            qs = qs.filter(max_price__gte=float(min_price))
+        if max_price:
+            qs = qs.filter(min_price__gt=0, min_price__lte=float(max_price))
+    except ValueError:
+        pass
+    return qs
+
 class EventCreateAPIView(View):
     @method_decorator(csrf_exempt)
     @method_decorator(api_login_required)
@@ -172,6 +198,46 @@ class EventCreateAPIView(View):
                 'details': error_details if settings.DEBUG else None
             }, status=500)
 
+class BulkEventImportAPIView(View):
+    """
+    Create many events with their sections in one request.
+
+    Accepts JSON (a list of events, or {"events": [...]}) or a CSV body with
+    Content-Type text/csv; see events/bulk_import.py for the formats. Nothing
+    is created unless every row is valid. ``?dry_run=1`` only validates.
+    """
+    @method_decorator(csrf_exempt)
+    @method_decorator(api_login_required)
+    def dispatch(self, *args, **kwargs):
+        return super().dispatch(*args, **kwargs)
+
+    def post(self, request):
+        if not request.user.is_superadmin:
+            return JsonResponse({'error': 'Only superadmins can import events'}, status=403)
+
+        try:
+            if request.content_type in ('text/csv', 'application/csv'):
+                rows = parse_csv(request.body)
+            else:
+                rows = parse_json(request.body)
+            dry_run = request.GET.get('dry_run') in ('1', 'true')
+            result = import_events(rows, request.user, dry_run=dry_run)
+        except ImportFormatError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        if not result.ok:
+            return JsonResponse({
+                'error': f'{len(result.errors)} of {len(rows)} events are invalid, nothing was imported',
+                'errors': result.errors,
+            }, status=400)
+
+        return JsonResponse({
+            'success': True,
+            'dry_run': dry_run,
+            'created': 0 if dry_run else len(result.events),
+            'event_ids': [] if dry_run else [event.event_id for event in result.events],
+        }, status=200 if dry_run else 201)
+
 class EventCreateView(SuperAdminMixin, CreateView):
     model = Event
     form_class = EventCreationForm
@@ -280,12 +346,12 @@ class SuperadminEventListView(SuperAdminMixin, View):
                 events_data.append({
                     'event_id': event.event_id,
                     'name': event.name,
-                    'category': event.category,
+                    'category': event.category_legacy or '',
                     'stadium_name': event.stadium_name,
                     'date': event.date.isoformat(),
                     'time': event.time.strftime('%H:%M:%S'),
-                    'min_price': float(event.sections.aggregate(Min('lower_price'))['lower_price__min'] or 0),
-                    'max_price': float(event.sections.aggregate(Max('upper_price'))['upper_price__max'] or 0),
+                    'min_price': float(event.min_price),
+                    'max_price': float(event.max_price),
                     'total_tickets': event.total_tickets,
                     'sold_tickets': event.sold_tickets,
                     'total_sold_price': float(event.total_sold_price or 0),
@@ -311,8 +377,8 @@ class ExpiredEventListView(SuperAdminMixin, ListView):
     def get_queryset(self):
         return Event.objects.filter(
             superadmin=self.request.user,
-            date__lt=timezone.now().date()
-        ).order_by('-date', '-time')
+            starts_at__lt=timezone.now()
+        ).order_by('-starts_at')
 
 
 class EventUpdateAPIView(View):
@@ -439,41 +505,10 @@ class HomeView(ListView):
     paginate_by = 10
 
     def get_context_data(self, **kwargs):
-        from .models import EventCategory
-        from django.utils.text import slugify
-        
-        # Auto-populate categories from xs2events if they don't exist
-        categories_data = [
-            {'name': 'Football', 'icon': 'bi-shield', 'order': 1},
-            {'name': 'Formula 1', 'icon': 'bi-speedometer2', 'order': 2},
-            {'name': 'MotoGP', 'icon': 'bi-speedometer2', 'order': 3},
-            {'name': 'Tennis', 'icon': 'bi-circle-fill', 'order': 4},
-            {'name': 'Other events', 'icon': 'bi-calendar-event', 'order': 5},
-        ]
-        
-        # Always update all categories to ensure icons are correct
-        for cat_data in categories_data:
-            slug = slugify(cat_data['name'])
-            EventCategory.objects.update_or_create(
-                slug=slug,
-                defaults={
-                    'name': cat_data['name'],
-                    'icon': cat_data['icon'],
-                    'order': cat_data['order'],
-                    'is_active': True,
-                }
-            )
-        
         context = super().get_context_data(**kwargs)
         context['search_form'] = EventSearchForm()
         context['today'] = timezone.now().date()
-        context['categories'] = EventCategory.objects.filter(is_active=True).order_by('order')
-        context['upcoming_events'] = Event.objects.filter(
-            date__gte=timezone.now().date()
-        ).order_by('date', 'time')[:8]
-        context['popular_events'] = Event.objects.annotate(
-            total_sales=Sum('total_sold_price')
-        ).order_by('-total_sales')[:8]
+        context.update(get_home_page_data())
         return context
 
     def get_queryset(self):
@@ -493,11 +528,7 @@ class EventSearchView(ListView):
             qs = Event.objects.all()
             
             if query:
-                qs = qs.filter(
-                    Q(name__icontains=query) |
-                    Q(stadium_name__icontains=query) |
-                    Q(category__name__icontains=query)
-                )
+                qs = search_events(qs, query)
             
             if start_date and end_date:
                 try:
@@ -505,11 +536,7 @@ class EventSearchView(ListView):
                 except (ValueError, TypeError):
                     pass
             
-            # Add annotation safely with default values
-            qs = qs.annotate(
-                min_price=Min('sections__lower_price', default=0),
-                max_price=Max('sections__upper_price', default=0)
-            ).order_by('-date')
+            qs = qs.order_by('-search_rank', '-date') if query else qs.order_by('-date')
             
             return qs
         except Exception as e:
@@ -532,21 +559,17 @@ class AllEventsView(ListView):
         tournament = self.request.GET.get('tournament')
         category = self.request.GET.get('category')
         
-        qs = Event.objects.annotate(
-            min_price=Min('sections__lower_price'),
-            max_price=Max('sections__upper_price')
-        )
+        qs = Event.objects.all()
         
         # Filter by category if provided
         # The category parameter comes as a slug (e.g., 'formula-1')
         # We need to find the EventCategory by slug and then filter by its name
         if category:
             # Find the EventCategory object with matching slug
-            category_objs = EventCategory.objects.filter(slug=category)
-            if category_objs.exists():
+            category_obj = category_registry.event_category(category)
+            if category_obj:
                 # Filter events by the category name
-                category_name = category_objs.first().name
-                qs = qs.filter(category_legacy=category_name)
+                qs = qs.filter(category_legacy=category_obj['name'])
             else:
                 # If category doesn't exist, return empty queryset
                 qs = qs.none()
@@ -558,10 +581,12 @@ class AllEventsView(ListView):
         # Filter by tournament/sports_type if provided
         if tournament:
             qs = qs.filter(sports_type__iexact=tournament)
+
+        qs = filter_by_price_range(qs, self.request.GET)
         
         # Apply sorting
         if sort == 'upcoming':
-            return qs.filter(date__gte=timezone.now().date()).order_by('date')
+            return qs.filter(starts_at__gte=timezone.now()).order_by('starts_at')
         elif sort == 'popular':
             return qs.order_by('-sold_tickets')
         elif sort == 'price_low':
@@ -601,33 +626,7 @@ class SearchAutocompleteView(View):
             if not query or len(query) < 2:
                 return JsonResponse([], safe=False)
             
-            events = Event.objects.filter(
-                Q(name__icontains=query) |
-                Q(stadium_name__icontains=query) |
-                Q(category_legacy__icontains=query) |
-                Q(sports_type__icontains=query) |
-                Q(team__icontains=query)
-            ).annotate(
-                min_price=Min('sections__lower_price', default=0),
-                max_price=Max('sections__upper_price', default=0)
-            )[:10]
-            
-            data = []
-            for e in events:
-                try:
-                    min_p = e.min_price if e.min_price is not None else 0
-                    max_p = e.max_price if e.max_price is not None else 0
-                    data.append({
-                        'name': e.name,
-                        'category': e.category_legacy or e.sports_type or 'Sports',
-                        'date': e.date.strftime('%b %d, %Y'),
-                        'stadium': e.stadium_name,
-                        'min_price': str(min_p),
-                        'max_price': str(max_p),
-                        'url': reverse('events:event_tickets', args=[e.event_id])
-                    })
-                except Exception:
-                    continue
+            data = autocomplete_index.lookup(query)
             
             return JsonResponse(data, safe=False)
         except Exception as err:
@@ -687,6 +686,15 @@ class PrivacyView(TemplateView):
 
 
 class AllEventsAPIView(View):
+    # Keyset orderings for ?cursor= pagination; each ends with a unique column
+    CURSOR_ORDERINGS = {
+        'upcoming': ('starts_at', 'pk'),
+        'popular': ('-sold_tickets', 'pk'),
+        'price_low': ('min_price', 'pk'),
+        'price_high': ('-max_price', 'pk'),
+    }
+
+    @method_decorator(condition(etag_func=event_list_etag))
     def get(self, request):
         # Public API - no authentication required
         sort = request.GET.get('sort', 'upcoming')
@@ -696,13 +704,10 @@ class AllEventsAPIView(View):
         country = request.GET.get('country', '')
         team = request.GET.get('team', '')
 
-        qs = Event.objects.annotate(
-            min_price=Min('sections__lower_price'),
-            max_price=Max('sections__upper_price')
-        )
+        qs = Event.objects.all()
 
         if category:
-            qs = qs.filter(category=category)
+            qs = qs.filter(category_legacy=category)
         
         if sports_type:
             qs = qs.filter(sports_type__iexact=sports_type)
@@ -713,8 +718,10 @@ class AllEventsAPIView(View):
         if team:
             qs = qs.filter(team__iexact=team)
 
+        qs = filter_by_price_range(qs, request.GET)
+
         if sort == 'upcoming':
-            qs = qs.filter(date__gte=timezone.now().date()).order_by('date')
+            qs = qs.filter(starts_at__gte=timezone.now()).order_by('starts_at')
         elif sort == 'popular':
             qs = qs.order_by('-sold_tickets')
         elif sort == 'price_low':
@@ -724,15 +731,24 @@ class AllEventsAPIView(View):
         else:
             qs = qs.order_by('-date')
 
-        page = int(request.GET.get('page', 1))
-        per_page = int(request.GET.get('per_page', 10))
+        if 'cursor' in request.GET:
+            ordering = self.CURSOR_ORDERINGS.get(sort, ('-date', '-time', 'pk'))
+            try:
+                cursor_page = paginate_by_cursor(qs, ordering, request.GET)
+            except InvalidCursor as e:
+                return JsonResponse({'error': str(e)}, status=400)
+            events_page = cursor_page.items
+        else:
+            cursor_page = None
+            page = int(request.GET.get('page', 1))
+            per_page = int(request.GET.get('per_page', 10))
 
-        paginator = Paginator(qs, per_page)
+            paginator = Paginator(qs, per_page)
 
-        try:
-            events_page = paginator.page(page)
-        except (EmptyPage, PageNotAnInteger):
-            events_page = paginator.page(1)
+            try:
+                events_page = paginator.page(page)
+            except (EmptyPage, PageNotAnInteger):
+                events_page = paginator.page(1)
 
         events_data = []
         for event in events_page:
@@ -754,6 +770,9 @@ class AllEventsAPIView(View):
                 'is_expired': event.is_expired
             })
 
+        if cursor_page is not None:
+            return JsonResponse({'events': events_data, **cursor_page.metadata()})
+
         return JsonResponse({
             'events': events_data,
             'page': page,
@@ -775,39 +794,38 @@ class EventSearchAPIView(View):
         qs = Event.objects.all()
 
         if query:
-            qs = qs.filter(
-                Q(name__icontains=query) |
-                Q(stadium_name__icontains=query) |
-                Q(category__icontains=query) |
-                Q(sports_type__icontains=query) |
-                Q(country__icontains=query) |
-                Q(team__icontains=query)
-            )
+            qs = search_events(qs, query)
 
         if start_date and end_date:
             qs = qs.filter(date__range=[start_date, end_date])
 
-        qs = qs.annotate(
-            min_price=Min('sections__lower_price'),
-            max_price=Max('sections__upper_price')
-        ).order_by('-date')
+        qs = qs.order_by('-search_rank', '-date') if query else qs.order_by('-date')
 
-        page = int(request.GET.get('page', 1))
-        per_page = int(request.GET.get('per_page', 10))
+        if 'cursor' in request.GET:
+            ordering = ('-search_rank', '-date', 'pk') if query else ('-date', 'pk')
+            try:
+                cursor_page = paginate_by_cursor(qs, ordering, request.GET)
+            except InvalidCursor as e:
+                return JsonResponse({'error': str(e)}, status=400)
+            events_page = cursor_page.items
+        else:
+            cursor_page = None
+            page = int(request.GET.get('page', 1))
+            per_page = int(request.GET.get('per_page', 10))
 
-        paginator = Paginator(qs, per_page)
+            paginator = Paginator(qs, per_page)
 
-        try:
-            events_page = paginator.page(page)
-        except (EmptyPage, PageNotAnInteger):
-            events_page = paginator.page(1)
+            try:
+                events_page = paginator.page(page)
+            except (EmptyPage, PageNotAnInteger):
+                events_page = paginator.page(1)
 
         events_data = []
         for event in events_page:
             events_data.append({
                 'event_id': event.event_id,
                 'name': event.name,
-                'category': event.category,
+                'category': event.category_legacy or '',
                 'stadium_name': event.stadium_name,
                 'date': event.date.isoformat(),
                 'time': event.time.strftime('%H:%M:%S'),
@@ -819,6 +837,9 @@ class EventSearchAPIView(View):
                 'is_expired': event.is_expired
             })
 
+        if cursor_page is not None:
+            return JsonResponse({'events': events_data, 'query': query, **cursor_page.metadata()})
+
         return JsonResponse({
             'events': events_data,
             'query': query,
@@ -839,25 +860,33 @@ class ExpiredEventsAPIView(View):
 
         qs = Event.objects.filter(
             superadmin=request.user,
-            date__lt=timezone.now().date()
-        ).order_by('-date', '-time')
-
-        page = int(request.GET.get('page', 1))
-        per_page = int(request.GET.get('per_page', 10))
+            starts_at__lt=timezone.now()
+        ).order_by('-starts_at')
+
+        if 'cursor' in request.GET:
+            try:
+                cursor_page = paginate_by_cursor(qs, ('-starts_at', 'pk'), request.GET)
+            except InvalidCursor as e:
+                return JsonResponse({'error': str(e)}, status=400)
+            events_page = cursor_page.items
+        else:
+            cursor_page = None
+            page = int(request.GET.get('page', 1))
+            per_page = int(request.GET.get('per_page', 10))
 
-        paginator = Paginator(qs, per_page)
+            paginator = Paginator(qs, per_page)
 
-        try:
-            events_page = paginator.page(page)
-        except (EmptyPage, PageNotAnInteger):
-            events_page = paginator.page(1)
+            try:
+                events_page = paginator.page(page)
+            except (EmptyPage, PageNotAnInteger):
+                events_page = paginator.page(1)
 
         events_data = []
         for event in events_page:
             events_data.append({
                 'event_id': event.event_id,
                 'name': event.name,
-                'category': event.category,
+                'category': event.category_legacy or '',
                 'stadium_name': event.stadium_name,
                 'date': event.date.isoformat(),
                 'time': event.time.strftime('%H:%M:%S'),
@@ -867,6 +896,9 @@ class ExpiredEventsAPIView(View):
                 'days_since_event': (timezone.now().date() - event.date).days
             })
 
+        if cursor_page is not None:
+            return JsonResponse({'events': events_data, **cursor_page.metadata()})
+
         return JsonResponse({
             'events': events_data,
             'page': page,
@@ -901,55 +933,92 @@ class EventDeleteAPIView(View):
         except Exception as e:
             return JsonResponse({'error': f'Error deleting event: {str(e)}'}, status=500)
 
+def sections_with_availability():
+    """EventSection queryset annotated with the unsold ticket count of each section"""
+    return EventSection.objects.annotate(
+        available_tickets=Coalesce(Sum('tickets__number_of_tickets', filter=Q(tickets__sold=False)), 0)
+    ).order_by('name')
+
+
+def serialize_event_sections(event, sections):
+    sections_data = []
+    for section in sections:
+        lower_price = section.lower_price if section.lower_price else 0
+        upper_price = section.upper_price if section.upper_price else 0
+
+        sections_data.append({
+            'id': section.id,
+            'name': section.name,
+            'color': section.color,
+            'lower_price': float(lower_price),
+            'upper_price': float(upper_price),
+            'available_tickets': section.available_tickets,
+            'created_at': section.created.isoformat() if section.created else None
+        })
+
+    return {
+        'event': {
+            'event_id': event.event_id,
+            'name': event.name,
+            'category': event.category_legacy or '',
+            'sports_type': event.sports_type,
+            'country': event.country,
+            'team': event.team,
+            'stadium_name': event.stadium_name,
+            'date': event.date.isoformat(),
+            'time': event.time.strftime('%H:%M:%S'),
+        },
+        'sections': sections_data
+    }
+
+
 class EventSectionsAPIView(View):
     @method_decorator(api_login_required)
     def dispatch(self, *args, **kwargs):
         return super().dispatch(*args, **kwargs)
 
+    @method_decorator(condition(etag_func=event_inventory_etag))
     def get(self, request, event_id):
         try:
             event = Event.objects.get(event_id=event_id)
         except Event.DoesNotExist:
             return JsonResponse({'error': 'Event not found'}, status=404)
         
-        sections = event.sections.all().order_by('name')
-        
-        sections_data = []
-        for section in sections:
-            lower_price = section.lower_price if section.lower_price else 0
-            upper_price = section.upper_price if section.upper_price else 0
-            
-            available_tickets = Ticket.objects.filter(
-                event=event, 
-                section=section, 
-                sold=False
-            ).aggregate(
-                total_tickets=Sum('number_of_tickets')
-            )['total_tickets'] or 0
-            
-            sections_data.append({
-                'id': section.id,
-                'name': section.name,
-                'color': section.color,
-                'lower_price': float(lower_price),
-                'upper_price': float(upper_price),
-                'available_tickets': available_tickets,
-                'created_at': section.created.isoformat() if section.created else None
-            })
+        sections = sections_with_availability().filter(event=event)
         
+        return JsonResponse(serialize_event_sections(event, sections))
+
+
+class BatchEventSectionsAPIView(View):
+    """Section summaries for several events at once: ?event_ids=123456,654321"""
+    MAX_EVENTS = 100
+
+    @method_decorator(api_login_required)
+    def dispatch(self, *args, **kwargs):
+        return super().dispatch(*args, **kwargs)
+
+    def get(self, request):
+        event_ids = []
+        for value in request.GET.getlist('event_ids'):
+            event_ids.extend(event_id.strip() for event_id in value.split(',') if event_id.strip())
+        event_ids = list(dict.fromkeys(event_ids))
+
+        if not event_ids:
+            return JsonResponse({'error': 'event_ids is required'}, status=400)
+        if len(event_ids) > self.MAX_EVENTS:
+            return JsonResponse({'error': f'At most {self.MAX_EVENTS} event_ids per request'}, status=400)
+
+        events = Event.objects.filter(event_id__in=event_ids).prefetch_related(
+            Prefetch('sections', queryset=sections_with_availability(), to_attr='sections_with_availability')
+        )
+        events_by_id = {event.event_id: event for event in events}
+
         return JsonResponse({
-            'event': {
-                'event_id': event.event_id,
-                'name': event.name,
-                'category': event.category,
-                'sports_type': event.sports_type,
-                'country': event.country,
-                'team': event.team,
-                'stadium_name': event.stadium_name,
-                'date': event.date.isoformat(),
-                'time': event.time.strftime('%H:%M:%S'),
-            },
-            'sections': sections_data
+            'events': [
+                serialize_event_sections(events_by_id[event_id], events_by_id[event_id].sections_with_availability)
+                for event_id in event_ids if event_id in events_by_id
+            ],
+            'missing': [event_id for event_id in event_ids if event_id not in events_by_id]
         })
 
 
@@ -1014,31 +1083,7 @@ class CategoryCreateAPIView(View):
 
 class CategoryListAPIView(View):
     def get(self, request):
-        
-        categories = Category.objects.all().order_by('country', 'name')
-        data = {
-            'teams': {},
-            'tournaments': {}
-        }
-
-        for cat in categories:
-            # Map database type to frontend keys
-            if cat.type == 'team':
-                if cat.country not in data['teams']:
-                    data['teams'][cat.country] = []
-                data['teams'][cat.country].append({
-                    'id': cat.id,
-                    'name': cat.name
-                })
-            elif cat.type == 'tournament':
-                if cat.country not in data['tournaments']:
-                    data['tournaments'][cat.country] = []
-                data['tournaments'][cat.country].append({
-                    'id': cat.id,
-                    'name': cat.name
-                })
-        
-        return JsonResponse(data)
+        return JsonResponse(category_registry.tree())
 
 class CategoryDeleteAPIView(View):
     @method_decorator(csrf_exempt)
@@ -23,7 +23,8 @@ INSTALLED_APPS = [
     'anymail',
     'accounts',
     'events',
-    'tickets'
+    'tickets',
+    'archive',
 ]
 
 MIDDLEWARE = [
@@ -51,6 +52,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'events.context_processors.categories',
             ],
         },
     },
@@ -62,6 +64,26 @@ DATABASES = {
     'default': dj_database_url.parse(os.environ.get('DATABASE_URL', 'sqlite:///db.sqlite3'))
 }
 
+# The cache should be shared by every gunicorn worker and the scheduler dyno:
+# the in-process registries (categories, autocomplete) and the cached pages
+# are invalidated by version bumps made in whichever process wrote the change.
+# With REDIS_URL set (the Heroku Redis add-on) Redis is used. Without it each
+# process keeps its own local-memory cache, which still costs no database
+# query; changes made by other processes then show once the registries reach
+# their MAX_AGE and the cached pages their timeout. CACHE_BACKEND and
+# CACHE_LOCATION override either choice.
+REDIS_URL = os.environ.get('REDIS_URL')
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.redis.RedisCache' if REDIS_URL
+            else 'django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', REDIS_URL or 'go2events'),
+    }
+}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -236,9 +258,78 @@ SCHEDULED_JOBS = [
         'trigger': 'cron',
         'hour': '0',  # Run at midnight UTC
         'minute': '0',
-    }
+    },
+    {
+        'id': 'compact_listing_changes',
+        'func': 'tickets.tasks.compact_listing_changes_task',
+        'trigger': 'cron',
+        'hour': '3',
+        'minute': '0',
+    },
+    {
+        'id': 'archive_past_events',
+        'func': 'archive.tasks.archive_past_events_task',
+        'trigger': 'cron',
+        'hour': '4',
+        'minute': '0',
+    },
+    {
+        'id': 'reconcile_ticket_aggregates',
+        'func': 'tickets.tasks.reconcile_ticket_aggregates_task',
+        'trigger': 'interval',
+        'hours': 1,
+    },
+    {
+        'id': 'refresh_popular_events',
+        'func': 'events.tasks.refresh_popular_events_task',
+        'trigger': 'interval',
+        'minutes': 15,
+    },
+    {
+        'id': 'retry_pdf_uploads',
+        'func': 'tickets.tasks.retry_pdf_uploads_task',
+        'trigger': 'interval',
+        'minutes': 5,
+    },
 ]
 
+# How long the listing change feed keeps entries; older `since` values get a 410
+LISTING_CHANGE_RETENTION_DAYS = int(os.environ.get('LISTING_CHANGE_RETENTION_DAYS', 7))
+# Longest a transaction writing listing changes may stay open. Sequence numbers
+# are only handed out as a resume point once they are older than this, because
+# a change with a lower id can still commit until then.
+LISTING_CHANGE_COMMIT_LAG_SECONDS = int(os.environ.get('LISTING_CHANGE_COMMIT_LAG_SECONDS', 30))
+
+# Events that started more than this many days ago move to the archive app's
+# tables; keep it well past the 7 day payout window
+ARCHIVE_EVENTS_AFTER_DAYS = int(os.environ.get('ARCHIVE_EVENTS_AFTER_DAYS', 60))
+ARCHIVE_CHUNK_SIZE = int(os.environ.get('ARCHIVE_CHUNK_SIZE', 100))
+
+# Key for the permutation that turns the event id counter into public
+# 6-digit event_ids (events/event_ids.py)
+EVENT_ID_KEY = os.environ.get('EVENT_ID_KEY', SECRET_KEY)
+
+# Sales window used to rank popular events on the home page
+POPULAR_EVENTS_WINDOW_DAYS = int(os.environ.get('POPULAR_EVENTS_WINDOW_DAYS', 14))
+
+# Ticket PDF uploads (tickets/pdf_uploads.py): files are staged in the
+# database and pushed to storage by a pool of TICKET_PDF_UPLOAD_WORKERS
+# threads after the request (0 uploads inline). Failed uploads are retried
+# with backoff, by the pool or by retry_pdf_uploads on the scheduler, and
+# marked failed after TICKET_PDF_UPLOAD_ATTEMPTS.
+# TICKET_PDF_STORAGE=local stores the files under TICKET_PDF_LOCAL_ROOT
+# instead of S3.
+TICKET_PDF_STORAGE = os.environ.get('TICKET_PDF_STORAGE', 's3')
+TICKET_PDF_LOCAL_ROOT = os.environ.get('TICKET_PDF_LOCAL_ROOT', os.path.join(MEDIA_ROOT, 'local-pdfs'))
+TICKET_PDF_UPLOAD_WORKERS = int(os.environ.get('TICKET_PDF_UPLOAD_WORKERS', 4))
+TICKET_PDF_UPLOAD_ATTEMPTS = int(os.environ.get('TICKET_PDF_UPLOAD_ATTEMPTS', 5))
+
+# Clients can also upload ticket PDFs straight to the bucket through presigned
+# POST slots (tickets.direct_uploads); a slot is valid for this long and
+# accepts files up to TICKET_PDF_MAX_BYTES.
+TICKET_PDF_UPLOAD_SLOT_SECONDS = int(os.environ.get('TICKET_PDF_UPLOAD_SLOT_SECONDS', 900))
+TICKET_PDF_MAX_BYTES = int(os.environ.get('TICKET_PDF_MAX_BYTES', 10 * 1024 * 1024))
+
 # HTTPS and Security Settings
 SECURE_SSL_REDIRECT = False
 SECURE_HSTS_SECONDS = 31536000  # 1 year
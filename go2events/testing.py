@@ -0,0 +1,52 @@
+"""
+Model factories shared by the apps' tests.
+
+Each factory fills in the required fields with the values the tests use
+throughout (a 2030 event at the Emirates with 10%/5% service charges, a
+two-ticket e-ticket listing at 120, a completed order for one listing)
+and takes keyword arguments to override them.
+"""
+from datetime import date, time
+
+from accounts.models import User
+from events.models import Event, EventSection
+from tickets.models import Order, Ticket
+
+
+def make_user(email, phone, user_type='Reseller'):
+    return User.objects.create(email=email, phone=phone, user_type=user_type)
+
+
+def make_event(superadmin, name='Arsenal vs Chelsea', **kwargs):
+    kwargs = {
+        'stadium_name': 'Emirates Stadium', 'date': date(2030, 1, 1), 'time': time(15, 0),
+        'normal_service_charge': 10, 'reseller_service_charge': 5, **kwargs,
+    }
+    return Event.objects.create(
+        superadmin=superadmin, name=name,
+        stadium_image='https://example.com/s.png', event_logo='https://example.com/l.png', **kwargs
+    )
+
+
+def make_section(event, name='Block A', color='#3CB44B', **kwargs):
+    return EventSection.objects.create(event=event, name=name, color=color, **kwargs)
+
+
+def make_ticket(section, seller, **kwargs):
+    kwargs = {'number_of_tickets': 2, 'ticket_type': 'e-ticket', 'sell_price': 120, **kwargs}
+    return Ticket.objects.create(
+        event=section.event, section=section, seller=seller, upload_choice='now', row='A', face_value=100, **kwargs
+    )
+
+
+def make_order(ticket, buyer, **kwargs):
+    kwargs = {
+        'number_of_tickets': ticket.number_of_tickets, 'amount': ticket.number_of_tickets * ticket.sell_price,
+        'status': 'completed', **kwargs,
+    }
+    return Order.objects.create(
+        event_name=ticket.event.name, event_date=ticket.event.date, event_time=ticket.event.time,
+        ticket_reference=ticket.ticket_id, ticket_section=ticket.section.name, ticket_row=ticket.row,
+        ticket_seats=ticket.seats or [], ticket_face_value=ticket.face_value, ticket_upload_type=ticket.ticket_type,
+        ticket_benefits_and_Restrictions=[], ticket_sell_price=ticket.sell_price, buyer=buyer, **kwargs
+    )
@@ -51,7 +51,7 @@ class EventDeletionManager:
         try:
             cutoff_date = timezone.now() - timedelta(days=self.days_after_expiry)
             expired_events = Event.objects.filter(
-                date__lt=cutoff_date,
+                starts_at__lt=cutoff_date,
                 is_active=True  # Only delete active events
             )
             return expired_events
@@ -19,6 +19,7 @@ django.setup()
 
 from tickets.models import Ticket
 from events.models import Event
+from django.db.models import Q
 from django.utils import timezone
 
 # Setup logging
@@ -52,31 +53,14 @@ class ListingDeletionManager:
     def get_expired_listings(self):
         """Get all listings that should be deleted"""
         try:
-            expired_listings = []
-            cutoff_date = timezone.now() - timedelta(days=self.days_after_expiry)
+            # Event has passed, or no tickets are left
+            condition = Q(event__starts_at__lt=timezone.now()) | Q(number_of_tickets__lte=0)
             
-            # Get all tickets
-            all_tickets = Ticket.objects.select_related('event')
+            # Check if sold out
+            if self.delete_sold_out:
+                condition |= Q(sold=True)
             
-            for ticket in all_tickets:
-                should_delete = False
-                
-                # Check if event has passed
-                if ticket.event and ticket.event.date < timezone.now():
-                    should_delete = True
-                
-                # Check if sold out
-                if self.delete_sold_out and ticket.sold:
-                    should_delete = True
-                
-                # Check if number of tickets is 0
-                if ticket.number_of_tickets <= 0:
-                    should_delete = True
-                
-                if should_delete:
-                    expired_listings.append(ticket)
-            
-            return expired_listings
+            return list(Ticket.objects.filter(condition).select_related('event', 'section'))
         except Exception as e:
             logger.error(f"Error fetching expired listings: {str(e)}")
             traceback.print_exc()
@@ -91,7 +75,7 @@ class ListingDeletionManager:
             
             # Store info before deletion
             reason = []
-            if ticket.event and ticket.event.date < timezone.now():
+            if ticket.event and ticket.event.starts_at < timezone.now():
                 reason.append("Event expired")
             if self.delete_sold_out and ticket.sold:
                 reason.append("Sold out")
@@ -52,8 +52,8 @@ class DataChecker:
         try:
             total_events = Event.objects.count()
             active_events = Event.objects.filter(is_active=True).count()
-            expired_events = Event.objects.filter(date__lt=timezone.now()).count()
-            upcoming_events = Event.objects.filter(date__gte=timezone.now()).count()
+            expired_events = Event.objects.filter(starts_at__lt=timezone.now()).count()
+            upcoming_events = Event.objects.filter(starts_at__gte=timezone.now()).count()
             
             self.stats['total_events'] = total_events
             self.stats['active_events'] = active_events
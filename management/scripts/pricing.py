@@ -255,7 +255,7 @@ class PricingManager:
             # Get all active events
             active_events = Event.objects.filter(
                 is_active=True,
-                date__gte=timezone.now()
+                starts_at__gte=timezone.now()
             )
             
             if not active_events.exists():
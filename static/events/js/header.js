@@ -88,6 +88,10 @@ function getCountryFlag(countryName) {
 // Navbar Rendering
 // =======================
 document.addEventListener('DOMContentLoaded', function () {
+    // Categories are rendered server side from the category registry
+    const navbar = document.getElementById("categoryNavbar");
+    if (navbar && navbar.children.length) return;
+
     renderNavbarCategories();
     fetchNavCategories();
 });
@@ -0,0 +1,202 @@
+"""
+Ticket aggregates denormalized onto EventSection and Event.
+
+- EventSection.lower_price / upper_price: cheapest and dearest
+  sell_price_for_normal of the section's tickets, 0 once it has none
+- EventSection.total_tickets: tickets still for sale in the section
+- Event.total_tickets: tickets for sale plus Event.sold_tickets, so that
+  Event.left_tickets is what is still for sale
+
+Ticket.save and Ticket.delete keep these up to date inside their own
+transaction; tickets_created does the same for a bulk insert. Counts move
+by F() deltas computed from the ticket's previous state. Prices are re-read with MIN/MAX over the section's tickets, which
+the (section, sell_price_for_normal) index answers without a scan, and only
+when a price or section changed. Neither costs more as a section grows.
+
+Writes that bypass the model (QuerySet.update, bulk deletes, raw SQL) make
+the aggregates drift. reconcile_ticket_aggregates_task finds drifted rows
+with one grouped query and recomputes them under a row lock.
+"""
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from events.models import Event, EventSection
+from .models import Ticket
+
+
+class TicketState:
+    """The columns of a ticket that feed the aggregates"""
+    __slots__ = ('section_id', 'number_of_tickets', 'sold', 'price')
+
+    def __init__(self, ticket):
+        self.section_id = ticket.section_id
+        self.number_of_tickets = ticket.number_of_tickets
+        self.sold = ticket.sold
+        self.price = ticket.sell_price_for_normal
+
+    @property
+    def available(self):
+        return 0 if self.sold else self.number_of_tickets
+
+
+def ticket_saved(ticket, previous):
+    """Apply a ticket insert (``previous`` is None) or update to the aggregates"""
+    current = TicketState(ticket)
+    old_available = previous.available if previous else 0
+
+    if previous and previous.section_id != current.section_id:
+        _add(EventSection, previous.section_id, 'total_tickets', -old_available)
+        _add(EventSection, current.section_id, 'total_tickets', current.available)
+    else:
+        _add(EventSection, current.section_id, 'total_tickets', current.available - old_available)
+    _add(Event, ticket.event_id, 'total_tickets', current.available - old_available)
+
+    if previous is None or previous.price != current.price or previous.section_id != current.section_id:
+        changed = refresh_section_prices(current.section_id)
+        if previous and previous.section_id != current.section_id:
+            changed = refresh_section_prices(previous.section_id) or changed
+        if changed:
+            ticket.event.update_price_range()
+
+
+def ticket_deleted(ticket, previous):
+    """Apply a ticket delete to the aggregates"""
+    _add(EventSection, previous.section_id, 'total_tickets', -previous.available)
+    _add(Event, ticket.event_id, 'total_tickets', -previous.available)
+    if refresh_section_prices(previous.section_id):
+        ticket.event.update_price_range()
+
+
+def tickets_created(event, tickets):
+    """
+    Apply a batch of inserted tickets, e.g. from bulk_create, to the
+    aggregates: one count update per section and one for the event, and the
+    price range of each section re-read once.
+    """
+    available = {}
+    for ticket in tickets:
+        available[ticket.section_id] = available.get(ticket.section_id, 0) + TicketState(ticket).available
+    for section_id, delta in available.items():
+        _add(EventSection, section_id, 'total_tickets', delta)
+    _add(Event, event.pk, 'total_tickets', sum(available.values()))
+
+    changed = False
+    for section_id in available:
+        changed = refresh_section_prices(section_id) or changed
+    if changed:
+        event.update_price_range()
+
+
+def record_sale(event_id, quantity):
+    """
+    Count ``quantity`` tickets of the event as sold. The tickets leave the
+    for-sale count when they are saved as sold, so total_tickets is moved
+    back up to keep it at for-sale + sold.
+    """
+    Event.objects.filter(pk=event_id).update(
+        sold_tickets=F('sold_tickets') + quantity,
+        total_tickets=F('total_tickets') + quantity,
+    )
+
+
+def refresh_section_prices(section_id):
+    """Re-read the section's price range from its tickets; True if it changed"""
+    prices = Ticket.objects.filter(section_id=OuterRef('pk')).order_by().values('section_id')
+    lower = Coalesce(Subquery(prices.annotate(low=Min('sell_price_for_normal')).values('low')), Value(0))
+    upper = Coalesce(Subquery(prices.annotate(high=Max('sell_price_for_normal')).values('high')), Value(0))
+    return bool(
+        EventSection.objects.filter(pk=section_id).exclude(lower_price=lower, upper_price=upper).update(
+            lower_price=lower, upper_price=upper, modified=timezone.now()
+        )
+    )
+
+
+def _add(model, pk, field, delta):
+    if not delta:
+        return
+    value = F(field) + delta if delta > 0 else Greatest(F(field) + delta, Value(0))
+    model.objects.filter(pk=pk).update(**{field: value})
+
+
+# What a section without tickets holds: nothing for sale and no price range,
+# as refresh_section_prices leaves it when its last ticket goes
+EMPTY_SECTION = {'available': 0, 'lower': 0, 'upper': 0}
+
+
+def section_stats(section_ids=None):
+    """Expected aggregates per section id, in one grouped query over the tickets"""
+    tickets = Ticket.objects.order_by()
+    if section_ids is not None:
+        tickets = tickets.filter(section_id__in=section_ids)
+    rows = tickets.values('section_id').annotate(
+        listings=Count('pk'),
+        available=Coalesce(Sum('number_of_tickets', filter=Q(sold=False)), 0),
+        lower=Min('sell_price_for_normal'),
+        upper=Max('sell_price_for_normal'),
+    )
+    return {row['section_id']: row for row in rows}
+
+
+def reconcile_section(section_id):
+    """Recompute one section from its tickets under a row lock; True if it had drifted"""
+    with transaction.atomic():
+        section = EventSection.objects.select_for_update().filter(pk=section_id).first()
+        if section is None:
+            return False
+        stats = section_stats([section_id]).get(section_id) or EMPTY_SECTION
+        updates = {'total_tickets': stats['available'], 'lower_price': stats['lower'], 'upper_price': stats['upper']}
+        drifted = {field: value for field, value in updates.items() if getattr(section, field) != value}
+        if drifted:
+            EventSection.objects.filter(pk=section_id).update(**drifted, modified=timezone.now())
+    return bool(drifted)
+
+
+def reconcile_event(event_id):
+    """Recompute one event's total_tickets and price range under a row lock; True if it had drifted"""
+    with transaction.atomic():
+        event = Event.objects.select_for_update().filter(pk=event_id).first()
+        if event is None:
+            return False
+        available = Ticket.objects.filter(event_id=event_id, sold=False).aggregate(
+            total=Coalesce(Sum('number_of_tickets'), 0)
+        )['total']
+        expected = available + event.sold_tickets
+        drifted = event.total_tickets != expected
+        if drifted:
+            Event.objects.filter(pk=event_id).update(total_tickets=expected)
+        prices = (event.min_price, event.max_price)
+        event.update_price_range()
+    return drifted or prices != (event.min_price, event.max_price)
+
+
+def find_drift():
+    """Return (section ids, event pks) whose stored aggregates don't match their tickets"""
+    stats = section_stats()
+    sections = set()
+    for section in EventSection.objects.values('pk', 'total_tickets', 'lower_price', 'upper_price').iterator():
+        row = stats.get(section['pk'], EMPTY_SECTION)
+        if (section['total_tickets'], section['lower_price'], section['upper_price']) != (
+            row['available'], row['lower'], row['upper']
+        ):
+            sections.add(section['pk'])
+
+    available = Ticket.objects.filter(event_id=OuterRef('pk'), sold=False).order_by().values('event_id').annotate(
+        total=Sum('number_of_tickets')
+    ).values('total')
+    section_prices = EventSection.objects.filter(event_id=OuterRef('pk')).order_by().values('event_id')
+    lowest = section_prices.annotate(low=Min('lower_price', filter=Q(lower_price__gt=0))).values('low')
+    highest = section_prices.annotate(high=Max('upper_price', filter=Q(upper_price__gt=0))).values('high')
+    events = set(
+        Event.objects.annotate(
+            expected=Coalesce(Subquery(available), 0) + F('sold_tickets'),
+            expected_min=Coalesce(Subquery(lowest), Value(0), output_field=Event._meta.get_field('min_price')),
+            expected_max=Coalesce(Subquery(highest), Value(0), output_field=Event._meta.get_field('max_price')),
+        )
+        .filter(~Q(total_tickets=F('expected')) | ~Q(min_price=F('expected_min')) | ~Q(max_price=F('expected_max')))
+        .values_list('pk', flat=True)
+    )
+    # A drifted section can leave its event's price range behind as well
+    events.update(EventSection.objects.filter(pk__in=sections).values_list('event_id', flat=True))
+    return sections, events
@@ -0,0 +1,209 @@
+"""
+Bulk creation of ticket listings, for resellers who list a whole fixture at
+once.
+
+The body is JSON: a list of listings, or ``{"listings": [...]}``. Each
+listing has the fields CreateListingAPIView takes (section, row,
+number_of_tickets, face_value, sell_price, ticket_type, upload_choice,
+upload_by, benefits_and_Restrictions, sell_together) plus optional ``seats``
+and a ``reference`` that is echoed back in its result.
+
+Every listing is validated like a single one, against sections loaded once.
+The valid ones are inserted with one bulk_create, and the section and event
+aggregates are updated once for the batch. Invalid listings don't stop the
+others, so each gets its own result:
+
+    result = create_listings(parse_json(body), event, seller)
+    result.results     # [{'index': 0, 'ok': True, 'ticket_id': '...'},
+                       #  {'index': 1, 'ok': False, 'errors': {'row': '...'}}]
+
+Listings with ``sell_together`` are bundled by their ``bundle`` value; the
+ones without a value share one bundle, like consecutive listings in the
+create listing form.
+"""
+import json
+import uuid
+
+from django import forms
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from events.cache_utils import bump_version
+from events.etags import CATALOGUE_NAMESPACE
+from events.home_data import HOME_NAMESPACE
+from events.models import Event
+from . import aggregates
+from .forms import TicketForm
+from .id_generator import CustomIDGenerator
+from .models import ListingChange, Ticket
+from .seller_listings import invalidate_seller_summary
+
+MAX_BULK_LISTINGS = 500
+
+
+class BulkListingFormatError(ValueError):
+    pass
+
+
+class BulkListingResult:
+    def __init__(self, results, tickets, dry_run=False):
+        self.results = results
+        self.tickets = tickets
+        self.dry_run = dry_run
+
+    @property
+    def created(self):
+        return sum(1 for result in self.results if result['ok'])
+
+    @property
+    def failed(self):
+        return len(self.results) - self.created
+
+
+def parse_json(content):
+    try:
+        data = json.loads(content)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise BulkListingFormatError('Invalid JSON data')
+    if isinstance(data, dict):
+        data = data.get('listings')
+    if not isinstance(data, list):
+        raise BulkListingFormatError('Expected a list of listings or {"listings": [...]}')
+    if not data:
+        raise BulkListingFormatError('No listings to create')
+    if len(data) > MAX_BULK_LISTINGS:
+        raise BulkListingFormatError(f'At most {MAX_BULK_LISTINGS} listings can be created at once')
+    return data
+
+
+class SectionField(forms.Field):
+    """A section of the event, answered from its sections loaded once per batch"""
+
+    def __init__(self, sections, **kwargs):
+        super().__init__(**kwargs)
+        self.sections = sections
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            return self.sections[int(value)]
+        except (KeyError, TypeError, ValueError):
+            raise ValidationError('Select a valid choice. That choice is not one of the available choices.')
+
+
+class BulkTicketForm(TicketForm):
+    """
+    TicketForm without its per-listing queries: the section is looked up in
+    the preloaded sections rather than the database, and ticket_id needs no
+    uniqueness check because it is a fresh uuid4.
+    """
+
+    class Meta(TicketForm.Meta):
+        fields = [field for field in TicketForm.Meta.fields if field != 'section']
+
+    def __init__(self, *args, sections, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['section'] = SectionField(sections)
+
+    def validate_unique(self):
+        pass
+
+
+def _split(value):
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(',') if part.strip()]
+    return value
+
+
+def _errors(form_errors):
+    return {field: ' '.join(str(message) for message in messages) for field, messages in form_errors.items()}
+
+
+def validate_listings(items, event, seller, sections):
+    """Build unsaved tickets for ``items``; return (results, tickets) with a result per item"""
+    results, tickets, bundles = [], [], {}
+    for index, data in enumerate(items):
+        result = {'index': index}
+        if isinstance(data, dict) and data.get('reference') is not None:
+            result['reference'] = data['reference']
+        results.append(result)
+
+        if not isinstance(data, dict):
+            result.update(ok=False, errors={'__all__': 'Each listing must be an object'})
+            continue
+
+        data = {**data, 'benefits_and_Restrictions': _split(data.get('benefits_and_Restrictions') or [])}
+        form = BulkTicketForm(data, event=event, user=seller, sections=sections)
+        if not form.is_valid():
+            result.update(ok=False, errors=_errors(form.errors))
+            continue
+
+        ticket = form.save(commit=False)
+        ticket.seller = seller
+        ticket.event = event
+        ticket.section = form.cleaned_data['section']
+        ticket.seats = _split(data.get('seats') or [])
+        try:
+            ticket.clean()
+        except ValidationError as e:
+            result.update(ok=False, errors={'__all__': ' '.join(e.messages)})
+            continue
+
+        if ticket.sell_together:
+            bundle = str(data.get('bundle') or '')
+            ticket.bundle_id = bundles.setdefault(bundle, uuid.uuid4())
+        else:
+            ticket.bundle_id = None
+        ticket.apply_service_charges()
+        result['ok'] = True
+        tickets.append((result, ticket))
+    return results, tickets
+
+
+def create_listings(items, event, seller, dry_run=False):
+    """
+    Validate ``items`` and create a listing for each valid one. Nothing is
+    written when ``dry_run`` is set.
+    """
+    sections = {section.pk: section for section in event.sections.all()}
+    results, built = validate_listings(items, event, seller, sections)
+    tickets = [ticket for _, ticket in built]
+    if dry_run or not tickets:
+        return BulkListingResult(results, [], dry_run)
+
+    with transaction.atomic():
+        _assign_ticket_numbers(tickets)
+        Ticket.objects.bulk_create(tickets, batch_size=500)
+        ListingChange.objects.bulk_create(
+            [ListingChange(event_id=event.pk, ticket_id=ticket.ticket_id, action=ListingChange.UPSERT)
+             for ticket in tickets],
+            batch_size=1000,
+        )
+        aggregates.tickets_created(event, tickets)
+        # bulk_create sends no post_save, so do what events.signals would
+        Event.bump_inventory_version(event.pk)
+        transaction.on_commit(_invalidate_event_caches)
+        invalidate_seller_summary(seller.pk)
+
+    for result, ticket in built:
+        ticket._aggregate_state = aggregates.TicketState(ticket)
+        result.update(ticket_id=str(ticket.ticket_id), ticket_number=ticket.ticket_number)
+    return BulkListingResult(results, tickets)
+
+
+def _invalidate_event_caches():
+    bump_version(HOME_NAMESPACE)
+    bump_version(CATALOGUE_NAMESPACE)
+
+
+def _assign_ticket_numbers(tickets):
+    numbers = {CustomIDGenerator.generate_ticket_id() for _ in tickets}
+    # Numbers are random, so draw again for any already taken
+    while True:
+        numbers -= set(Ticket.objects.filter(ticket_number__in=numbers).values_list('ticket_number', flat=True))
+        if len(numbers) >= len(tickets):
+            break
+        numbers.update(CustomIDGenerator.generate_ticket_id() for _ in range(len(tickets) - len(numbers)))
+    for ticket, number in zip(tickets, numbers):
+        ticket.ticket_number = number
@@ -0,0 +1,136 @@
+"""
+Direct-to-storage uploads of ticket PDFs.
+
+Instead of streaming PDFs through Django, a client asks for upload slots,
+POSTs each file straight to the bucket with a slot's url and fields, and
+then confirms the uploads. Only the two small JSON calls reach the app:
+
+    slots = issue_slots(ticket, 2)
+    # [{'url': '...', 'fields': {...}, 'upload_token': '...'}, ...]
+    pdfs = confirm_uploads(ticket, [slot['upload_token'] for slot in slots])
+
+A slot is a presigned POST for one key, limited to application/pdf and
+settings.TICKET_PDF_MAX_BYTES and valid for TICKET_PDF_UPLOAD_SLOT_SECONDS.
+Its upload token signs the key for the ticket, so a confirm call can only
+claim objects issued for that ticket. Confirming reads the size, content
+type and first bytes of each object and, like the listing forms, replaces
+the ticket's PDFs with a new set of one file per ticket.
+
+Objects that fail the checks are deleted. Slots that are never confirmed
+leave objects under DIRECT_UPLOAD_PREFIX, which a bucket lifecycle rule
+should expire.
+"""
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+
+from .models import Ticket, TicketPDF
+
+DIRECT_UPLOAD_PREFIX = 'tickets/pdfs/direct'
+PDF_CONTENT_TYPE = 'application/pdf'
+PDF_MAGIC = b'%PDF-'
+TOKEN_SALT = 'tickets.direct-uploads'
+# Uploads that started just before their slot expired may finish after it
+CONFIRM_GRACE_SECONDS = 3600
+
+
+class DirectUploadError(ValueError):
+    def __init__(self, message, errors=None):
+        super().__init__(message)
+        self.errors = errors or []
+
+
+def _storage():
+    return TicketPDF._meta.get_field('file').storage
+
+
+def issue_slots(ticket, count):
+    """Presigned POST slots for ``count`` PDFs of ``ticket``"""
+    storage = _storage()
+    slots = []
+    for _ in range(count):
+        name = f'{DIRECT_UPLOAD_PREFIX}/{ticket.ticket_id}/{uuid.uuid4().hex}.pdf'
+        post = storage.presigned_post(
+            name, PDF_CONTENT_TYPE, settings.TICKET_PDF_MAX_BYTES, settings.TICKET_PDF_UPLOAD_SLOT_SECONDS
+        )
+        slots.append({
+            'url': post['url'],
+            'fields': post['fields'],
+            'upload_token': signing.dumps({'ticket': str(ticket.ticket_id), 'name': name}, salt=TOKEN_SALT),
+        })
+    return slots
+
+
+def _read_token(ticket, token):
+    """The object name ``token`` was issued for, if it was issued for ``ticket``"""
+    if not isinstance(token, str):
+        return None
+    try:
+        data = signing.loads(
+            token, salt=TOKEN_SALT, max_age=settings.TICKET_PDF_UPLOAD_SLOT_SECONDS + CONFIRM_GRACE_SECONDS
+        )
+    except signing.BadSignature:
+        return None
+    if not isinstance(data, dict) or data.get('ticket') != str(ticket.ticket_id):
+        return None
+    return data.get('name')
+
+
+def verify_upload(storage, name):
+    """Why the object at ``name`` is not an acceptable ticket PDF, or None if it is"""
+    described = storage.describe(name, len(PDF_MAGIC))
+    if described is None:
+        return 'The file has not been uploaded'
+    size, content_type, head = described
+    if not 0 < size <= settings.TICKET_PDF_MAX_BYTES:
+        return f'The file must be between 1 byte and {settings.TICKET_PDF_MAX_BYTES} bytes'
+    if content_type != PDF_CONTENT_TYPE or not head.startswith(PDF_MAGIC):
+        return 'The file is not a PDF'
+    return None
+
+
+def confirm_uploads(ticket, tokens):
+    """
+    Check the objects uploaded for ``tokens`` and make them the ticket's
+    PDFs. Raises DirectUploadError, with an error per rejected upload, unless
+    every upload is acceptable.
+    """
+    if not isinstance(tokens, list) or not tokens:
+        raise DirectUploadError('No uploads to confirm')
+    if len(tokens) != ticket.number_of_tickets:
+        raise DirectUploadError(
+            f'Quantity mismatch! The listing has {ticket.number_of_tickets} tickets, '
+            f'so exactly {ticket.number_of_tickets} PDF files must be confirmed. {len(tokens)} were given.'
+        )
+
+    storage = _storage()
+    names, errors = [], []
+    for index, token in enumerate(tokens):
+        name = _read_token(ticket, token)
+        if name is None:
+            errors.append({'index': index, 'error': 'Invalid or expired upload token'})
+            continue
+        if name in names:
+            errors.append({'index': index, 'error': 'The same upload was confirmed twice'})
+            continue
+        problem = verify_upload(storage, name)
+        if problem:
+            if storage.exists(name):
+                storage.delete(name)
+            errors.append({'index': index, 'error': problem})
+            continue
+        names.append(name)
+    if errors:
+        raise DirectUploadError('Some uploads could not be confirmed', errors)
+
+    with transaction.atomic():
+        # Serialise confirms of the same listing
+        Ticket.objects.select_for_update().get(pk=ticket.pk)
+        existing = list(ticket.individual_pdfs.order_by('pk'))
+        if sorted(pdf.file.name for pdf in existing) == sorted(names):
+            # A retried confirm call
+            return existing
+        ticket.individual_pdfs.all().delete()
+        return TicketPDF.objects.bulk_create([TicketPDF(ticket=ticket, file=name) for name in names])
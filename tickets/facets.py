@@ -0,0 +1,137 @@
+"""
+Facet counts for the filter sidebar of the event ticket page.
+
+For one event's unsold listings this returns counts per section, per ticket
+type and per quantity (1 to 5, then "6+"), plus a sell_price histogram with
+``bins`` equal-width bands between the cheapest and dearest listing. Counts
+are of listings, which is what the filters in EventTicketListAPIView select.
+
+With a listing snapshot (tickets.listing_snapshots) at hand the facets are
+counted from its parsed listings. Otherwise they take two grouped queries:
+one by section, type and quantity, which also yields the price range, and
+one by histogram band.
+"""
+from decimal import Decimal
+
+from django.db.models import Count, F, IntegerField, Max, Min, Value
+from django.db.models.functions import Cast, Floor, Least
+
+from .models import Ticket
+
+DEFAULT_BINS = 10
+MAX_BINS = 50
+QUANTITY_BUCKETS = (1, 2, 3, 4, 5)
+QUANTITY_OVERFLOW = f'{QUANTITY_BUCKETS[-1] + 1}+'
+
+
+def quantity_bucket(number_of_tickets):
+    return str(number_of_tickets) if number_of_tickets <= QUANTITY_BUCKETS[-1] else QUANTITY_OVERFLOW
+
+
+def price_band(price, lowest, highest, bins):
+    """Index of the histogram band holding ``price``; the top edge belongs to the last band"""
+    if highest == lowest:
+        return 0
+    return min(int((price - lowest) * bins // (highest - lowest)), bins - 1)
+
+
+def facets_from_listings(listings, sections, bins):
+    """Facets of serialized listings, e.g. the ones in a listing snapshot"""
+    section_counts, type_counts, quantity_counts, bands = {}, {}, {}, {}
+    prices = [Decimal(str(listing['sell_price'])) for listing in listings]
+    lowest, highest = (min(prices), max(prices)) if prices else (None, None)
+
+    for listing, price in zip(listings, prices):
+        section_id = listing['section']['id']
+        section_counts[section_id] = section_counts.get(section_id, 0) + 1
+        type_counts[listing['ticket_type']] = type_counts.get(listing['ticket_type'], 0) + 1
+        bucket = quantity_bucket(listing['number_of_tickets'])
+        quantity_counts[bucket] = quantity_counts.get(bucket, 0) + 1
+        band = price_band(price, lowest, highest, bins)
+        bands[band] = bands.get(band, 0) + 1
+
+    return _facets(
+        len(listings), sum(listing['number_of_tickets'] for listing in listings),
+        sections, section_counts, type_counts, quantity_counts, lowest, highest, bins, bands,
+    )
+
+
+def facets_from_db(event, bins):
+    """Facets of the event's unsold tickets in two grouped queries"""
+    tickets = Ticket.objects.filter(event=event, sold=False).order_by()
+
+    groups = tickets.values('section_id', 'ticket_type', 'number_of_tickets').annotate(
+        listings=Count('pk'), lowest=Min('sell_price'), highest=Max('sell_price'),
+    )
+    section_counts, type_counts, quantity_counts = {}, {}, {}
+    total_listings = total_tickets = 0
+    lowest = highest = None
+    for group in groups:
+        listings = group['listings']
+        total_listings += listings
+        total_tickets += listings * group['number_of_tickets']
+        section_counts[group['section_id']] = section_counts.get(group['section_id'], 0) + listings
+        type_counts[group['ticket_type']] = type_counts.get(group['ticket_type'], 0) + listings
+        bucket = quantity_bucket(group['number_of_tickets'])
+        quantity_counts[bucket] = quantity_counts.get(bucket, 0) + listings
+        lowest = group['lowest'] if lowest is None else min(lowest, group['lowest'])
+        highest = group['highest'] if highest is None else max(highest, group['highest'])
+
+    bands = {}
+    if total_listings and highest == lowest:
+        bands[0] = total_listings
+    elif total_listings:
+        # Same arithmetic as price_band()
+        band = Least(
+            Cast(Floor((F('sell_price') - Value(lowest)) * bins / Value(highest - lowest)), IntegerField()),
+            Value(bins - 1),
+        )
+        for row in tickets.annotate(band=band).values('band').annotate(listings=Count('pk')):
+            bands[row['band']] = bands.get(row['band'], 0) + row['listings']
+
+    sections = event.sections.all().values('id', 'name', 'color', 'svg_section_key')
+    return _facets(
+        total_listings, total_tickets, sections, section_counts, type_counts, quantity_counts,
+        lowest, highest, bins, bands,
+    )
+
+
+def _facets(total_listings, total_tickets, sections, section_counts, type_counts, quantity_counts,
+            lowest, highest, bins, bands):
+    histogram = []
+    if lowest is not None:
+        width = (highest - lowest) / bins
+        for band in range(bins if highest != lowest else 1):
+            histogram.append({
+                'lower': round(float(lowest + width * band), 2),
+                'upper': round(float(lowest + width * (band + 1)), 2) if band < bins - 1 else float(highest),
+                'count': bands.get(band, 0),
+            })
+
+    return {
+        'total_listings': total_listings,
+        'total_tickets': total_tickets,
+        'sections': [
+            {
+                'id': section['id'],
+                'name': section['name'],
+                'color': section['color'],
+                'svg_section_key': section['svg_section_key'],
+                'count': section_counts.get(section['id'], 0),
+            }
+            for section in sections
+        ],
+        'ticket_types': [
+            {'value': value, 'label': label, 'count': type_counts.get(value, 0)}
+            for value, label in Ticket.TICKET_TYPE_CHOICES
+        ],
+        'quantities': [
+            {'value': bucket, 'count': quantity_counts.get(bucket, 0)}
+            for bucket in [str(n) for n in QUANTITY_BUCKETS] + [QUANTITY_OVERFLOW]
+        ],
+        'price': {
+            'min': float(lowest) if lowest is not None else None,
+            'max': float(highest) if highest is not None else None,
+            'histogram': histogram,
+        },
+    }
@@ -0,0 +1,168 @@
+"""
+Per-event snapshots of the listings API payload.
+
+A hot fixture's ticket page asks EventTicketListAPIView for the same listings
+over and over. The first request after an inventory change builds the
+unfiltered payload once and caches it under the event's inventory ETag (see
+events.etags), as JSON bytes plus gzip and brotli variants. Any ticket or
+section change bumps Event.inventory_version, which moves the key, so a stale
+snapshot is never served and simply ages out.
+
+Unfiltered ``?stream=1`` requests are answered with the stored bytes in the
+encoding the client accepts. Filtered and numbered-page requests filter the
+parsed listings in memory, which each worker keeps for its most recent
+events. Neither touches the tickets table. Events with more than
+SNAPSHOT_MAX_LISTINGS listings aren't snapshotted and keep using the
+streaming path.
+"""
+import gzip
+import json
+import threading
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SNAPSHOT_TIMEOUT = 3600
+SNAPSHOT_MAX_LISTINGS = 5000
+# Parsed snapshots each worker keeps in memory
+LOCAL_SNAPSHOTS = 32
+
+TOO_LARGE = 'too-large'
+
+
+class ListingSnapshot:
+    def __init__(self, body, gzipped, brotlied=None):
+        self.body = body
+        self.gzipped = gzipped
+        self.brotlied = brotlied
+        self._data = None
+
+    @classmethod
+    def from_payload(cls, data):
+        body = json.dumps(data, cls=DjangoJSONEncoder).encode()
+        return cls(
+            body,
+            gzip.compress(body, compresslevel=6),
+            brotli.compress(body, quality=5) if brotli is not None else None,
+        )
+
+    @property
+    def data(self):
+        """The payload, parsed once per worker"""
+        if self._data is None:
+            self._data = json.loads(self.body)
+        return self._data
+
+    def encoded(self, accept_encoding):
+        """Return (body, content encoding or None) for an Accept-Encoding header"""
+        accepted = {part.split(';')[0].strip().lower() for part in accept_encoding.split(',')}
+        if self.brotlied is not None and 'br' in accepted:
+            return self.brotlied, 'br'
+        if 'gzip' in accepted:
+            return self.gzipped, 'gzip'
+        return self.body, None
+
+    def filtered(self, sections, ticket_types, min_price, max_price, number_of_tickets):
+        """The listings matching the same filters EventTicketListAPIView applies in SQL"""
+        listings = self.data['tickets']
+
+        if sections:
+            section_ids = {int(value) for value in sections}
+            listings = [listing for listing in listings if listing['section']['id'] in section_ids]
+
+        if ticket_types:
+            listings = [listing for listing in listings if listing['ticket_type'] in ticket_types]
+
+        if min_price:
+            try:
+                floor = float(min_price)
+                listings = [listing for listing in listings if listing['sell_price'] >= floor]
+            except ValueError:
+                pass
+
+        if max_price:
+            try:
+                ceiling = float(max_price)
+                listings = [listing for listing in listings if listing['sell_price'] <= ceiling]
+            except ValueError:
+                pass
+
+        if number_of_tickets:
+            try:
+                quantities = {int(n) for n in number_of_tickets}
+                listings = [listing for listing in listings if listing['number_of_tickets'] in quantities]
+            except ValueError:
+                pass
+
+        return listings
+
+    def to_cache(self):
+        return {'body': self.body, 'gzip': self.gzipped, 'br': self.brotlied}
+
+    @classmethod
+    def from_cache(cls, value):
+        return cls(value['body'], value['gzip'], value['br'])
+
+
+class SnapshotStore:
+    def __init__(self, size=LOCAL_SNAPSHOTS):
+        self._lock = threading.Lock()
+        self._local = OrderedDict()
+        self._size = size
+
+    def get(self, etag, build):
+        """
+        Return the snapshot for an inventory ETag, or None when the event is
+        too large to snapshot. ``build`` returns the payload dict, or None
+        when there are more than SNAPSHOT_MAX_LISTINGS listings.
+        """
+        snapshot = self.peek(etag)
+        if snapshot is not None:
+            return snapshot
+
+        key = self._key(etag)
+        if cache.get(key) == TOO_LARGE:
+            return None
+        data = build()
+        if data is None:
+            cache.set(key, TOO_LARGE, SNAPSHOT_TIMEOUT)
+            return None
+        snapshot = ListingSnapshot.from_payload(data)
+        cache.set(key, snapshot.to_cache(), SNAPSHOT_TIMEOUT)
+        self._remember(etag, snapshot)
+        return snapshot
+
+    def peek(self, etag):
+        """Return the snapshot for an inventory ETag if one was already built, else None"""
+        with self._lock:
+            snapshot = self._local.get(etag)
+            if snapshot is not None:
+                self._local.move_to_end(etag)
+                return snapshot
+
+        value = cache.get(self._key(etag))
+        if value is None or value == TOO_LARGE:
+            return None
+        snapshot = ListingSnapshot.from_cache(value)
+        self._remember(etag, snapshot)
+        return snapshot
+
+    @staticmethod
+    def _key(etag):
+        return f'listing-snapshot:{etag}'
+
+    def _remember(self, etag, snapshot):
+        with self._lock:
+            self._local[etag] = snapshot
+            self._local.move_to_end(etag)
+            while len(self._local) > self._size:
+                self._local.popitem(last=False)
+
+
+listing_snapshots = SnapshotStore()
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from tickets.tasks import compact_listing_changes_task
+
+
+class Command(BaseCommand):
+    help = 'Compact the listing change feed and purge entries past the retention window'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-days', type=int, default=settings.LISTING_CHANGE_RETENTION_DAYS,
+            help='Keep changes newer than this many days'
+        )
+
+    def handle(self, *args, **options):
+        removed = compact_listing_changes_task(options['retention_days'])
+        self.stdout.write(self.style.SUCCESS(f'Removed {removed} listing change entries'))
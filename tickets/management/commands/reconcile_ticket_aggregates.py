@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from tickets.tasks import reconcile_ticket_aggregates_task
+
+
+class Command(BaseCommand):
+    help = 'Recompute section and event ticket aggregates that drifted from their tickets'
+
+    def handle(self, *args, **options):
+        fixed = reconcile_ticket_aggregates_task()
+        self.stdout.write(self.style.SUCCESS(f'Fixed {fixed} drifted sections and events'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from tickets.tasks import retry_pdf_uploads_task
+
+
+class Command(BaseCommand):
+    help = 'Upload staged ticket PDFs whose background upload failed or never ran'
+
+    def handle(self, *args, **options):
+        uploaded = retry_pdf_uploads_task()
+        self.stdout.write(self.style.SUCCESS(f'Uploaded {uploaded} ticket PDFs'))
@@ -0,0 +1,60 @@
+"""
+Long-running scheduler process: runs every job in settings.SCHEDULED_JOBS
+with APScheduler, configured from settings.SCHEDULER_CONFIG.
+
+Usage (the ``scheduler`` process in the Procfile):
+    python manage.py run_scheduler
+
+``--once`` runs every job a single time and exits, for one-off runs such as
+run_scheduled_tasks.
+"""
+import logging
+
+from apscheduler.schedulers.blocking import BlockingScheduler
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+def run_job(func_path):
+    # Jobs run on pool threads that outlive requests, so drop connections the
+    # database may have closed in the meantime
+    close_old_connections()
+    try:
+        return import_string(func_path)()
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = 'Run the scheduled jobs from settings.SCHEDULED_JOBS until interrupted'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Run every job once and exit')
+
+    def handle(self, *args, **options):
+        if options['once']:
+            for job in settings.SCHEDULED_JOBS:
+                try:
+                    run_job(job['func'])
+                    logger.info(f"{job['id']} completed successfully")
+                except Exception as e:
+                    logger.error(f"Error running {job['id']}: {str(e)}")
+            return
+
+        scheduler = BlockingScheduler(gconfig=settings.SCHEDULER_CONFIG)
+        for job in settings.SCHEDULED_JOBS:
+            trigger_args = dict(job)
+            job_id = trigger_args.pop('id')
+            func_path = trigger_args.pop('func')
+            trigger = trigger_args.pop('trigger')
+            scheduler.add_job(run_job, trigger, args=[func_path], id=job_id, name=job_id, **trigger_args)
+            self.stdout.write(f'Scheduled {job_id} ({func_path})')
+
+        try:
+            scheduler.start()
+        except (KeyboardInterrupt, SystemExit):
+            logger.info('Scheduler stopped')
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.3 on 2026-10-17 22:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_event_inventory_version'),
+        ('tickets', '0012_order_stripe_payment_intent_id_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListingChangeCompaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('purged_through', models.BigIntegerField(default=0)),
+                ('collapsed', models.PositiveIntegerField(default=0)),
+                ('purged', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ListingChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('ticket_id', models.UUIDField()),
+                ('action', models.CharField(choices=[('upsert', 'Upsert'), ('remove', 'Remove')], max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='listing_changes', to='events.event')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['event', 'id'], name='tickets_lis_event_i_a8e9d4_idx'), models.Index(fields=['created_at'], name='tickets_lis_created_12921d_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.3 on 2026-10-17 22:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0012_eventsection_total_tickets'),
+        ('tickets', '0013_listing_change_log'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['section', 'sell_price_for_normal'], name='tickets_tic_section_a67487_idx'),
+        ),
+    ]
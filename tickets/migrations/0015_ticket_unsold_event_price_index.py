@@ -0,0 +1,21 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:10
+
+from django.db import migrations, models
+
+from tickets.migration_operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('events', '0012_eventsection_total_tickets'),
+        ('tickets', '0014_ticket_section_price_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='ticket',
+            index=models.Index(fields=['event', 'sell_price_for_normal'], condition=models.Q(sold=False), name='tickets_unsold_event_price'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:10
+
+from django.db import migrations, models
+
+from tickets.migration_operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('tickets', '0016_ticket_unsold_event_recent_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='ticket',
+            index=models.Index(fields=['section'], condition=models.Q(sold=False), name='tickets_unsold_section'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.3 on 2026-10-18 00:05
+
+from django.db import migrations, models
+
+from tickets.migration_operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('tickets', '0018_ticket_bundle_members_index'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='ticket',
+            index=models.Index(fields=['seller', '-created_at', '-id'], name='tickets_seller_recent'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:10
+
+import tickets.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0019_ticket_seller_recent_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticketpdf',
+            name='staged_path',
+            field=models.CharField(blank=True, max_length=500),
+        ),
+        migrations.AddField(
+            model_name='ticketpdf',
+            name='upload_attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ticketpdf',
+            name='upload_error',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='ticketpdf',
+            name='upload_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='ticketpdf',
+            name='upload_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('uploading', 'Uploading'), ('uploaded', 'Uploaded'), ('failed', 'Failed')], default='uploaded', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='ticketpdf',
+            name='file',
+            field=models.FileField(blank=True, storage=tickets.models.ticket_pdf_storage, upload_to='tickets/pdfs'),
+        ),
+        migrations.AddIndex(
+            model_name='ticketpdf',
+            index=models.Index(condition=models.Q(('upload_status', 'uploaded'), _negated=True), fields=['upload_status'], name='ticketpdf_upload_backlog'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0020_ticketpdf_upload_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StagedTicketPDF',
+            fields=[
+                ('pdf', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='staged', serialize=False, to='tickets.ticketpdf')),
+                ('name', models.CharField(max_length=255)),
+                ('content', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RemoveField(
+            model_name='ticketpdf',
+            name='staged_path',
+        ),
+        migrations.AddField(
+            model_name='ticketpdf',
+            name='retry_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.3 on 2026-10-18 00:40
+
+from django.db import migrations, models
+
+from tickets.migration_operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('tickets', '0021_ticketpdf_staged_content'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='listingchange',
+            index=models.Index(fields=['ticket_id', 'id'], name='listingchange_ticket_seq'),
+        ),
+    ]
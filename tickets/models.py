@@ -1,11 +1,18 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.contrib.postgres.fields import ArrayField
+import mimetypes
 import uuid
+from datetime import timedelta
+from botocore.exceptions import ClientError
 from django.conf import settings
+from django.core import signing
+from django.core.files.storage import FileSystemStorage
+from django.urls import reverse
 from storages.backends.s3boto3 import S3Boto3Storage
+from storages.utils import clean_name
 import logging
 
 logger = logging.getLogger(__name__) 
@@ -23,6 +30,94 @@ class PdfStorage(S3Boto3Storage):
             
         return super().get_available_name(name, max_length)
 
+    def presigned_post(self, name, content_type, max_bytes, expires_in):
+        """The url and form fields for a client to POST ``name`` straight to the bucket"""
+        return self.bucket.meta.client.generate_presigned_post(
+            Bucket=self.bucket_name,
+            Key=self._normalize_name(clean_name(name)),
+            Fields={'acl': self.default_acl, 'Content-Type': content_type},
+            Conditions=[
+                {'acl': self.default_acl},
+                {'Content-Type': content_type},
+                ['content-length-range', 1, max_bytes],
+            ],
+            ExpiresIn=expires_in,
+        )
+
+    def describe(self, name, head_bytes):
+        """
+        (size, content type, first ``head_bytes`` bytes) of a stored object,
+        or None when there is none; one ranged GET, whatever the file size.
+        """
+        obj = self.bucket.Object(self._normalize_name(clean_name(name)))
+        try:
+            response = obj.get(Range=f'bytes=0-{head_bytes - 1}')
+        except ClientError as e:
+            code = e.response.get('Error', {}).get('Code')
+            if code in ('NoSuchKey', '404'):
+                return None
+            if code == 'InvalidRange':
+                return 0, '', b''
+            raise
+        size = int(response['ContentRange'].rsplit('/', 1)[1])
+        return size, response.get('ContentType', ''), response['Body'].read()
+
+
+class LocalPdfStorage(FileSystemStorage):
+    """
+    Filesystem stand-in for PdfStorage, so PDF uploads can be run and tested
+    without S3: files land under settings.TICKET_PDF_LOCAL_ROOT. Presigned
+    POSTs go to LocalPdfUploadView, which checks the signed policy as S3 would.
+    """
+    POLICY_SALT = 'tickets.local-pdf-upload'
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('location', settings.TICKET_PDF_LOCAL_ROOT)
+        kwargs.setdefault('base_url', f"{settings.MEDIA_URL.rstrip('/')}/local-pdfs/")
+        super().__init__(**kwargs)
+
+    def presigned_post(self, name, content_type, max_bytes, expires_in):
+        policy = signing.dumps(
+            {'key': name, 'content_type': content_type, 'max_bytes': max_bytes,
+             'expires': timezone.now().timestamp() + expires_in},
+            salt=self.POLICY_SALT,
+        )
+        return {
+            'url': reverse('events:api_local_pdf_upload'),
+            'fields': {'key': name, 'Content-Type': content_type, 'policy': policy},
+        }
+
+    def receive_post(self, fields, upload):
+        """Store ``upload`` for a presigned POST, enforcing its policy like S3"""
+        try:
+            policy = signing.loads(fields.get('policy', ''), salt=self.POLICY_SALT)
+        except signing.BadSignature:
+            raise ValidationError('Invalid policy')
+        if policy['expires'] < timezone.now().timestamp():
+            raise ValidationError('The policy has expired')
+        if fields.get('key') != policy['key'] or fields.get('Content-Type') != policy['content_type']:
+            raise ValidationError('The fields do not match the policy')
+        if upload is None or not 0 < upload.size <= policy['max_bytes']:
+            raise ValidationError('The file size is outside the allowed range')
+        if self.exists(policy['key']):
+            raise ValidationError('The key has already been uploaded')
+        return self.save(policy['key'], upload)
+
+    def describe(self, name, head_bytes):
+        if not self.exists(name):
+            return None
+        with self.open(name, 'rb') as stored:
+            head = stored.read(head_bytes)
+        return self.size(name), mimetypes.guess_type(name)[0] or '', head
+
+
+def ticket_pdf_storage():
+    """Storage for TicketPDF files: S3, or the local stand-in when TICKET_PDF_STORAGE is 'local'"""
+    if settings.TICKET_PDF_STORAGE == 'local':
+        return LocalPdfStorage()
+    return PdfStorage()
+
+
 User = get_user_model()
 
 TICKET_TYPES = [
@@ -105,37 +200,53 @@ class Ticket(models.Model):
             models.Index(fields=['event']),
             models.Index(fields=['seller']),
             models.Index(fields=['section']),
+            # MIN/MAX price per section for tickets.aggregates
+            models.Index(fields=['section', 'sell_price_for_normal']),
+            # Unsold inventory, which is what buyers browse: an event's
+            # listings by price or newest first, a section's listings, and
+            # bundles. Created concurrently, see migration 0015.
+            models.Index(
+                fields=['event', 'sell_price_for_normal'], condition=models.Q(sold=False),
+                name='tickets_unsold_event_price',
+            ),
+            models.Index(
+                fields=['event', '-created_at', '-id'], condition=models.Q(sold=False),
+                name='tickets_unsold_event_recent',
+            ),
+            models.Index(fields=['section'], condition=models.Q(sold=False), name='tickets_unsold_section'),
+            models.Index(fields=['bundle_id'], condition=models.Q(sell_together=True), name='tickets_bundle_members'),
+            # A seller's listings newest first, see tickets.seller_listings
+            models.Index(fields=['seller', '-created_at', '-id'], name='tickets_seller_recent'),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._aggregate_state = instance._loaded_aggregate_state()
+        return instance
+
+    def _loaded_aggregate_state(self):
+        from tickets.aggregates import TicketState
+        if self.get_deferred_fields() & {'section_id', 'number_of_tickets', 'sold', 'sell_price_for_normal'}:
+            return None
+        return TicketState(self)
+
+    def _previous_aggregate_state(self):
+        """The ticket's row as the aggregates last saw it"""
+        from tickets.aggregates import TicketState
+        previous = getattr(self, '_aggregate_state', None)
+        if previous is None:
+            previous = TicketState(Ticket.objects.get(pk=self.pk))
+        return previous
+
     def delete(self, *args, **kwargs):
-        event = self.event
-        section = self.section
-        ticket_number = self.number_of_tickets
-        super().delete(*args, **kwargs)
-        
-        # Update section prices if there are remaining tickets
-        all_tickets = section.tickets.all()
-        if all_tickets.exists():
-            prices = [float(t.sell_price_for_normal) for t in all_tickets if t.sell_price_for_normal is not None]
-            if prices:
-                section.lower_price = min(prices)
-                section.upper_price = max(prices)
-            else:
-                section.lower_price = 0
-                section.upper_price = 0
-        else:
-            # No tickets left in section
-            section.lower_price = 0
-            section.upper_price = 0
-        section.save()
-        
-        # Update event total tickets count
-        if event.total_tickets >= ticket_number:
-            event.total_tickets -= ticket_number
-        else:
-            # Prevent negative count
-            event.total_tickets = 0
-        event.save()
+        from tickets import aggregates
+        previous = self._previous_aggregate_state()
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            ListingChange.record(self, removed=True)
+            aggregates.ticket_deleted(self, previous)
+        return result
         
 
     def clean(self):
@@ -150,79 +261,48 @@ class Ticket(models.Model):
             raise ValidationError("Number of seats must match the number of tickets.")
 
     def save(self, *args, **kwargs):
+        from tickets import aggregates
         try:
             # Validate before saving
             self.clean()
             
-            normal_charge = self.event.normal_service_charge or 0
-            reseller_charge = self.event.reseller_service_charge or 0
-            
-            self.sell_price_for_normal = self.sell_price + (((self.sell_price * normal_charge)/100) or 0)
-            self.sell_price_for_reseller = self.sell_price + (((self.sell_price * reseller_charge)/100) or 0)
-            is_new = self.pk is None
+            self.apply_service_charges()
+            is_new = self._state.adding
             
             # Generate ticket_number if not already set
             if not self.ticket_number:
                 from tickets.id_generator import CustomIDGenerator
                 self.ticket_number = CustomIDGenerator.generate_ticket_id()
             
-            super().save(*args, **kwargs)
-
-            section = self.section
-            event = self.event
-            all_tickets = section.tickets.all()
-            
-            
-            if all_tickets.exists():
-                prices = [float(t.sell_price_for_normal) for t in all_tickets if t.sell_price_for_normal is not None]
-                if prices:
-                    section.lower_price = min(prices)
-                    section.upper_price = max(prices)
-                    section.save()
+            with transaction.atomic():
+                previous = None if is_new else self._previous_aggregate_state()
+                super().save(*args, **kwargs)
+                ListingChange.record(self)
+                aggregates.ticket_saved(self, previous)
+            self._aggregate_state = aggregates.TicketState(self)
             if is_new:
-                logger.info(f"For event {event.name}, For section {section.name} , For quantity {self.number_of_tickets}")
-                logger.info(f"This ticket is new")
-                logger.info(f"current total tickets {event.total_tickets}")
-                if not self.sold:
-                    event.total_tickets += self.number_of_tickets
-                    logger.info(f"after adding,current total tickets {event.total_tickets}")
-                else:
-                    logger.info(f"Ticket created as sold, not incrementing total_tickets")
-                event.save()
-            else:
-                logger.info(f"This ticket is updating")
+                logger.info(f"For event {self.event.name}, For section {self.section.name} , For quantity {self.number_of_tickets}")
         except Exception as e:
             logger.error(f"Error saving ticket: {str(e)}")
             raise
             
 
-    def update_section_aggregates(self, section):
-        all_section_tickets = Ticket.objects.filter(section=section)
-        all_prices = [ticket.sell_price for ticket in all_section_tickets]
+    def apply_service_charges(self):
+        """Set the buyer prices from sell_price and the event's service charges"""
+        normal_charge = self.event.normal_service_charge or 0
+        reseller_charge = self.event.reseller_service_charge or 0
 
-        section.total_tickets = sum(ticket.number_of_tickets for ticket in all_section_tickets)
-        section.lower_price = min(all_prices) if all_prices else 0
-        section.upper_price = max(all_prices) if all_prices else 0
-        section.save()
+        self.sell_price_for_normal = self.sell_price + (((self.sell_price * normal_charge)/100) or 0)
+        self.sell_price_for_reseller = self.sell_price + (((self.sell_price * reseller_charge)/100) or 0)
+
+    def update_section_aggregates(self, section):
+        from tickets import aggregates
+        aggregates.reconcile_section(section.pk)
 
     def update_event_section_aggregates(self):
-        section = self.section
-        event = self.event
-        all_section_tickets = section.tickets.all()
-        
-        if all_section_tickets.exists():
-            all_prices = [float(ticket.sell_price) for ticket in all_section_tickets]
-            section.lower_price = min(all_prices)
-            section.upper_price = max(all_prices)
-            section.total_tickets = sum(ticket.number_of_tickets for ticket in all_section_tickets)
-        else:
-            section.lower_price = 0
-            section.upper_price = 0
-            section.total_tickets = 0
-        
-        section.save()
-        event.total_tickets = sum(t.number_of_tickets for t in event.tickets.all())
-        event.save()
+        from tickets import aggregates
+        aggregates.reconcile_section(self.section_id)
+        aggregates.reconcile_event(self.event_id)
 
     @property
     def is_bundled(self):
@@ -232,7 +312,7 @@ class Ticket(models.Model):
     def get_bundle_tickets(self):
         """Get all tickets in the same bundle"""
         if self.is_bundled:
-            return Ticket.objects.filter(bundle_id=self.bundle_id)
+            return Ticket.objects.filter(bundle_id=self.bundle_id, sell_together=True)
         return Ticket.objects.filter(id=self.id)
 
     @property
@@ -246,14 +326,56 @@ class Ticket(models.Model):
 
 # Add this below your existing Ticket model
 class TicketPDF(models.Model):
+    # Files staged by tickets.pdf_uploads are pending until pushed to storage
+    PENDING = 'pending'
+    UPLOADING = 'uploading'
+    UPLOADED = 'uploaded'
+    FAILED = 'failed'
+    UPLOAD_STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (UPLOADING, 'Uploading'),
+        (UPLOADED, 'Uploaded'),
+        (FAILED, 'Failed'),
+    ]
+
     ticket = models.ForeignKey(Ticket, related_name='individual_pdfs', on_delete=models.CASCADE)
-    file = models.FileField(upload_to='tickets/pdfs', storage=PdfStorage())
+    file = models.FileField(upload_to='tickets/pdfs', storage=ticket_pdf_storage, blank=True)
     is_sold = models.BooleanField(default=False)
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    upload_status = models.CharField(max_length=10, choices=UPLOAD_STATUS_CHOICES, default=UPLOADED)
+    upload_attempts = models.PositiveSmallIntegerField(default=0)
+    upload_error = models.CharField(max_length=255, blank=True)
+    upload_started_at = models.DateTimeField(null=True, blank=True)
+    # When a pending upload is next due, see tickets.pdf_uploads.retry_uploads
+    retry_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Uploads still to do, for tickets.pdf_uploads.retry_uploads
+            models.Index(
+                fields=['upload_status'], condition=~models.Q(upload_status='uploaded'),
+                name='ticketpdf_upload_backlog',
+            ),
+        ]
 
     def __str__(self):
         return f"PDF for Ticket ID {self.ticket.ticket_id} - {'SOLD' if self.is_sold else 'AVAILABLE'}"
-        
+
+
+class StagedTicketPDF(models.Model):
+    """
+    The content of a TicketPDF until tickets.pdf_uploads has pushed it to
+    storage. Kept in the database rather than on the web dyno's disk, so any
+    process can retry the upload and a restart loses nothing.
+    """
+    pdf = models.OneToOneField(TicketPDF, primary_key=True, related_name='staged', on_delete=models.CASCADE)
+    name = models.CharField(max_length=255)
+    content = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Staged {self.name} for TicketPDF {self.pdf_id}"
+
 class Order(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     event_name = models.CharField(max_length=255)
@@ -349,3 +471,71 @@ class TicketReservation(models.Model):
     
     def __str__(self):
         return f"Reservation for {self.ticket.ticket_id} by {self.buyer.email}"
+
+
+class ListingChange(models.Model):
+    """
+    Append-only change log of listings, read by ListingChangesAPIView so that
+    partner mirrors can sync only what changed since their last sequence number.
+    Written by Ticket.save/Ticket.delete; a ticket that is sold out is logged as
+    a removal because it drops out of EventTicketListAPIView.
+    """
+    UPSERT = 'upsert'
+    REMOVE = 'remove'
+    ACTION_CHOICES = [(UPSERT, 'Upsert'), (REMOVE, 'Remove')]
+
+    id = models.BigAutoField(primary_key=True)
+    event = models.ForeignKey('events.Event', on_delete=models.CASCADE, related_name='listing_changes')
+    ticket_id = models.UUIDField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['event', 'id']),
+            models.Index(fields=['created_at']),
+            # Later changes to the same ticket, for compact_listing_changes_task
+            models.Index(fields=['ticket_id', 'id'], name='listingchange_ticket_seq'),
+        ]
+
+    @classmethod
+    def record(cls, ticket, removed=False):
+        action = cls.REMOVE if removed or ticket.sold else cls.UPSERT
+        return cls.objects.create(event_id=ticket.event_id, ticket_id=ticket.ticket_id, action=action)
+
+    @classmethod
+    def commit_cutoff(cls):
+        """Changes created before this have committed or rolled back, see LISTING_CHANGE_COMMIT_LAG_SECONDS"""
+        return timezone.now() - timedelta(seconds=settings.LISTING_CHANGE_COMMIT_LAG_SECONDS)
+
+    @classmethod
+    def safe_sequence(cls, event_id):
+        """
+        Sequence number of the event's log up to which no change can still
+        appear: ids are taken in order, but a transaction holding a lower id
+        may commit after one holding a higher id.
+        """
+        return cls.objects.filter(event_id=event_id, created_at__lt=cls.commit_cutoff()).order_by('-id').values_list(
+            'id', flat=True
+        ).first() or 0
+
+    @classmethod
+    def horizon(cls):
+        """Sequence number below which the log is no longer complete"""
+        last = ListingChangeCompaction.objects.order_by('-id').first()
+        return last.purged_through if last else 0
+
+    def __str__(self):
+        return f"#{self.id} {self.action} {self.ticket_id}"
+
+
+class ListingChangeCompaction(models.Model):
+    """One row per compaction run of the ListingChange log"""
+    purged_through = models.BigIntegerField(default=0)
+    collapsed = models.PositiveIntegerField(default=0)
+    purged = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Compaction through #{self.purged_through} at {self.created_at}"
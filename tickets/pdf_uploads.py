@@ -0,0 +1,212 @@
+"""
+Background upload of ticket PDFs.
+
+A listing's PDFs used to be pushed to S3 one blocking PUT after another
+inside the request. Now stage_pdfs() stores the uploaded files in the
+database (StagedTicketPDF) and creates their TicketPDF rows as pending.
+Once the transaction commits, a pool of TICKET_PDF_UPLOAD_WORKERS threads
+in the web process uploads each file to storage, marks its row uploaded and
+drops the staged copy:
+
+    pending -> uploading -> uploaded
+                         -> pending (failed attempt) ... -> failed
+
+A row is claimed with a conditional UPDATE before it is uploaded, so a file
+is never pushed twice when the pool and retry_pdf_uploads_task reach it at
+the same time. A failed attempt leaves the row pending with retry_at set
+RETRY_BACKOFF_SECONDS later, doubling with each attempt; the pool retries it
+then. Because the staged copy lives in the database, retry_pdf_uploads_task
+on the scheduler dyno picks up whatever the web process did not finish, for
+example after a restart, and resets rows left uploading by a worker that
+died after STALE_UPLOAD_MINUTES.
+
+After TICKET_PDF_UPLOAD_ATTEMPTS the row is marked failed and the seller and
+the superadmin are emailed, so the seller can upload the file again.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.mail import send_mail
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import StagedTicketPDF, TicketPDF
+
+logger = logging.getLogger(__name__)
+
+# Rows this fresh are still queued in the pool of the web process
+RETRY_AFTER_MINUTES = 1
+# Delay before the second attempt; doubles with every further attempt
+RETRY_BACKOFF_SECONDS = 30
+STALE_UPLOAD_MINUTES = 10
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _pool():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.TICKET_PDF_UPLOAD_WORKERS, thread_name_prefix='pdf-upload'
+            )
+        return _executor
+
+
+def stage_pdfs(ticket, files):
+    """
+    Stage uploaded ``files`` for ``ticket`` and create their pending
+    TicketPDF rows; the uploads start when the transaction commits.
+    """
+    retry_at = timezone.now() + timedelta(minutes=RETRY_AFTER_MINUTES)
+    pdfs = TicketPDF.objects.bulk_create([
+        TicketPDF(ticket=ticket, upload_status=TicketPDF.PENDING, retry_at=retry_at) for _ in files
+    ])
+    StagedTicketPDF.objects.bulk_create([
+        StagedTicketPDF(
+            pdf=pdf,
+            name=os.path.basename(uploaded.name or '') or 'ticket.pdf',
+            content=b''.join(uploaded.chunks()),
+        )
+        for pdf, uploaded in zip(pdfs, files)
+    ])
+    pks = [pdf.pk for pdf in pdfs]
+    transaction.on_commit(lambda: submit(pks))
+    return pdfs
+
+
+def submit(pks):
+    """Upload the given pending TicketPDFs on the pool, or inline without workers"""
+    if settings.TICKET_PDF_UPLOAD_WORKERS <= 0:
+        for pk in pks:
+            upload_pdf(pk)
+        return
+    pool = _pool()
+    for pk in pks:
+        pool.submit(_run_upload, pk)
+
+
+def _run_upload(pk):
+    # Pool threads outlive requests, see run_scheduler.run_job
+    close_old_connections()
+    try:
+        if not upload_pdf(pk):
+            _schedule_retry(pk)
+    except Exception as e:
+        logger.error(f'Error uploading ticket PDF {pk}: {str(e)}')
+    finally:
+        close_old_connections()
+
+
+def _schedule_retry(pk):
+    """Resubmit a failed upload to the pool once its backoff has passed"""
+    retry_at = TicketPDF.objects.filter(pk=pk, upload_status=TicketPDF.PENDING).values_list(
+        'retry_at', flat=True
+    ).first()
+    if retry_at is None:
+        return
+    timer = threading.Timer(
+        max((retry_at - timezone.now()).total_seconds(), 0), lambda: _pool().submit(_run_upload, pk)
+    )
+    timer.daemon = True
+    timer.start()
+
+
+def backoff(attempts):
+    """How long to wait before the next try after ``attempts`` failed ones"""
+    return timedelta(seconds=RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1))
+
+
+def upload_pdf(pk):
+    """Push one staged TicketPDF to storage; True once it is uploaded"""
+    claimed = TicketPDF.objects.filter(pk=pk, upload_status=TicketPDF.PENDING).update(
+        upload_status=TicketPDF.UPLOADING, upload_started_at=timezone.now()
+    )
+    if not claimed:
+        return False
+    pdf = TicketPDF.objects.get(pk=pk)
+    attempts = pdf.upload_attempts + 1
+
+    staged = StagedTicketPDF.objects.filter(pdf_id=pk).first()
+    if staged is None:
+        # Staged on a web dyno's disk before the copy moved to the database
+        _give_up(pdf, attempts, 'The staged file is gone')
+        return False
+
+    try:
+        # Storage.save picks a free name, so the PUT happens before any row points at it
+        pdf.file.save(staged.name, ContentFile(bytes(staged.content)), save=False)
+    except Exception as e:
+        logger.error(f'Upload of ticket PDF {pk} failed (attempt {attempts}): {str(e)}')
+        if attempts >= settings.TICKET_PDF_UPLOAD_ATTEMPTS:
+            _give_up(pdf, attempts, str(e))
+        else:
+            TicketPDF.objects.filter(pk=pk).update(
+                upload_status=TicketPDF.PENDING, upload_attempts=attempts, upload_error=str(e)[:255],
+                retry_at=timezone.now() + backoff(attempts),
+            )
+        return False
+
+    with transaction.atomic():
+        TicketPDF.objects.filter(pk=pk).update(
+            file=pdf.file.name, upload_status=TicketPDF.UPLOADED, upload_attempts=attempts,
+            upload_error='', retry_at=None,
+        )
+        staged.delete()
+    return True
+
+
+def _give_up(pdf, attempts, error):
+    """Mark the upload failed and tell the seller and the superadmin"""
+    with transaction.atomic():
+        TicketPDF.objects.filter(pk=pdf.pk).update(
+            upload_status=TicketPDF.FAILED, upload_attempts=attempts, upload_error=error[:255], retry_at=None
+        )
+        StagedTicketPDF.objects.filter(pdf_id=pdf.pk).delete()
+    logger.error(f'Gave up uploading ticket PDF {pdf.pk} after {attempts} attempts: {error}')
+
+    ticket = pdf.ticket
+    try:
+        send_mail(
+            f"Ticket PDF upload failed for {ticket.event.name}",
+            (
+                f"Dear {ticket.seller.first_name},\n\n"
+                f"One of the PDFs of your listing {ticket.ticket_id} for '{ticket.event.name}' "
+                "could not be stored. Please upload it again from the listing's edit page.\n\n"
+                "Thank you."
+            ),
+            settings.DEFAULT_FROM_EMAIL,
+            [ticket.seller.email],
+        )
+        send_mail(
+            f"Ticket PDF upload failed: {ticket.event.name}",
+            f"Ticket PDF {pdf.pk} of listing {ticket.ticket_id} failed after {attempts} attempts: {error}",
+            settings.DEFAULT_FROM_EMAIL,
+            [settings.SUPERADMIN_EMAIL],
+        )
+    except Exception as e:
+        logger.error(f"Error sending upload failure email: {str(e)}")
+
+
+def retry_uploads():
+    """
+    Upload pending ticket PDFs that are due: rows stuck uploading are reset,
+    then every pending row past its retry_at is uploaded. Returns the number
+    of files uploaded.
+    """
+    now = timezone.now()
+    TicketPDF.objects.filter(
+        upload_status=TicketPDF.UPLOADING, upload_started_at__lt=now - timedelta(minutes=STALE_UPLOAD_MINUTES)
+    ).update(upload_status=TicketPDF.PENDING, retry_at=now)
+
+    due = TicketPDF.objects.filter(upload_status=TicketPDF.PENDING).filter(
+        Q(retry_at__isnull=True) | Q(retry_at__lte=now)
+    ).values_list('pk', flat=True)
+    return sum(upload_pdf(pk) for pk in list(due))
@@ -0,0 +1,116 @@
+"""
+A seller's own listings, for MyListingsView and MyListingsAPIView.
+
+Listings are read with their event and section joined in, newest first, a
+page at a time, and can be filtered by status (active/sold), by when the
+event is (upcoming/past) and by event. Each listing is flagged when any of
+its PDFs is still uploading or failed to upload (tickets.pdf_uploads).
+
+The summary above the listings (active listings and units, their gross
+value, sold listings, payouts pending and paid) takes two aggregate queries,
+one over the seller's tickets and one over their sales. It is cached per
+seller under a version that events.signals bumps on every ticket, sale and
+order change of that seller; bulk writes bump it themselves.
+"""
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, DecimalField, Exists, F, OuterRef, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from events.cache_utils import bump_version, versioned_key
+from .models import Sale, Ticket, TicketPDF
+
+SELLER_SUMMARY_NAMESPACE = 'seller-summary'
+SUMMARY_TIMEOUT = 600
+
+ORDERING = ('-created_at', '-pk')
+
+STATUS_CHOICES = ('all', 'active', 'sold')
+WHEN_CHOICES = ('all', 'upcoming', 'past')
+
+
+def read_filters(params):
+    """The listing filters in ``params``, with unknown values read as 'all'"""
+    status = params.get('status', 'all')
+    when = params.get('when', 'all')
+    return {
+        'status': status if status in STATUS_CHOICES else 'all',
+        'when': when if when in WHEN_CHOICES else 'all',
+        'event': params.get('event') or '',
+    }
+
+
+def seller_listings(seller, status='all', when='all', event=''):
+    """The seller's listings matching the filters, with event and section joined"""
+    pdfs = TicketPDF.objects.filter(ticket=OuterRef('pk'))
+    tickets = Ticket.objects.filter(seller=seller).select_related('event', 'section').annotate(
+        pdfs_uploading=Exists(pdfs.filter(upload_status__in=[TicketPDF.PENDING, TicketPDF.UPLOADING])),
+        pdfs_failed=Exists(pdfs.filter(upload_status=TicketPDF.FAILED)),
+    )
+
+    if status == 'active':
+        tickets = tickets.filter(sold=False)
+    elif status == 'sold':
+        tickets = tickets.filter(sold=True)
+
+    if when == 'upcoming':
+        tickets = tickets.filter(event__starts_at__gte=timezone.now())
+    elif when == 'past':
+        tickets = tickets.filter(event__starts_at__lt=timezone.now())
+
+    if event:
+        tickets = tickets.filter(event__event_id=event)
+
+    return tickets.order_by(*ORDERING)
+
+
+def seller_events(seller):
+    """(event_id, name) of the events the seller has listings for, for the event filter"""
+    return list(
+        Ticket.objects.filter(seller=seller).order_by('event__date', 'event__name')
+        .values_list('event__event_id', 'event__name').distinct()
+    )
+
+
+def _namespace(seller_id):
+    return f'{SELLER_SUMMARY_NAMESPACE}:{seller_id}'
+
+
+def invalidate_seller_summary(seller_id):
+    """Drop the seller's cached summary once the current transaction commits"""
+    if seller_id is not None:
+        transaction.on_commit(lambda: bump_version(_namespace(seller_id)))
+
+
+def seller_summary(seller):
+    key = versioned_key(_namespace(seller.pk), 'summary')
+    summary = cache.get(key)
+    if summary is None:
+        summary = build_summary(seller)
+        cache.set(key, summary, SUMMARY_TIMEOUT)
+    return summary
+
+
+def build_summary(seller):
+    money = DecimalField(max_digits=12, decimal_places=2)
+    zero = Value(Decimal('0'), output_field=money)
+    active, sold = Q(sold=False), Q(sold=True)
+    tickets = Ticket.objects.filter(seller=seller).aggregate(
+        active_listings=Count('pk', filter=active),
+        active_units=Coalesce(Sum('number_of_tickets', filter=active), 0),
+        gross_value=Coalesce(
+            Sum(F('number_of_tickets') * F('sell_price'), filter=active, output_field=money), zero
+        ),
+        sold_listings=Count('pk', filter=sold),
+    )
+
+    pending, paid = Q(order__paid_to_reseller=False), Q(order__paid_to_reseller=True)
+    sales = Sale.objects.filter(seller=seller).aggregate(
+        pending_payouts=Count('pk', filter=pending),
+        pending_payout_amount=Coalesce(Sum('amount', filter=pending), zero),
+        paid_out_amount=Coalesce(Sum('amount', filter=paid), zero),
+    )
+    return {**tickets, **sales}
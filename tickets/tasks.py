@@ -1,7 +1,13 @@
 import logging
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, Max, OuterRef
 from django.utils import timezone
 from datetime import timedelta
-from tickets.models import Sale
+from events.cache_utils import bump_version
+from events.etags import CATALOGUE_NAMESPACE
+from tickets import aggregates, pdf_uploads
+from tickets.models import Sale, ListingChange, ListingChangeCompaction
 
 logger = logging.getLogger(__name__)
 
@@ -39,3 +45,71 @@ def update_payout_status_task():
     except Exception as e:
         logger.error(f'Error in update_payout_status_task: {str(e)}')
         return 0
+
+
+def compact_listing_changes_task(retention_days=None):
+    """
+    Compact the ListingChange log: drop entries superseded by a later change to
+    the same ticket, then purge everything older than the retention window.
+    Clients asking for changes from before the purged sequence get a 410 and
+    resync from the full listing.
+    """
+    if retention_days is None:
+        retention_days = settings.LISTING_CHANGE_RETENTION_DAYS
+    cutoff = timezone.now() - timedelta(days=retention_days)
+
+    try:
+        with transaction.atomic():
+            newer = ListingChange.objects.filter(ticket_id=OuterRef('ticket_id'), id__gt=OuterRef('id'))
+            collapsed, _ = ListingChange.objects.filter(Exists(newer)).delete()
+
+            expired = ListingChange.objects.filter(created_at__lt=cutoff)
+            purged_through = expired.aggregate(last=Max('id'))['last'] or ListingChange.horizon()
+            purged, _ = expired.delete()
+
+            ListingChangeCompaction.objects.create(
+                purged_through=purged_through, collapsed=collapsed, purged=purged
+            )
+
+        logger.info(f'Listing change compaction completed - {collapsed} collapsed, {purged} purged')
+        return collapsed + purged
+    except Exception as e:
+        logger.error(f'Error in compact_listing_changes_task: {str(e)}')
+        return 0
+
+
+def reconcile_ticket_aggregates_task():
+    """
+    Find sections and events whose denormalized ticket counts or price ranges
+    no longer match their tickets (tickets.aggregates) and recompute them.
+    """
+    try:
+        sections, events = aggregates.find_drift()
+        fixed_sections = sum(aggregates.reconcile_section(section_id) for section_id in sections)
+        fixed_events = sum(aggregates.reconcile_event(event_id) for event_id in events)
+        if fixed_events:
+            # total_tickets is corrected with update(), which sends no signal
+            bump_version(CATALOGUE_NAMESPACE)
+        if fixed_sections or fixed_events:
+            logger.warning(
+                f'Ticket aggregates drifted - {fixed_sections} sections, {fixed_events} events fixed'
+            )
+        logger.info('Ticket aggregate reconciliation completed')
+        return fixed_sections + fixed_events
+    except Exception as e:
+        logger.error(f'Error in reconcile_ticket_aggregates_task: {str(e)}')
+        return 0
+
+
+def retry_pdf_uploads_task():
+    """
+    Upload ticket PDFs whose background upload failed or was lost with its
+    worker (tickets.pdf_uploads).
+    """
+    try:
+        uploaded = pdf_uploads.retry_uploads()
+        logger.info(f'Ticket PDF upload retry completed - {uploaded} files uploaded')
+        return uploaded
+    except Exception as e:
+        logger.error(f'Error in retry_pdf_uploads_task: {str(e)}')
+        return 0
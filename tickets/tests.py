@@ -1,3 +1,698 @@
-from django.test import TestCase
+import shutil
+import tempfile
+import uuid
+import json
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from events.etags import inventory_etag
+from go2events.testing import make_event, make_order, make_section, make_ticket, make_user
+from . import aggregates, bulk_listings, direct_uploads, pdf_uploads, seller_listings
+from .models import (
+    ListingChange, ListingChangeCompaction, LocalPdfStorage, Sale, StagedTicketPDF, Ticket, TicketPDF,
+)
+from .listing_snapshots import SnapshotStore
+from .tasks import compact_listing_changes_task, reconcile_ticket_aggregates_task
+from .views import EventTicketListAPIView
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Query plans are checked on PostgreSQL')
+class UnsoldInventoryIndexPlanTests(TestCase):
+    """The buyer-facing listing queries must keep using the partial indexes of migrations 0015-0018"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seller = make_user('seller@example.com', '+447700900002')
+        cls.event = make_event(seller)
+        cls.section = make_section(cls.event)
+        bundle_id = uuid.uuid4()
+        for number in range(60):
+            make_ticket(
+                cls.section, seller, ticket_type='paper', sell_price=100 + number,
+                sold=number % 4 != 0, sell_together=number < 4, bundle_id=bundle_id if number < 4 else None,
+            )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE tickets_ticket')
+
+    def assertUsesIndex(self, queryset, index_name):
+        with connection.cursor() as cursor:
+            # The table is tiny; take sequential scans off the table so the
+            # plan shows which index the query can use.
+            cursor.execute('SET LOCAL enable_seqscan = off')
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, plan)
+
+    def test_event_listings_newest_first(self):
+        tickets = Ticket.objects.filter(event=self.event, sold=False).order_by(*EventTicketListAPIView.ORDERING)
+        self.assertUsesIndex(tickets, 'tickets_unsold_event_recent')
+
+    def test_event_listings_by_price(self):
+        tickets = Ticket.objects.filter(event=self.event, sold=False).order_by('sell_price_for_normal')
+        self.assertUsesIndex(tickets, 'tickets_unsold_event_price')
+
+    def test_section_listings(self):
+        self.assertUsesIndex(Ticket.objects.filter(section=self.section, sold=False), 'tickets_unsold_section')
+
+    def test_bundle_members(self):
+        ticket = Ticket.objects.filter(sell_together=True).first()
+        self.assertUsesIndex(ticket.get_bundle_tickets(), 'tickets_bundle_members')
+
+
+class UnreachableStorage(LocalPdfStorage):
+    def _save(self, name, content):
+        raise OSError('The bucket is unreachable')
+
+
+class TicketPdfUploadTests(TestCase):
+    """tickets.pdf_uploads against the filesystem stand-in for S3"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seller = make_user('uploader@example.com', '+447700900003')
+        section = make_section(make_event(seller))
+        cls.ticket = make_ticket(section, seller)
+
+    def setUp(self):
+        self.bucket = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.bucket, ignore_errors=True)
+        settings = override_settings(TICKET_PDF_UPLOAD_WORKERS=0)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.field = TicketPDF._meta.get_field('file')
+        self.addCleanup(setattr, self.field, 'storage', self.field.storage)
+        self.field.storage = LocalPdfStorage(location=self.bucket)
+
+    def stage(self, *names):
+        files = [SimpleUploadedFile(name, b'%PDF-1.4 ' + name.encode(), 'application/pdf') for name in names]
+        return pdf_uploads.stage_pdfs(self.ticket, files)
+
+    def test_staged_files_are_uploaded_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            pdfs = self.stage('seat-1.pdf', 'seat-2.pdf')
+        self.assertEqual({pdf.upload_status for pdf in TicketPDF.objects.all()}, {TicketPDF.PENDING})
+        self.assertEqual(StagedTicketPDF.objects.count(), 2)
+
+        for callback in callbacks:
+            callback()
+        for pdf in pdfs:
+            pdf.refresh_from_db()
+            self.assertEqual(pdf.upload_status, TicketPDF.UPLOADED)
+            with pdf.file.open('rb') as uploaded:
+                self.assertTrue(uploaded.read().startswith(b'%PDF'))
+        self.assertFalse(StagedTicketPDF.objects.exists())
+
+    def test_a_claimed_upload_is_not_pushed_twice(self):
+        pdf, = self.stage('seat-1.pdf')
+        self.assertTrue(pdf_uploads.upload_pdf(pdf.pk))
+        self.assertFalse(pdf_uploads.upload_pdf(pdf.pk))
+
+    def test_failed_uploads_back_off_and_are_retried_by_any_process(self):
+        pdf, = self.stage('seat-1.pdf')
+        self.field.storage = UnreachableStorage(location=self.bucket)
+        self.assertFalse(pdf_uploads.upload_pdf(pdf.pk))
+        pdf.refresh_from_db()
+        self.assertEqual((pdf.upload_status, pdf.upload_attempts), (TicketPDF.PENDING, 1))
+        self.assertGreater(pdf.retry_at, timezone.now())
+
+        # Not due yet, then due: the staged copy is in the database, so the
+        # scheduler can upload it even though the web process is gone
+        self.field.storage = LocalPdfStorage(location=self.bucket)
+        self.assertEqual(pdf_uploads.retry_uploads(), 0)
+        TicketPDF.objects.filter(pk=pdf.pk).update(retry_at=timezone.now())
+        self.assertEqual(pdf_uploads.retry_uploads(), 1)
+        pdf.refresh_from_db()
+        self.assertEqual((pdf.upload_status, pdf.upload_attempts), (TicketPDF.UPLOADED, 2))
+
+    def test_backoff_doubles(self):
+        self.assertEqual(
+            [pdf_uploads.backoff(attempts).total_seconds() for attempts in (1, 2, 3)],
+            [pdf_uploads.RETRY_BACKOFF_SECONDS * factor for factor in (1, 2, 4)],
+        )
+
+    def test_uploads_left_uploading_are_reset(self):
+        pdf, = self.stage('seat-1.pdf')
+        TicketPDF.objects.filter(pk=pdf.pk).update(
+            upload_status=TicketPDF.UPLOADING, upload_started_at=timezone.now() - timedelta(hours=1)
+        )
+        self.assertEqual(pdf_uploads.retry_uploads(), 1)
+
+    @override_settings(TICKET_PDF_UPLOAD_ATTEMPTS=2, SUPERADMIN_EMAIL='admin@example.com')
+    def test_the_seller_is_told_when_an_upload_is_given_up(self):
+        pdf, = self.stage('seat-1.pdf')
+        self.field.storage = UnreachableStorage(location=self.bucket)
+        self.assertFalse(pdf_uploads.upload_pdf(pdf.pk))
+        self.assertEqual(mail.outbox, [])
+
+        TicketPDF.objects.filter(pk=pdf.pk).update(retry_at=timezone.now())
+        self.assertEqual(pdf_uploads.retry_uploads(), 0)
+        pdf.refresh_from_db()
+        self.assertEqual((pdf.upload_status, pdf.upload_attempts), (TicketPDF.FAILED, 2))
+        self.assertTrue(pdf.upload_error)
+        self.assertFalse(StagedTicketPDF.objects.exists())
+        self.assertEqual([message.to for message in mail.outbox], [['uploader@example.com'], ['admin@example.com']])
+
+    def test_listings_show_their_upload_status(self):
+        with self.captureOnCommitCallbacks():
+            self.stage('seat-1.pdf')
+        listing = seller_listings.seller_listings(self.ticket.seller).get()
+        self.assertEqual((listing.pdfs_uploading, listing.pdfs_failed), (True, False))
+
+        TicketPDF.objects.update(upload_status=TicketPDF.FAILED)
+        listing = seller_listings.seller_listings(self.ticket.seller).get()
+        self.assertEqual((listing.pdfs_uploading, listing.pdfs_failed), (False, True))
+
+
+class DirectPdfUploadTests(TestCase):
+    """tickets.direct_uploads against the filesystem stand-in for S3"""
+
+    @classmethod
+    def setUpTestData(cls):
+        seller = make_user('direct@example.com', '+447700900004')
+        section = make_section(make_event(seller))
+        cls.ticket, cls.other = make_ticket(section, seller), make_ticket(section, seller)
+
+    def setUp(self):
+        bucket = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, bucket, ignore_errors=True)
+        field = TicketPDF._meta.get_field('file')
+        self.addCleanup(setattr, field, 'storage', field.storage)
+        self.storage = field.storage = LocalPdfStorage(location=bucket)
+
+    def upload(self, slot, content):
+        """What the client's POST to the bucket does"""
+        upload = SimpleUploadedFile('ticket.pdf', content, 'application/pdf')
+        return self.storage.receive_post(slot['fields'], upload)
+
+    def test_confirmed_uploads_replace_the_ticket_pdfs(self):
+        TicketPDF.objects.create(ticket=self.ticket, file='tickets/pdfs/old.pdf')
+        slots = direct_uploads.issue_slots(self.ticket, 2)
+        names = [self.upload(slot, b'%PDF-1.4 seat') for slot in slots]
+
+        pdfs = direct_uploads.confirm_uploads(self.ticket, [slot['upload_token'] for slot in slots])
+        self.assertEqual(sorted(pdf.file.name for pdf in pdfs), sorted(names))
+        self.assertEqual(self.ticket.individual_pdfs.count(), 2)
+
+    def test_uploads_that_are_not_pdfs_are_rejected_and_deleted(self):
+        slots = direct_uploads.issue_slots(self.ticket, 2)
+        self.upload(slots[0], b'%PDF-1.4 seat')
+        bad = self.upload(slots[1], b'<html>not a ticket</html>')
+
+        with self.assertRaises(direct_uploads.DirectUploadError) as raised:
+            direct_uploads.confirm_uploads(self.ticket, [slot['upload_token'] for slot in slots])
+        self.assertEqual(raised.exception.errors, [{'index': 1, 'error': 'The file is not a PDF'}])
+        self.assertFalse(self.storage.exists(bad))
+        self.assertFalse(self.ticket.individual_pdfs.exists())
+
+    def test_tokens_only_confirm_uploads_for_their_ticket(self):
+        slots = direct_uploads.issue_slots(self.other, 2)
+        for slot in slots:
+            self.upload(slot, b'%PDF-1.4 seat')
+
+        with self.assertRaises(direct_uploads.DirectUploadError) as raised:
+            direct_uploads.confirm_uploads(self.ticket, [slot['upload_token'] for slot in slots])
+        self.assertEqual(len(raised.exception.errors), 2)
+
+
+class TicketAggregateTests(TestCase):
+    """tickets.aggregates, as kept up to date by Ticket.save and Ticket.delete"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = make_user('aggregates@example.com', '+447700900005')
+        cls.event = make_event(cls.seller)
+        cls.block_a = make_section(cls.event)
+        cls.block_b = make_section(cls.event, name='Block B', color='#4363D8')
+
+    def assertSection(self, section, total_tickets, lower_price, upper_price):
+        section.refresh_from_db()
+        self.assertEqual(
+            (section.total_tickets, section.lower_price, section.upper_price),
+            (total_tickets, Decimal(lower_price), Decimal(upper_price)),
+        )
+
+    def assertEvent(self, total_tickets, min_price, max_price):
+        self.event.refresh_from_db()
+        self.assertEqual(
+            (self.event.total_tickets, self.event.min_price, self.event.max_price),
+            (total_tickets, Decimal(min_price), Decimal(max_price)),
+        )
+
+    def test_insert(self):
+        # The buyer price is sell_price plus the event's 10% service charge
+        make_ticket(self.block_a, self.seller, number_of_tickets=2, sell_price=100)
+        make_ticket(self.block_a, self.seller, number_of_tickets=3, sell_price=200)
+        self.assertSection(self.block_a, 5, 110, 220)
+        self.assertEvent(5, 110, 220)
+
+    def test_price_change(self):
+        make_ticket(self.block_a, self.seller, sell_price=100)
+        ticket = make_ticket(self.block_a, self.seller, sell_price=200)
+        ticket.sell_price = 50
+        ticket.save()
+        self.assertSection(self.block_a, 4, 55, 110)
+        self.assertEvent(4, 55, 110)
+
+    def test_section_move(self):
+        make_ticket(self.block_a, self.seller, number_of_tickets=2, sell_price=100)
+        ticket = make_ticket(self.block_a, self.seller, number_of_tickets=3, sell_price=200)
+        ticket.section = self.block_b
+        ticket.save()
+        self.assertSection(self.block_a, 2, 110, 110)
+        self.assertSection(self.block_b, 3, 220, 220)
+        self.assertEvent(5, 110, 220)
+
+    def test_mark_sold(self):
+        ticket = make_ticket(self.block_a, self.seller, number_of_tickets=2, sell_price=100)
+        make_ticket(self.block_a, self.seller, number_of_tickets=3, sell_price=200)
+        ticket.sold = True
+        ticket.save()
+        aggregates.record_sale(self.event.pk, 2)
+        self.assertSection(self.block_a, 3, 110, 220)
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.sold_tickets, self.event.left_tickets), (2, 3))
+        self.assertEvent(5, 110, 220)
+
+    def test_delete(self):
+        make_ticket(self.block_a, self.seller, number_of_tickets=2, sell_price=100)
+        ticket = make_ticket(self.block_a, self.seller, number_of_tickets=3, sell_price=200)
+        ticket.delete()
+        self.assertSection(self.block_a, 2, 110, 110)
+        self.assertEvent(2, 110, 110)
+
+        # The last ticket takes the section's price range with it
+        Ticket.objects.get(section=self.block_a).delete()
+        self.assertSection(self.block_a, 0, 0, 0)
+        self.assertEvent(0, 0, 0)
+
+    def test_tickets_created(self):
+        tickets = [
+            Ticket(
+                event=self.event, section=section, seller=self.seller, upload_choice='now', number_of_tickets=number,
+                row='A', face_value=100, ticket_type='e-ticket', sell_price=price, ticket_number=f'BULK-{number}',
+            )
+            for section, number, price in ((self.block_a, 2, 100), (self.block_a, 1, 300), (self.block_b, 4, 200))
+        ]
+        for ticket in tickets:
+            ticket.apply_service_charges()
+        Ticket.objects.bulk_create(tickets)
+        aggregates.tickets_created(self.event, tickets)
+
+        self.assertSection(self.block_a, 3, 110, 330)
+        self.assertSection(self.block_b, 4, 220, 220)
+        self.assertEvent(7, 110, 330)
+
+    def test_drift_is_found_and_reconciled(self):
+        make_ticket(self.block_a, self.seller, number_of_tickets=2, sell_price=100)
+        ticket = make_ticket(self.block_a, self.seller, number_of_tickets=3, sell_price=200)
+        self.assertEqual(aggregates.find_drift(), (set(), set()))
+
+        # QuerySet.update bypasses Ticket.save and the aggregates with it
+        Ticket.objects.filter(pk=ticket.pk).update(number_of_tickets=5, sell_price_for_normal=Decimal('330.00'))
+        self.assertEqual(aggregates.find_drift(), ({self.block_a.pk}, {self.event.pk}))
+
+        self.assertEqual(reconcile_ticket_aggregates_task(), 2)
+        self.assertSection(self.block_a, 7, 110, 330)
+        self.assertEvent(7, 110, 330)
+        self.assertEqual(aggregates.find_drift(), (set(), set()))
+
+    def test_a_section_emptied_by_a_bulk_delete_loses_its_prices(self):
+        make_ticket(self.block_a, self.seller, number_of_tickets=2, sell_price=100)
+        make_ticket(self.block_b, self.seller, number_of_tickets=3, sell_price=200)
+        Ticket.objects.filter(section=self.block_b).delete()
+        self.assertEqual(aggregates.find_drift(), ({self.block_b.pk}, {self.event.pk}))
+
+        reconcile_ticket_aggregates_task()
+        self.assertSection(self.block_b, 0, 0, 0)
+        self.assertEvent(2, 110, 110)
+        self.assertEqual(aggregates.find_drift(), (set(), set()))
+
+
+class ListingChangeFeedTests(TestCase):
+    """ListingChangesAPIView and compact_listing_changes_task"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = make_user('feed@example.com', '+447700900006')
+        cls.event = make_event(cls.seller)
+        cls.section = make_section(cls.event)
+
+    def changes(self, since=0, limit=500):
+        return self.client.get(f'/api/events/{self.event.event_id}/tickets/changes/', {'since': since, 'limit': limit})
+
+    def age(self, changes, **delta):
+        ListingChange.objects.filter(pk__in=[change.pk for change in changes]).update(
+            created_at=timezone.now() - timedelta(**delta)
+        )
+
+    def test_changes_below_the_horizon_are_gone(self):
+        ListingChangeCompaction.objects.create(purged_through=5)
+        self.assertEqual(self.changes(since=4).status_code, 410)
+        self.assertEqual(self.changes(since=5).status_code, 200)
+
+    def test_next_since_stops_before_changes_that_may_not_have_committed(self):
+        for _ in range(2):
+            make_ticket(self.section, self.seller)
+        old = list(ListingChange.objects.order_by('id'))
+        self.age(old, hours=1)
+        make_ticket(self.section, self.seller)
+
+        data = self.changes().json()
+        self.assertEqual(data['next_since'], old[-1].pk)
+        self.assertFalse(data['has_more'])
+        # Recent changes are served anyway and come again on the next poll
+        self.assertEqual(len(data['upserts']), 3)
+        self.assertEqual(len(self.changes(since=data['next_since']).json()['upserts']), 1)
+
+        # A full page of settled changes means there may be more
+        data = self.changes(limit=1).json()
+        self.assertEqual((data['next_since'], data['has_more']), (old[0].pk, True))
+
+    def test_a_limit_below_one_is_rejected(self):
+        self.assertEqual(self.changes(limit=0).status_code, 400)
+
+    def test_compaction_keeps_the_latest_change_of_each_ticket(self):
+        ticket, other = make_ticket(self.section, self.seller), make_ticket(self.section, self.seller)
+        ticket.sell_price = 150
+        ticket.save()
+        ticket.sold = True
+        ticket.save()
+        latest = {
+            ticket.ticket_id: ListingChange.objects.filter(ticket_id=ticket.ticket_id).latest('id').pk,
+            other.ticket_id: ListingChange.objects.get(ticket_id=other.ticket_id).pk,
+        }
+
+        self.assertEqual(compact_listing_changes_task(retention_days=7), 2)
+        self.assertEqual(dict(ListingChange.objects.values_list('ticket_id', 'id')), latest)
+        self.assertEqual(ListingChange.objects.get(ticket_id=ticket.ticket_id).action, ListingChange.REMOVE)
+
+    def test_compaction_purges_expired_changes_and_moves_the_horizon(self):
+        make_ticket(self.section, self.seller)
+        expired = list(ListingChange.objects.all())
+        self.age(expired, days=8)
+        make_ticket(self.section, self.seller)
+
+        self.assertEqual(compact_listing_changes_task(retention_days=7), 1)
+        self.assertEqual(ListingChange.horizon(), expired[-1].pk)
+        self.assertEqual(self.changes(since=0).status_code, 410)
+
+
+class BulkListingTests(TestCase):
+    """BulkCreateListingAPIView and tickets.bulk_listings"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = make_user('bulk@example.com', '+447700900007')
+        cls.event = make_event(cls.seller)
+        cls.block_a = make_section(cls.event)
+        cls.block_b = make_section(cls.event, name='Block B', color='#4363D8')
+
+    def listing(self, section, **kwargs):
+        return {
+            'section': section.pk, 'row': 'A', 'number_of_tickets': 2, 'face_value': 100, 'sell_price': 120,
+            'ticket_type': 'e-ticket', 'upload_choice': 'later', 'upload_by': '2029-12-01', **kwargs,
+        }
+
+    def post(self, items, dry_run=False):
+        return self.client.post(
+            f'/api/events/{self.event.event_id}/bulk-listings/' + ('?dry_run=1' if dry_run else ''),
+            json.dumps(items), content_type='application/json', HTTP_AUTHORIZATION=f'Token {self.seller.pk}',
+        )
+
+    def mixed_batch(self):
+        return [
+            self.listing(self.block_a, reference='first'),
+            self.listing(self.block_a, row=''),
+            self.listing(self.block_b, number_of_tickets=3, sell_price=200),
+        ]
+
+    def test_a_mixed_batch_creates_the_valid_listings(self):
+        etag = inventory_etag(self.event)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post(self.mixed_batch())
+        self.assertEqual(response.status_code, 207)
+        data = response.json()
+        self.assertEqual((data['created'], data['failed']), (2, 1))
+        self.assertEqual([result['ok'] for result in data['results']], [True, False, True])
+        self.assertEqual(data['results'][0]['reference'], 'first')
+        self.assertIn('row', data['results'][1]['errors'])
+
+        tickets = Ticket.objects.filter(event=self.event)
+        self.assertEqual(
+            {str(ticket_id) for ticket_id in tickets.values_list('ticket_id', flat=True)},
+            {data['results'][0]['ticket_id'], data['results'][2]['ticket_id']},
+        )
+        self.assertFalse(tickets.filter(ticket_number__isnull=True).exists())
+        self.assertEqual(ListingChange.objects.filter(event=self.event).count(), 2)
+        self.event.refresh_from_db()
+        self.assertNotEqual(inventory_etag(self.event), etag)
+
+    def test_aggregates_match_the_inserted_tickets(self):
+        self.post(self.mixed_batch())
+        stats = aggregates.section_stats()
+        for section in (self.block_a, self.block_b):
+            section.refresh_from_db()
+            self.assertEqual(
+                (section.total_tickets, section.lower_price, section.upper_price),
+                (stats[section.pk]['available'], stats[section.pk]['lower'], stats[section.pk]['upper']),
+            )
+        self.event.refresh_from_db()
+        self.assertEqual((self.event.total_tickets, self.event.min_price, self.event.max_price), (5, 132, 220))
+        self.assertEqual(aggregates.find_drift(), (set(), set()))
+
+    def test_a_dry_run_writes_nothing(self):
+        response = self.post(self.mixed_batch(), dry_run=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual((response.json()['created'], response.json()['failed']), (0, 1))
+        self.assertFalse(Ticket.objects.exists())
+        self.assertFalse(ListingChange.objects.exists())
+
+        response = self.post([self.listing(self.block_a)], dry_run=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_status_codes(self):
+        self.assertEqual(self.post([self.listing(self.block_a)]).status_code, 201)
+        self.assertEqual(self.post([self.listing(self.block_a, row='')]).status_code, 400)
+        self.assertEqual(self.post({'listings': []}).status_code, 400)
+
+
+class SellerSummaryTests(TestCase):
+    """tickets.seller_listings.seller_summary and its invalidation by events.signals"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = make_user('summary@example.com', '+447700900008')
+        cls.buyer = make_user('buyer@example.com', '+447700900009', user_type='Buyer')
+        cls.event = make_event(cls.seller)
+        cls.section = make_section(cls.event)
+        make_ticket(cls.section, cls.seller, number_of_tickets=2, sell_price=120)
+        make_ticket(cls.section, cls.seller, number_of_tickets=3, sell_price=200)
+        cls.sold = make_ticket(cls.section, cls.seller, sold=True)
+
+    def setUp(self):
+        # Seller pks come back after each test's rollback, the cache doesn't
+        cache.clear()
+
+    def sell(self, amount, paid=False):
+        order = make_order(self.sold, self.buyer, amount=amount, paid_to_reseller=paid)
+        return Sale.objects.create(order=order, seller=self.seller, amount=amount)
+
+    def summary(self):
+        return seller_listings.seller_summary(self.seller)
+
+    def test_summary(self):
+        self.sell(240)
+        self.sell(100, paid=True)
+        self.assertEqual(self.summary(), {
+            'active_listings': 2, 'active_units': 5, 'gross_value': Decimal('840.00'), 'sold_listings': 1,
+            'pending_payouts': 1, 'pending_payout_amount': Decimal('240.00'), 'paid_out_amount': Decimal('100.00'),
+        })
+
+    def test_the_summary_is_cached(self):
+        self.summary()
+        with self.assertNumQueries(0):
+            self.summary()
+
+    def test_a_sale_invalidates_the_summary(self):
+        self.summary()
+        with self.captureOnCommitCallbacks(execute=True):
+            sale = self.sell(240)
+        self.assertEqual(self.summary()['pending_payout_amount'], Decimal('240.00'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            sale.order.paid_to_reseller = True
+            sale.order.save()
+        self.assertEqual(
+            (self.summary()['pending_payouts'], self.summary()['paid_out_amount']), (0, Decimal('240.00'))
+        )
+
+    def test_a_deleted_listing_invalidates_the_summary(self):
+        self.summary()
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.filter(sell_price=200).get().delete()
+        self.assertEqual((self.summary()['active_listings'], self.summary()['active_units']), (1, 2))
+
+    def test_bulk_created_listings_invalidate_the_summary(self):
+        self.summary()
+        item = {
+            'section': self.section.pk, 'row': 'B', 'number_of_tickets': 4, 'face_value': 100, 'sell_price': 50,
+            'ticket_type': 'e-ticket', 'upload_choice': 'later', 'upload_by': '2029-12-01',
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_listings.create_listings([item], self.event, self.seller)
+        self.assertEqual((self.summary()['active_listings'], self.summary()['gross_value']), (3, Decimal('1040.00')))
+
+
+class ScheduledTasksCommandTests(SimpleTestCase):
+    """run_scheduled_tasks is a one-off run of the jobs run_scheduler schedules"""
+
+    @override_settings(SCHEDULED_JOBS=[
+        {'id': 'first', 'func': 'tickets.tasks.first', 'trigger': 'interval', 'minutes': 5},
+        {'id': 'second', 'func': 'tickets.tasks.second', 'trigger': 'cron', 'hour': '0'},
+    ])
+    def test_every_scheduled_job_runs_once(self):
+        with mock.patch('tickets.management.commands.run_scheduler.run_job') as run_job:
+            run_job.side_effect = [RuntimeError('boom'), None]
+            call_command('run_scheduled_tasks')
+        self.assertEqual(
+            [c.args for c in run_job.call_args_list], [('tickets.tasks.first',), ('tickets.tasks.second',)]
+        )
+
+
+class EventListingPagesTests(TestCase):
+    """
+    Cursor and stream reads of an event's listings return the same list as one
+    numbered page, and a snapshot answers what the tickets table would
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.seller = make_user('seller@example.com', '+447700900001')
+        cls.event = make_event(cls.seller)
+        cls.sections = [make_section(cls.event), make_section(cls.event, name='Block B', color='#911EB4')]
+        for n in range(8):
+            make_ticket(
+                cls.sections[n % 2], cls.seller, sell_price=80 + 15 * n, number_of_tickets=1 + n % 7,
+                ticket_type=['e-ticket', 'paper', 'mobile-transfer'][n % 3],
+            )
+        # Listings created in the same instant are ordered by pk
+        Ticket.objects.filter(pk__in=Ticket.objects.order_by('pk').values('pk')[2:5]).update(
+            created_at=timezone.now()
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.url = f'/api/events/{self.event.event_id}/tickets/'
+
+    def ticket_ids(self, response):
+        if response.streaming:
+            return [t['ticket_id'] for t in json.loads(b''.join(response.streaming_content))['tickets']]
+        return [t['ticket_id'] for t in response.json()['tickets']]
+
+    def cursor_pages(self, query=''):
+        ids, cursor = [], ''
+        while cursor is not None:
+            data = self.client.get(f'{self.url}?per_page=3&cursor={cursor}{query}').json()
+            ids += [t['ticket_id'] for t in data['tickets']]
+            cursor = data['next_cursor']
+        return ids
+
+    def test_cursor_pages_match_the_full_list(self):
+        full = self.ticket_ids(self.client.get(self.url))
+        self.assertEqual(len(full), 8)
+        self.assertEqual(self.cursor_pages(), full)
+
+        section = self.sections[1].pk
+        filtered = self.ticket_ids(self.client.get(f'{self.url}?section={section}&min_price=100'))
+        self.assertEqual(self.cursor_pages(f'&section={section}&min_price=100'), filtered)
+
+    def test_stream_matches_the_full_list(self):
+        full = self.ticket_ids(self.client.get(self.url))
+        self.assertEqual(self.ticket_ids(self.client.get(f'{self.url}?stream=1')), full)
+        # Written from the tickets table when the event is too large to snapshot
+        cache.clear()
+        with mock.patch('tickets.views.listing_snapshots', SnapshotStore()), \
+                mock.patch('tickets.views.SNAPSHOT_MAX_LISTINGS', 0), \
+                mock.patch.object(EventTicketListAPIView, 'STREAM_CHUNK_SIZE', 3):
+            response = self.client.get(f'{self.url}?stream=1')
+            self.assertTrue(response.streaming)
+            self.assertEqual(self.ticket_ids(response), full)
+
+    def read(self, query, snapshots):
+        cache.clear()
+        with mock.patch('tickets.views.listing_snapshots', SnapshotStore()), \
+                mock.patch('tickets.views.SNAPSHOT_MAX_LISTINGS', 5000 if snapshots else 0):
+            response = self.client.get(self.url + query)
+            body = b''.join(response.streaming_content) if response.streaming else response.content
+        return json.loads(body)
+
+    def test_snapshot_and_database_responses_are_equal(self):
+        first, second = self.sections
+        for query in (
+            '', '?per_page=3&page=2', '?stream=1', f'?section={first.pk}', f'?section={first.pk}&section={second.pk}',
+            '?ticket_type=paper&ticket_type=e-ticket', '?min_price=100&max_price=150', '?min_price=cheap',
+            '?number_of_tickets=1&number_of_tickets=3', f'?stream=1&section={second.pk}&max_price=170',
+        ):
+            self.assertEqual(self.read(query, snapshots=True), self.read(query, snapshots=False), query)
+
+    def test_a_section_that_is_not_an_id_is_rejected(self):
+        for query in ('?section=abc', '?stream=1&section=abc', '?cursor=&section=1&section=x'):
+            response = self.client.get(self.url + query)
+            self.assertEqual(response.status_code, 400, query)
+
+
+class ListingFacetsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seller = make_user('seller@example.com', '+447700900001')
+        cls.event = make_event(seller)
+        cls.block_a = make_section(cls.event)
+        cls.block_b = make_section(cls.event, name='Block B', color='#911EB4')
+        make_ticket(cls.block_a, seller, sell_price=100, number_of_tickets=1)
+        make_ticket(cls.block_a, seller, sell_price=110, number_of_tickets=2, ticket_type='paper')
+        make_ticket(cls.block_b, seller, sell_price=150, number_of_tickets=6)
+        make_ticket(cls.block_b, seller, sell_price=200, number_of_tickets=9)
+        make_ticket(cls.block_b, seller, sell_price=500, number_of_tickets=4, sold=True)
+
+    def setUp(self):
+        cache.clear()
+        self.url = f'/api/events/{self.event.event_id}/tickets/facets/?bins=4'
+
+    def test_counts_and_histogram(self):
+        facets = self.client.get(self.url).json()
+        self.assertEqual((facets['total_listings'], facets['total_tickets']), (4, 18))
+        self.assertEqual([s['count'] for s in facets['sections']], [2, 2])
+        self.assertEqual(
+            {t['value']: t['count'] for t in facets['ticket_types']},
+            {'e-ticket': 3, 'paper': 1, 'mobile-transfer': 0},
+        )
+        self.assertEqual(
+            [(q['value'], q['count']) for q in facets['quantities']],
+            [('1', 1), ('2', 1), ('3', 0), ('4', 0), ('5', 0), ('6+', 2)],
+        )
+        self.assertEqual((facets['price']['min'], facets['price']['max']), (100, 200))
+        self.assertEqual(
+            [(band['lower'], band['upper'], band['count']) for band in facets['price']['histogram']],
+            [(100, 125, 2), (125, 150, 0), (150, 175, 1), (175, 200, 1)],
+        )
+
+    def test_snapshot_facets_equal_the_database_ones(self):
+        from_db = self.client.get(self.url).json()
+        # The listings API builds the snapshot the facets then read from
+        self.client.get(f'/api/events/{self.event.event_id}/tickets/')
+        with mock.patch('tickets.views.facets_from_db', side_effect=AssertionError('the snapshot was not used')):
+            self.assertEqual(self.client.get(self.url).json(), from_db)
+
+    def test_one_price_is_a_single_band(self):
+        Ticket.objects.filter(event=self.event).update(sell_price=120)
+        histogram = self.client.get(self.url).json()['price']['histogram']
+        self.assertEqual(histogram, [{'lower': 120, 'upper': 120, 'count': 4}])
@@ -9,20 +9,29 @@ from django.core.mail import send_mail, EmailMessage
 from tickets.email_templates import ProfessionalEmailTemplates as EmailTemplates
 from django.db import transaction
 from django.db.models import Sum
-from django.http import JsonResponse, HttpResponseRedirect, Http404, HttpResponse, FileResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, HttpResponseRedirect, Http404, HttpResponse, FileResponse, StreamingHttpResponse
 from django.shortcuts import redirect, get_object_or_404, render
 from django.urls import reverse, reverse_lazy
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.utils import timezone
+from django.utils.cache import patch_vary_headers
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
 from django.views.generic import CreateView, ListView, UpdateView, DeleteView,DetailView
 
 from accounts.utils import api_login_required
-from .models import Ticket,Sale,Order
+from .models import Ticket,Sale,Order,ListingChange
+from . import aggregates, bulk_listings, direct_uploads, pdf_uploads, seller_listings
+from .facets import DEFAULT_BINS, MAX_BINS, facets_from_db, facets_from_listings
+from .listing_snapshots import SNAPSHOT_MAX_LISTINGS, listing_snapshots
 from .forms import TicketForm
 from events.models import EventSection, Event
+from events.etags import event_inventory_etag, inventory_etag
+from events.pagination import InvalidCursor, page_size, paginate_by_cursor
+from archive.utils import find_ticket
 from accounts.models import User
 from django.conf import settings
 import logging
@@ -176,13 +185,10 @@ class CreateListingView(ResellerRequiredMixin, CreateView):
             # Save the main listing first (It will no longer upload a duplicate file!)
             ticket.save()
 
-            # RULE 2: Save each file individually into the new inventory table
+            # RULE 2: Save each file individually into the new inventory table,
+            # uploaded to storage in the background (tickets.pdf_uploads)
             if upload_choice == 'now' and files:
-                for pdf_file in files:
-                    TicketPDF.objects.create(
-                        ticket=ticket,
-                        file=pdf_file
-                    )
+                pdf_uploads.stage_pdfs(ticket, files)
             # -------------------------------------------------------------
 
             subject = f"Ticket Listing Created for {self.event.name}"
@@ -291,6 +297,17 @@ class MyListingsView(ResellerRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        context.update(
+            summary=seller_listings.seller_summary(self.request.user),
+            filters=self.filters,
+            seller_events=seller_listings.seller_events(self.request.user),
+        )
+        # Pagination links keep the filters
+        params = self.request.GET.copy()
+        params.pop('page', None)
+        context['filter_query'] = params.urlencode()
+        page_obj = context['page_obj']
+        context['page_range'] = page_obj.paginator.get_elided_page_range(page_obj.number, on_each_side=2, on_ends=1)
         if self.request.user.is_superadmin:
             context['base_template'] = 'accounts/superadmin_dashboard.html'
             return context
@@ -303,7 +320,8 @@ class MyListingsView(ResellerRequiredMixin, ListView):
         
 
     def get_queryset(self):
-        return Ticket.objects.filter(seller=self.request.user).order_by('-created_at')
+        self.filters = seller_listings.read_filters(self.request.GET)
+        return seller_listings.seller_listings(self.request.user, **self.filters)
 
 
 class ResellerTicketUpdateView(ResellerRequiredMixin, UpdateView):
@@ -364,9 +382,7 @@ class ResellerTicketUpdateView(ResellerRequiredMixin, UpdateView):
                     ticket.upload_file = None 
                     ticket.save()
 
-                    from .models import TicketPDF
-                    for pdf_file in files:
-                        TicketPDF.objects.create(ticket=ticket, file=pdf_file)
+                    pdf_uploads.stage_pdfs(ticket, files)
 
                     if ticket.sold and ticket.buyer and not had_pdfs_before:
                         self.send_pdf_to_buyer(ticket)
@@ -664,9 +680,7 @@ class SuperadminTicketUpdateView(SuperAdminRequiredMixin, UpdateView):
                     ticket.upload_file = None 
                     ticket.save()
 
-                    from .models import TicketPDF
-                    for pdf_file in files:
-                        TicketPDF.objects.create(ticket=ticket, file=pdf_file)
+                    pdf_uploads.stage_pdfs(ticket, files)
 
                     messages.success(self.request, "Listing updated and new tickets securely replaced by Admin!")
                     
@@ -1344,17 +1358,15 @@ class PaymentReturnView(View):  # Removed LoginRequiredMixin to handle session l
                         total_tickets_count += t.number_of_tickets
                     
                     # Update event sold tickets count
-                    ticket.event.sold_tickets += total_tickets_count
-                    ticket.event.save()
+                    aggregates.record_sale(ticket.event_id, total_tickets_count)
                 else:
                     # Individual ticket - reduce quantity and mark as sold only if all are sold
                     ticket.number_of_tickets -= order.number_of_tickets
                     if ticket.number_of_tickets <= 0:
                         ticket.sold = True
                     ticket.buyer = request.user.email
-                    ticket.event.sold_tickets += order.number_of_tickets
                     ticket.save()
-                    ticket.event.save()
+                    aggregates.record_sale(ticket.event_id, order.number_of_tickets)
                 
                 # Create Sale record(s) for the seller(s)
                 if ticket.is_bundled:
@@ -1486,7 +1498,7 @@ class OrderListView(LoginRequiredMixin, ListView):
         for order in context['orders']:
             ticket_upload_choice = None
             try:
-                ticket = Ticket.objects.get(ticket_id=order.ticket_reference)
+                ticket = find_ticket(order.ticket_reference)
                 ticket_upload_choice = ticket.upload_choice
                 print(ticket_upload_choice)
             except Ticket.DoesNotExist:
@@ -1545,7 +1557,7 @@ class SuperadminOrderListView(SuperAdminRequiredMixin, ListView):
         for order in context['orders']:
             ticket_upload_choice = None
             try:
-                ticket = Ticket.objects.get(ticket_id=order.ticket_reference)
+                ticket = find_ticket(order.ticket_reference)
                 order.ticket_upload_choice = ticket.upload_choice
             except Ticket.DoesNotExist:
                 order.ticket_upload_choice = 'Ticket Not Found/Deleted'
@@ -1582,7 +1594,8 @@ class MarkAsPaidView(SuperAdminRequiredMixin, View):
     def process_payment(self, request, order_id):
         try:
             order = Order.objects.get(id=order_id)
-            ticket = Ticket.objects.get(ticket_id=order.ticket_reference)
+            # Payouts can come after the event has been archived
+            ticket = find_ticket(order.ticket_reference)
             
             sale, created = Sale.objects.get_or_create(
                 order=order,
@@ -1770,6 +1783,87 @@ class CreateListingAPIView(View):
             logger.error(f"Failed to send email to admin: {str(e)}")
 
 
+class BulkCreateListingAPIView(View):
+    """
+    Create many listings for one event in one request; see
+    tickets/bulk_listings.py for the body. Each listing gets a result, and
+    the valid ones are created even when others fail: 201 when all were
+    created, 207 when some were, 400 when none were. ``?dry_run=1`` only
+    validates and creates nothing: 200 when every listing is valid, 400
+    otherwise.
+    """
+    @method_decorator(csrf_exempt)
+    @method_decorator(api_login_required)
+    def dispatch(self, *args, **kwargs):
+        return super().dispatch(*args, **kwargs)
+
+    def post(self, request, event_id):
+        if request.user.user_type != 'Reseller' and not request.user.is_superadmin:
+            return JsonResponse({'error': 'Only resellers can create listings'}, status=403)
+
+        try:
+            event = Event.objects.get(event_id=event_id)
+        except Event.DoesNotExist:
+            return JsonResponse({'error': 'Event not found'}, status=404)
+
+        if event.is_expired:
+            return JsonResponse({
+                'error': f"Cannot create listing: The event '{event.name}' has already passed. Event date was {event.date.strftime('%B %d, %Y')} at {event.time.strftime('%I:%M %p')}."
+            }, status=400)
+
+        try:
+            items = bulk_listings.parse_json(request.body)
+        except bulk_listings.BulkListingFormatError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+
+        dry_run = request.GET.get('dry_run') in ('1', 'true')
+        result = bulk_listings.create_listings(items, event, request.user, dry_run=dry_run)
+        if result.tickets:
+            self.send_summary_email(event, result, request)
+
+        if dry_run:
+            status = 400 if result.failed else 200
+        elif result.failed:
+            status = 207 if result.created else 400
+        else:
+            status = 201
+        return JsonResponse({
+            'success': not result.failed,
+            'dry_run': dry_run,
+            'created': 0 if dry_run else result.created,
+            'failed': result.failed,
+            'results': result.results,
+        }, status=status)
+
+    def send_summary_email(self, event, result, request):
+        marketplace_url = request.build_absolute_uri(
+            reverse('events:event_tickets', args=[event.event_id])
+        )
+        lines = [
+            f"{len(result.tickets)} ticket listings were created for {event.name}.",
+            '',
+        ]
+        for ticket in result.tickets:
+            lines.append(
+                f"{ticket.ticket_number}: {ticket.section.name}, row {ticket.row}, "
+                f"{ticket.number_of_tickets} x £{ticket.sell_price}"
+            )
+        if result.failed:
+            lines += ['', f"{result.failed} listings were rejected, see the API response for the errors."]
+        lines += ['', f"View them here: {marketplace_url}"]
+
+        try:
+            EmailMessage(
+                subject=f"{len(result.tickets)} Ticket Listings Created for {event.name}",
+                body='\n'.join(lines),
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=[request.user.email],
+                bcc=[settings.SUPERADMIN_EMAIL] if settings.SUPERADMIN_EMAIL else [],
+            ).send()
+        except Exception as e:
+            logger.error(f"Error sending bulk listing summary email: {str(e)}")
+
+
 class TicketUpdateAPIView(View):
     @method_decorator(csrf_exempt)
     @method_decorator(api_login_required)
@@ -1880,6 +1974,97 @@ Thank you!
             logger.error(f"Error sending PDF to buyer for ticket {ticket.ticket_id}: {str(e)}")
 
 
+class TicketPdfUploadSlotsAPIView(View):
+    """
+    Issue presigned POST slots for uploading a listing's PDFs straight to
+    storage; see tickets/direct_uploads.py. The body may give ``count``,
+    which defaults to the number of tickets.
+    """
+    @method_decorator(csrf_exempt)
+    @method_decorator(api_login_required)
+    def dispatch(self, *args, **kwargs):
+        return super().dispatch(*args, **kwargs)
+
+    def post(self, request, ticket_id):
+        try:
+            ticket = Ticket.objects.get(ticket_id=ticket_id)
+        except Ticket.DoesNotExist:
+            return JsonResponse({'error': 'Ticket not found'}, status=404)
+        if ticket.seller != request.user and not request.user.is_superadmin:
+            return JsonResponse({'error': 'You can only upload PDFs for your own listings'}, status=403)
+
+        try:
+            data = json.loads(request.body or b'{}')
+        except json.JSONDecodeError:
+            return JsonResponse({'error': 'Invalid JSON data'}, status=400)
+        count = data.get('count', ticket.number_of_tickets) if isinstance(data, dict) else None
+        if not isinstance(count, int) or not 1 <= count <= ticket.number_of_tickets:
+            return JsonResponse({'error': f'count must be between 1 and {ticket.number_of_tickets}'}, status=400)
+
+        return JsonResponse({
+            'slots': direct_uploads.issue_slots(ticket, count),
+            'expires_in': settings.TICKET_PDF_UPLOAD_SLOT_SECONDS,
+            'max_bytes': settings.TICKET_PDF_MAX_BYTES,
+            'confirm_url': reverse('events:api_ticket_pdf_uploads_confirm', args=[ticket.ticket_id]),
+        }, status=201)
+
+
+class TicketPdfUploadConfirmAPIView(View):
+    """
+    Confirm PDFs uploaded through slots from TicketPdfUploadSlotsAPIView:
+    ``{"upload_tokens": [...]}`` with one token per ticket. The uploads
+    replace the listing's PDFs once every one of them checks out.
+    """
+    @method_decorator(csrf_exempt)
+    @method_decorator(api_login_required)
+    def dispatch(self, *args, **kwargs):
+        return super().dispatch(*args, **kwargs)
+
+    def post(self, request, ticket_id):
+        try:
+            ticket = Ticket.objects.get(ticket_id=ticket_id)
+        except Ticket.DoesNotExist:
+            return JsonResponse({'error': 'Ticket not found'}, status=404)
+        if ticket.seller != request.user and not request.user.is_superadmin:
+            return JsonResponse({'error': 'You can only upload PDFs for your own listings'}, status=403)
+
+        try:
+            data = json.loads(request.body)
+        except json.JSONDecodeError:
+            return JsonResponse({'error': 'Invalid JSON data'}, status=400)
+
+        try:
+            pdfs = direct_uploads.confirm_uploads(ticket, data.get('upload_tokens') if isinstance(data, dict) else None)
+        except direct_uploads.DirectUploadError as e:
+            return JsonResponse({'error': str(e), 'errors': e.errors}, status=400)
+
+        return JsonResponse({
+            'success': True,
+            'ticket_id': str(ticket.ticket_id),
+            'pdfs': [{'id': pdf.pk, 'file': pdf.file.name} for pdf in pdfs],
+        }, status=201)
+
+
+class LocalPdfUploadView(View):
+    """
+    The bucket end of a presigned POST when TICKET_PDF_STORAGE is 'local',
+    so the direct upload flow runs without S3.
+    """
+    @method_decorator(csrf_exempt)
+    def dispatch(self, *args, **kwargs):
+        return super().dispatch(*args, **kwargs)
+
+    def post(self, request):
+        storage = TicketPDF._meta.get_field('file').storage
+        if settings.TICKET_PDF_STORAGE != 'local' or not hasattr(storage, 'receive_post'):
+            raise Http404
+        try:
+            storage.receive_post(request.POST, request.FILES.get('file'))
+        except ValidationError as e:
+            return JsonResponse({'error': ' '.join(e.messages)}, status=403)
+        return HttpResponse(status=204)
+
+
 class TicketDetailAPIView(View):
     @method_decorator(api_login_required)
     def dispatch(self, *args, **kwargs):
@@ -2008,6 +2193,17 @@ class TicketDeleteAPIView(View):
 
 
 class MyListingsAPIView(View):
+    """
+    The seller's listings with a summary, newest first, filtered by
+    ``status`` (all/active/sold), ``when`` (all/upcoming/past) and ``event``
+    (event_id); see tickets.seller_listings. ``?page=2&per_page=50`` reads
+    numbered pages, ``?cursor=`` keyset pages for deep lists. A listing's
+    ``pdf_upload_status`` is 'pending' while its PDFs are uploading and
+    'failed' once one of them could not be stored.
+    """
+    DEFAULT_PAGE_SIZE = 10
+    MAX_PAGE_SIZE = 100
+
     @method_decorator(api_login_required)
     def dispatch(self, *args, **kwargs):
         return super().dispatch(*args, **kwargs)
@@ -2016,79 +2212,164 @@ class MyListingsAPIView(View):
         if request.user.user_type != 'Reseller' and not request.user.is_superadmin:
             return JsonResponse({'error': 'Only resellers can view listings'}, status=403)
 
-        status_filter = request.GET.get('status', 'all') 
-        page = int(request.GET.get('page', 1))
-        per_page = int(request.GET.get('per_page', 10))
-
-        tickets = Ticket.objects.filter(seller=request.user)
-
-        if status_filter == 'active':
-            tickets = tickets.filter(sold=False)
-        elif status_filter == 'sold':
-            tickets = tickets.filter(sold=True)
+        filters = seller_listings.read_filters(request.GET)
+        tickets = seller_listings.seller_listings(request.user, **filters)
+        summary = seller_listings.seller_summary(request.user)
+        data = {
+            'summary': {
+                key: float(value) if isinstance(value, Decimal) else value for key, value in summary.items()
+            },
+            'filters': filters,
+        }
 
-        tickets = tickets.order_by('-created_at')
+        if 'cursor' in request.GET:
+            try:
+                cursor_page = paginate_by_cursor(
+                    tickets, seller_listings.ORDERING, request.GET, self.DEFAULT_PAGE_SIZE, self.MAX_PAGE_SIZE
+                )
+            except InvalidCursor as e:
+                return JsonResponse({'error': str(e)}, status=400)
+            data['tickets'] = [self.serialize(ticket) for ticket in cursor_page.items]
+            data.update(next_cursor=cursor_page.next_cursor, per_page=cursor_page.per_page)
+            return JsonResponse(data)
 
+        per_page = page_size(request.GET, self.DEFAULT_PAGE_SIZE, self.MAX_PAGE_SIZE)
         paginator = Paginator(tickets, per_page)
-
         try:
-            tickets_page = paginator.page(page)
+            tickets_page = paginator.page(request.GET.get('page', 1))
         except (EmptyPage, PageNotAnInteger):
             tickets_page = paginator.page(1)
 
-        tickets_data = []
-        for ticket in tickets_page:
-            tickets_data.append({
-                'ticket_id': str(ticket.ticket_id),
-                'event': {
-                    'event_id': ticket.event.event_id,
-                    'name': ticket.event.name,
-                    'date': ticket.event.date.isoformat(),
-                    'time': ticket.event.time.strftime('%H:%M:%S'),
-                },
-                'section': ticket.section.name,
-                'section_id':ticket.section.id,
-                'row': ticket.row,
-                'seats': ticket.seats,
-                'number_of_tickets': ticket.number_of_tickets,
-                'ticket_type': ticket.ticket_type,
-                'sell_together': ticket.sell_together,
-                'face_value':ticket.face_value,
-                'sell_price': float(ticket.sell_price),
-                'created_at': ticket.created_at.isoformat(),
-                'sold': ticket.sold,
-                'upload_choice': ticket.upload_choice,
-                'upload_by': ticket.upload_by.isoformat() if ticket.upload_by else None,
-            })
+        data.update(
+            tickets=[self.serialize(ticket) for ticket in tickets_page],
+            page=tickets_page.number,
+            per_page=per_page,
+            total_pages=paginator.num_pages,
+            total_tickets=paginator.count,
+        )
+        return JsonResponse(data)
 
-        return JsonResponse({
-            'tickets': tickets_data,
-            'page': page,
-            'total_pages': paginator.num_pages,
-            'total_tickets': paginator.count,
-            'filters': {
-                'status': status_filter
-            }
-        })
+    @staticmethod
+    def serialize(ticket):
+        return {
+            'ticket_id': str(ticket.ticket_id),
+            'event': {
+                'event_id': ticket.event.event_id,
+                'name': ticket.event.name,
+                'date': ticket.event.date.isoformat(),
+                'time': ticket.event.time.strftime('%H:%M:%S'),
+            },
+            'section': ticket.section.name,
+            'section_id': ticket.section_id,
+            'row': ticket.row,
+            'seats': ticket.seats,
+            'number_of_tickets': ticket.number_of_tickets,
+            'ticket_type': ticket.ticket_type,
+            'sell_together': ticket.sell_together,
+            'face_value': ticket.face_value,
+            'sell_price': float(ticket.sell_price),
+            'created_at': ticket.created_at.isoformat(),
+            'sold': ticket.sold,
+            'upload_choice': ticket.upload_choice,
+            'upload_by': ticket.upload_by.isoformat() if ticket.upload_by else None,
+            'pdf_upload_status': (
+                TicketPDF.FAILED if ticket.pdfs_failed else TicketPDF.PENDING if ticket.pdfs_uploading else None
+            ),
+        }
+
+
+def serialize_listing(ticket):
+    price_per_ticket = ticket.sell_price_for_normal
+
+    return {
+        'ticket_id': str(ticket.ticket_id),
+        'section': {
+            'id': ticket.section.id,
+            'name': ticket.section.name,
+            'color': ticket.section.color,
+        },
+        'row': ticket.row,
+        'seats': ticket.seats,
+        'number_of_tickets': ticket.number_of_tickets,
+        'face_value': float(ticket.face_value),
+        'ticket_type': ticket.ticket_type,
+        'benefits_and_Restrictions': ticket.benefits_and_Restrictions,
+        'sell_price': float(ticket.sell_price),
+        'price_per_ticket': float(price_per_ticket),
+        'total_price': float(ticket.number_of_tickets * price_per_ticket),
+        'upload_choice': ticket.upload_choice,
+        'upload_by': ticket.upload_by.isoformat() if ticket.upload_by else None,
+        'created_at': ticket.created_at.isoformat(),
+        'sell_together': ticket.sell_together,
+    }
 
 
 class EventTicketListAPIView(View):
+    """
+    Unsold listings of one event, filtered by section, ticket type, price and
+    quantity, newest first. Three ways to read them:
+
+    - ?page=2&per_page=100: numbered pages, at most MAX_PAGE_SIZE listings each
+    - ?cursor=: keyset pages, pass back next_cursor until it is null
+    - ?stream=1: every listing in one response, written out as the rows come
+      off a server-side cursor, so the worker never holds the whole list
+
+    Except for cursor pages, requests are answered from the event's listing
+    snapshot (see tickets.listing_snapshots) when it has one.
+    """
+    DEFAULT_PAGE_SIZE = 100
+    MAX_PAGE_SIZE = 500
+    STREAM_CHUNK_SIZE = 500
+    ORDERING = ('-created_at', '-pk')
+
+    @method_decorator(condition(etag_func=event_inventory_etag))
     def get(self, request, event_id):
         try:
             event = Event.objects.get(event_id=event_id)
         except Event.DoesNotExist:
             return JsonResponse({'error': 'Event not found'}, status=404)
 
-        sections = request.GET.getlist('section')
-        ticket_types = request.GET.getlist('ticket_type')
-        min_price = request.GET.get('min_price')
-        max_price = request.GET.get('max_price')
-        number_of_tickets = request.GET.getlist('number_of_tickets')
-        page = int(request.GET.get('page', 1))
-        per_page = int(request.GET.get('per_page', 100))
+        applied = {
+            'sections': request.GET.getlist('section'),
+            'ticket_types': request.GET.getlist('ticket_type'),
+            'min_price': request.GET.get('min_price'),
+            'max_price': request.GET.get('max_price'),
+            'number_of_tickets': request.GET.getlist('number_of_tickets'),
+        }
+        # Checked here so the snapshot and the tickets table agree on what they accept
+        if not all(value.isdigit() for value in applied['sections']):
+            return JsonResponse({'error': 'section must be a section id'}, status=400)
+        stream = request.GET.get('stream') in ('1', 'true')
+
+        if 'cursor' not in request.GET:
+            # Keyed by the event row loaded above, i.e. read before the listings
+            etag = inventory_etag(event)
+            snapshot = listing_snapshots.get(etag, lambda: self.snapshot_payload(event))
+            if snapshot is not None:
+                return self.snapshot_response(request, snapshot, applied, stream, etag)
+
+        data = self.payload(event, applied)
+        tickets = self.filter_listings(
+            Ticket.objects.filter(event=event, sold=False).select_related('section'), **applied
+        ).order_by(*self.ORDERING)
+
+        if stream:
+            return StreamingHttpResponse(self.stream(data, tickets), content_type='application/json')
+
+        if 'cursor' in request.GET:
+            try:
+                cursor_page = paginate_by_cursor(
+                    tickets, self.ORDERING, request.GET, self.DEFAULT_PAGE_SIZE, self.MAX_PAGE_SIZE
+                )
+            except InvalidCursor as e:
+                return JsonResponse({'error': str(e)}, status=400)
+            data['tickets'] = [serialize_listing(ticket) for ticket in cursor_page.items]
+            data.update(next_cursor=cursor_page.next_cursor, per_page=cursor_page.per_page)
+            return JsonResponse(data)
 
-        tickets = Ticket.objects.filter(event=event, sold=False).order_by('sell_price_for_normal')
+        return JsonResponse(self.page(request, data, tickets, serialize_listing))
 
+    def filter_listings(self, tickets, sections, ticket_types, min_price, max_price, number_of_tickets):
         if sections:
             tickets = tickets.filter(section__id__in=sections)
 
@@ -2113,59 +2394,21 @@ class EventTicketListAPIView(View):
             except ValueError:
                 pass
 
-        tickets = tickets.order_by('-created_at')
-
-        # Pagination removed as per request - return all data
-        if request.user.is_authenticated:
-            user_type = request.user.user_type
-            is_reseller = user_type == 'Reseller' or request.user.is_superadmin
-        else:
-            user_type = None
-            is_reseller = False
+        return tickets
 
-        tickets_data = []
-        for ticket in tickets:
-            price_per_ticket = ticket.sell_price_for_normal
+    def payload(self, event, applied):
+        """Everything in the response except the listings"""
+        # Read before the listings, and only up to the changes that can no
+        # longer be overtaken by a late commit, so a mirror that resumes from
+        # here can only see a change twice, never miss one
+        change_seq = ListingChange.safe_sequence(event.pk)
 
-            tickets_data.append({
-                'ticket_id': str(ticket.ticket_id),
-                'section': {
-                    'id': ticket.section.id,
-                    'name': ticket.section.name,
-                    'color': ticket.section.color,
-                },
-                'row': ticket.row,
-                'seats': ticket.seats,
-                'number_of_tickets': ticket.number_of_tickets,
-                'face_value': float(ticket.face_value),
-                'ticket_type': ticket.ticket_type,
-                'benefits_and_Restrictions': ticket.benefits_and_Restrictions,
-                'sell_price': float(ticket.sell_price),
-                'price_per_ticket': float(price_per_ticket),
-                'total_price': float(ticket.number_of_tickets * price_per_ticket),
-                'upload_choice': ticket.upload_choice,
-                'upload_by': ticket.upload_by.isoformat() if ticket.upload_by else None,
-                'created_at': ticket.created_at.isoformat(),
-                'sell_together': ticket.sell_together,
-            })
-
-        available_sections = event.sections.all().values('id', 'name', 'color')
         available_ticket_types = dict(Ticket.TICKET_TYPE_CHOICES)
-        
-        # Import section normalization function
-        from events.stadium_config import normalize_section_name
-        
-        # Add SVG section key for mapping
-        sections_with_svg = []
-        for section in available_sections:
-            sections_with_svg.append({
-                'id': section['id'],
-                'name': section['name'],
-                'color': section['color'],
-                'svg_section_key': normalize_section_name(section['name']),
-            })
 
-        return JsonResponse({
+        # EventSection.save resolves the SVG section key for mapping
+        sections_with_svg = list(event.sections.all().values('id', 'name', 'color', 'svg_section_key'))
+
+        return {
             'event': {
                 'event_id': event.event_id,
                 'name': event.name,
@@ -2175,20 +2418,176 @@ class EventTicketListAPIView(View):
                 'stadium_image': event.stadium_image,
                 'event_logo': event.event_logo,
             },
-            'tickets': tickets_data,
+            'change_seq': change_seq,
             'filters': {
                 'sections': sections_with_svg,
                 'ticket_types': available_ticket_types,
-                'applied': {
-                    'sections': sections,
-                    'ticket_types': ticket_types,
-                    'min_price': min_price,
-                    'max_price': max_price,
-                    'number_of_tickets': number_of_tickets,
-                }
+                'applied': applied,
             }
+        }
+
+    def page(self, request, data, listings, serialize):
+        per_page = page_size(request.GET, self.DEFAULT_PAGE_SIZE, self.MAX_PAGE_SIZE)
+        paginator = Paginator(listings, per_page)
+        try:
+            listings_page = paginator.page(request.GET.get('page', 1))
+        except (EmptyPage, PageNotAnInteger):
+            listings_page = paginator.page(1)
+
+        data['tickets'] = [serialize(listing) for listing in listings_page]
+        data.update(
+            page=listings_page.number,
+            per_page=per_page,
+            total_pages=paginator.num_pages,
+            total_tickets=paginator.count,
+        )
+        return data
+
+    def snapshot_payload(self, event):
+        """The unfiltered stream response, or None when there are too many listings to cache"""
+        data = self.payload(event, {
+            'sections': [], 'ticket_types': [], 'min_price': None, 'max_price': None, 'number_of_tickets': [],
         })
+        tickets = Ticket.objects.filter(event=event, sold=False).select_related('section').order_by(*self.ORDERING)
+        listings = [serialize_listing(ticket) for ticket in tickets[:SNAPSHOT_MAX_LISTINGS + 1]]
+        if len(listings) > SNAPSHOT_MAX_LISTINGS:
+            return None
+        data['tickets'] = listings
+        return data
+
+    def snapshot_response(self, request, snapshot, applied, stream, etag):
+        filtered = any(applied.values())
+        if stream and not filtered:
+            body, encoding = snapshot.encoded(request.headers.get('Accept-Encoding', ''))
+            response = HttpResponse(body, content_type='application/json')
+            if encoding:
+                response['Content-Encoding'] = encoding
+                # Byte-for-byte different from the identity response
+                response['ETag'] = f'W/"{etag}"'
+            patch_vary_headers(response, ('Accept-Encoding',))
+            return response
+
+        listings = snapshot.filtered(**applied) if filtered else snapshot.data['tickets']
+        data = {key: value for key, value in snapshot.data.items() if key != 'tickets'}
+        data['filters'] = dict(data['filters'], applied=applied)
+        if stream:
+            data['tickets'] = listings
+            return JsonResponse(data)
+        return JsonResponse(self.page(request, data, listings, lambda listing: listing))
+
+    def stream(self, data, tickets):
+        """Yield ``data`` as JSON with a ``tickets`` list of every listing in ``tickets``"""
+        head = json.dumps(data, cls=DjangoJSONEncoder)
+        yield head[:-1] + ', "tickets": ['
+
+        batch = []
+        separator = ''
+        for ticket in tickets.iterator(chunk_size=self.STREAM_CHUNK_SIZE):
+            batch.append(json.dumps(serialize_listing(ticket), cls=DjangoJSONEncoder))
+            if len(batch) == self.STREAM_CHUNK_SIZE:
+                yield separator + ', '.join(batch)
+                batch, separator = [], ', '
+        if batch:
+            yield separator + ', '.join(batch)
+        yield ']}'
+
+
+
+class EventListingFacetsAPIView(View):
+    """
+    Counts behind the ticket page filters: per section, ticket type and
+    quantity, plus a price histogram with ?bins= bands (default 10, max 50).
+    """
+    @method_decorator(condition(etag_func=event_inventory_etag))
+    def get(self, request, event_id):
+        try:
+            event = Event.objects.get(event_id=event_id)
+        except Event.DoesNotExist:
+            return JsonResponse({'error': 'Event not found'}, status=404)
+
+        try:
+            bins = int(request.GET.get('bins', DEFAULT_BINS))
+        except ValueError:
+            return JsonResponse({'error': 'bins must be an integer'}, status=400)
+        bins = max(1, min(bins, MAX_BINS))
+
+        snapshot = listing_snapshots.peek(inventory_etag(event))
+        if snapshot is not None:
+            facets = facets_from_listings(snapshot.data['tickets'], snapshot.data['filters']['sections'], bins)
+        else:
+            facets = facets_from_db(event, bins)
+
+        return JsonResponse({'event_id': event.event_id, **facets})
+
 
+class ListingChangesAPIView(View):
+    """
+    Listing changes of one event after a sequence number:
+    ?since=<change_seq>&limit=500. Start from the change_seq returned by
+    EventTicketListAPIView, then pass back next_since until has_more is false.
+
+    A change with a lower id can commit after one with a higher id, so
+    next_since never moves past a change younger than
+    LISTING_CHANGE_COMMIT_LAG_SECONDS. Such changes are served anyway and
+    come again on the next poll; applying a change twice is harmless.
+    """
+    MAX_LIMIT = 1000
+
+    def get(self, request, event_id):
+        try:
+            event = Event.objects.get(event_id=event_id)
+        except Event.DoesNotExist:
+            return JsonResponse({'error': 'Event not found'}, status=404)
+
+        try:
+            since = int(request.GET.get('since', 0))
+            limit = min(int(request.GET.get('limit', 500)), self.MAX_LIMIT)
+        except ValueError:
+            return JsonResponse({'error': 'since and limit must be integers'}, status=400)
+        if limit < 1:
+            return JsonResponse({'error': 'limit must be at least 1'}, status=400)
+
+        if since < ListingChange.horizon():
+            return JsonResponse({
+                'error': 'Changes before this sequence number have been compacted, resync the full listing'
+            }, status=410)
+
+        cutoff = ListingChange.commit_cutoff()
+        changes = list(
+            event.listing_changes.filter(id__gt=since).order_by('id')
+            .values_list('id', 'ticket_id', 'action', 'created_at')[:limit + 1]
+        )
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+
+        next_since = since
+        for change_id, _, _, created_at in changes:
+            if created_at >= cutoff:
+                break
+            next_since = change_id
+        # The rest of the log is too recent to step past yet
+        has_more = has_more and next_since == changes[-1][0]
+
+        # Only the latest change of each ticket matters
+        latest = {}
+        for change_id, ticket_id, action, _ in changes:
+            latest[ticket_id] = action
+
+        upsert_ids = [ticket_id for ticket_id, action in latest.items() if action == ListingChange.UPSERT]
+        upserts = Ticket.objects.filter(
+            event=event, ticket_id__in=upsert_ids, sold=False
+        ).select_related('section')
+        upserts_data = [serialize_listing(ticket) for ticket in upserts]
+        live_ids = {ticket['ticket_id'] for ticket in upserts_data}
+
+        return JsonResponse({
+            'event_id': event.event_id,
+            'since': since,
+            'next_since': next_since,
+            'has_more': has_more,
+            'upserts': upserts_data,
+            'removals': [str(ticket_id) for ticket_id in latest if str(ticket_id) not in live_ids],
+        })
 
 
 class UploadTicketView(LoginRequiredMixin, View):